@@ -0,0 +1,78 @@
+"""权限判定的微基准测试
+
+比较每条语句的权限判定耗时：
+- legacy: 旧实现，每条语句重建多单词操作字典并在列表中查找
+- classify: 编译后的前缀树分类（不使用判定缓存）
+- cached: RolePermissions.allows，命中判定缓存
+- batch: 5000 条 INSERT 的迁移脚本，从拆分语句到判定权限的总耗时
+
+用法:
+    python benchmarks/bench_permissions.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from config.dbconfig import ROLE_PERMISSIONS, classify_operation, get_role_classifier  # noqa: E402
+from db.sql_lexer import split_statements  # noqa: E402
+
+STATEMENTS = [
+    "SELECT * FROM orders WHERE id = 1",
+    "INSERT INTO orders (id, amount) VALUES (1, 2.5)",
+    "UPDATE orders SET amount = 3 WHERE id = 1",
+    "CREATE TEMPORARY TABLE tmp_orders (id INT)",
+    "DROP INDEX idx_amount ON orders",
+    "SHOW TABLES",
+]
+
+
+def _legacy_check(sql: str, allowed_operations: list) -> bool:
+    """旧版 check_sql_permission 的判定逻辑，仅用于对比"""
+    words = sql.strip().upper().split()
+    multi_word_operations = {
+        ('CREATE', 'DATABASE'): 'CREATE DATABASE', ('DROP', 'DATABASE'): 'DROP DATABASE',
+        ('ALTER', 'DATABASE'): 'ALTER DATABASE', ('CREATE', 'INDEX'): 'CREATE INDEX',
+        ('DROP', 'INDEX'): 'DROP INDEX', ('ALTER', 'INDEX'): 'ALTER INDEX',
+        ('CREATE', 'VIEW'): 'CREATE VIEW', ('DROP', 'VIEW'): 'DROP VIEW', ('ALTER', 'VIEW'): 'ALTER VIEW',
+        ('CREATE', 'PROCEDURE'): 'CREATE PROCEDURE', ('DROP', 'PROCEDURE'): 'DROP PROCEDURE',
+        ('ALTER', 'PROCEDURE'): 'ALTER PROCEDURE', ('CREATE', 'FUNCTION'): 'CREATE FUNCTION',
+        ('DROP', 'FUNCTION'): 'DROP FUNCTION', ('ALTER', 'FUNCTION'): 'ALTER FUNCTION',
+        ('CREATE', 'TRIGGER'): 'CREATE TRIGGER', ('DROP', 'TRIGGER'): 'DROP TRIGGER',
+        ('CREATE', 'EVENT'): 'CREATE EVENT', ('DROP', 'EVENT'): 'DROP EVENT', ('ALTER', 'EVENT'): 'ALTER EVENT',
+        ('CREATE', 'USER'): 'CREATE USER', ('DROP', 'USER'): 'DROP USER', ('ALTER', 'USER'): 'ALTER USER',
+        ('RENAME', 'USER'): 'RENAME USER', ('CREATE', 'TEMPORARY'): 'CREATE TEMPORARY TABLES',
+        ('REPLICATION', 'SLAVE'): 'REPLICATION SLAVE', ('REPLICATION', 'CLIENT'): 'REPLICATION CLIENT',
+        ('SELECT', 'INTO'): 'SELECT INTO OUTFILE', ('LOAD', 'DATA'): 'LOAD DATA',
+    }
+    if len(words) >= 2 and (words[0], words[1]) in multi_word_operations:
+        return multi_word_operations[(words[0], words[1])] in allowed_operations
+    return words[0] in allowed_operations
+
+
+def _per_statement(func, number: int = 20000) -> float:
+    """每条语句的平均耗时（纳秒）"""
+    total = timeit.timeit(func, number=number)
+    return total / (number * len(STATEMENTS)) * 1e9
+
+
+def main() -> None:
+    allowed = ROLE_PERMISSIONS["admin"]
+    permissions = get_role_classifier("admin")
+    keywords = [split_statements(sql)[0].keywords for sql in STATEMENTS]
+
+    print(f"legacy    {_per_statement(lambda: [_legacy_check(sql, allowed) for sql in STATEMENTS]):8.0f} ns/statement")
+    print(f"classify  {_per_statement(lambda: [classify_operation(k) in permissions.operations for k in keywords]):8.0f} ns/statement")
+    print(f"cached    {_per_statement(lambda: [permissions.allows(k) for k in keywords]):8.0f} ns/statement")
+
+    batch = ";\n".join(f"INSERT INTO orders (id, amount, note) VALUES ({i}, {i * 1.5}, 'row {i}; ok')" for i in range(5000))
+    lex_time = timeit.timeit(lambda: split_statements(batch), number=5) / 5
+    statements = split_statements(batch)
+    check_time = timeit.timeit(lambda: [permissions.allows(s.keywords) for s in statements], number=20) / 20
+    print(f"batch     {len(statements)} statements: split {lex_time * 1000:.1f} ms, "
+          f"permission check {check_time * 1000:.2f} ms ({check_time / len(statements) * 1e9:.0f} ns/statement)")
+
+
+if __name__ == "__main__":
+    main()
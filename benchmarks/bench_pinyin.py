@@ -0,0 +1,70 @@
+"""拼音首字母转换的基准测试
+
+对 10000 个由常见字段词组合而成的中文字段名测量吞吐量：
+- import: 导入 utils.pinyin 与首次转换（加载拼音词典）的耗时
+- legacy: 旧实现，每个词调用一次 pypinyin.pinyin，不缓存
+- cold: word_initials 缓存为空时的批量转换
+- warm: 缓存命中后的批量转换
+- dedupe: initials_mapping 批量转换并为重复首字母追加后缀
+
+用法:
+    python benchmarks/bench_pinyin.py
+"""
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+PREFIXES = ["用户", "客户", "订单", "商品", "支付", "物流", "库存", "会员", "门店", "供应商",
+            "合同", "发票", "账户", "员工", "部门", "项目", "仓库", "渠道", "活动", "优惠券"]
+SUFFIXES = ["名称", "编号", "状态", "类型", "金额", "数量", "时间", "日期", "备注", "地址",
+            "电话", "邮箱", "等级", "来源", "标识", "描述", "排序", "版本", "创建人", "更新人"]
+QUALIFIERS = ["", "原始", "最新", "默认", "历史", "预计", "实际", "累计", "当前", "上次",
+              "首次", "临时", "计划", "有效", "外部", "内部", "主", "副", "总", "净",
+              "起始", "截止", "平均", "最大", "最小"]
+NAME_COUNT = 10000
+
+
+def _names() -> list:
+    combos = itertools.product(QUALIFIERS, PREFIXES, SUFFIXES)
+    return [f"{qualifier}{prefix}{suffix}" for qualifier, prefix, suffix in itertools.islice(combos, NAME_COUNT)]
+
+
+def _measure(label: str, func, count: int) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:8}  {elapsed * 1000:8.1f} ms  {count / elapsed:12.0f} names/s")
+
+
+def main() -> None:
+    names = _names()
+
+    start = time.perf_counter()
+    from utils import pinyin as module
+    imported = time.perf_counter() - start
+    module.word_initials("预热")
+    loaded = time.perf_counter() - start
+    print(f"import    {imported * 1000:8.1f} ms  (first conversion incl. dictionary load {loaded * 1000:.1f} ms)")
+
+    from pypinyin import pinyin, Style
+
+    def legacy():
+        return [''.join(p[0].upper() for p in pinyin(name, style=Style.FIRST_LETTER)) for name in names]
+
+    _measure("legacy", legacy, len(names))
+    module.word_initials.cache_clear()
+    _measure("cold", lambda: [module.word_initials(name) for name in names], len(names))
+    _measure("warm", lambda: [module.word_initials(name) for name in names], len(names))
+    _measure("dedupe", lambda: module.initials_mapping(names, dedupe=True), len(names))
+
+    mapping = module.initials_mapping(names, dedupe=True)
+    collisions = sum(1 for value in mapping.values() if "_" in value)
+    print(f"{len(names)} names, {len(set(module.word_initials(n) for n in names))} distinct initials, "
+          f"{collisions} suffixed by dedupe, cache {module.word_initials.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""服务器启动耗时的基准测试
+
+在新的解释器中用 python -X importtime 测量各启动路径的导入耗时：
+- list: 导入工具与prompt注册表并列出全部工具（stdio 模式每个会话的冷启动路径）
+- call: 在 list 的基础上第一次调用 execute_sql 时导入的实现模块
+- eager: 导入全部工具与prompt的实现模块（按需导入之前的启动方式）
+- sse: SSE 模式额外导入的传输层模块
+
+各路径都先单独导入 mcp.types（所有启动路径都需要的 MCP SDK），使其耗时单独列出。
+
+每条路径输出总耗时，以及耗时最多的顶层模块和本项目各模块的累计导入耗时（毫秒）。
+
+用法:
+    python benchmarks/bench_startup.py [--top N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+PROJECT_PACKAGES = ("config", "db", "handles", "prompts", "utils", "server")
+
+SCENARIOS = {
+    "list": (
+        "from handles.base import ToolRegistry\n"
+        "from prompts.BasePrompt import PromptRegistry\n"
+        "ToolRegistry.get_all_tools(); PromptRegistry.get_all__prompts()\n"
+    ),
+    "call": (
+        "from handles.base import ToolRegistry\n"
+        "ToolRegistry.get_all_tools()\n"
+        "ToolRegistry.get_tool('execute_sql')\n"
+    ),
+    "eager": (
+        "import importlib\n"
+        "from handles.base import ToolRegistry\n"
+        "from prompts.BasePrompt import PromptRegistry\n"
+        "for d in ToolRegistry.descriptors() + PromptRegistry.descriptors(): importlib.import_module(d.module)\n"
+        # 旧版 get_chinese_initials 在导入时加载拼音词典
+        "import pypinyin\n"
+    ),
+    "sse": (
+        "import uvicorn\n"
+        "from mcp.server.sse import SseServerTransport\n"
+        "from starlette.applications import Starlette\n"
+    ),
+}
+
+
+def _import_times(code: str) -> List[Tuple[int, str, int]]:
+    """在新的解释器中执行代码，返回 (缩进层级, 模块名, 累计耗时微秒) 列表"""
+    env = dict(os.environ, PYTHONPATH=SRC)
+    env.setdefault("MYSQL_USER", "bench")
+    env.setdefault("MYSQL_PASSWORD", "bench")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mcp.types\n" + code],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, name.strip(), int(cumulative)))
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=8, help="每条路径输出的顶层模块数量")
+    args = parser.parse_args()
+
+    for label, code in SCENARIOS.items():
+        entries = _import_times(code)
+        top_level = [entry for entry in entries if entry[0] == 0]
+        total = sum(cumulative for _, _, cumulative in top_level)
+        print(f"{label:6} total {total / 1000:8.1f} ms, {len(entries)} modules")
+        for _, name, cumulative in sorted(top_level, key=lambda entry: -entry[2])[:args.top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+        project = [entry for entry in entries if entry[1].split(".")[0] in PROJECT_PACKAGES]
+        for depth, name, cumulative in project:
+            print(f"    {cumulative / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""各工具端到端的基准测试
+
+通过 ToolRegistry.call_tool 调用全部已登记的工具，数据库换成进程内的假后端（见 fake_mysql.py），
+测量的是本项目代码（权限判定、连接池、分批读取、序列化、元数据拆分与缓存等）的开销，
+不包含网络与服务器耗时。每个场景输出：
+- calls/s: 吞吐量（并发场景为全部调用数 / 总耗时）
+- p50/p99: 单次调用耗时的中位数与 99 分位（毫秒）
+- peak: 单次调用期间 tracemalloc 统计的内存峰值增量
+
+场景包括 1k/100k/1M 行结果集的各输出格式序列化、带参数的预处理语句、多语句与事务批次、
+bulk_insert、500 张表的元数据批量查询（冷/热缓存）、表名搜索索引和健康检查类工具。
+结果集的形状（行数 × 列数 × 列类型）在 build_scenarios 中为每个场景单独指定。
+
+可以把结果保存为基线，之后与基线比较；p50 或内存峰值变差超过容差的场景标记为回退，
+存在回退时以退出码 1 结束，便于在 CI 中使用。
+
+用法:
+    python benchmarks/bench_tools.py [--filter 子串] [--scale 0.2] [--no-memory]
+                                     [--save baseline.json] [--compare baseline.json] [--tolerance 0.2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, NamedTuple, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# 在加载配置之前设置：使用可以执行全部工具的角色，并取消结果集的行数/字节数上限，使大结果集被完整序列化
+os.environ.setdefault("MYSQL_USER", "bench")
+os.environ.setdefault("MYSQL_PASSWORD", "bench")
+os.environ["MYSQL_ROLE"] = "admin"
+os.environ["MYSQL_RESULT_MAX_ROWS"] = "0"
+os.environ["MYSQL_RESULT_MAX_BYTES"] = "0"
+os.environ["MYSQL_RESULT_CACHE_TTL"] = "0"
+os.environ["MYSQL_COST_GUARD"] = "off"
+
+from fake_mysql import Catalog, FakeBackend, ResultShape, install  # noqa: E402
+
+# 健康检查等工具的子查询由假后端单独应答，这里的默认形状只影响未匹配的读语句
+SMALL = ResultShape(rows=10, columns=4)
+CATALOG_TABLES = 500
+
+
+class Scenario(NamedTuple):
+    name: str
+    tool: str
+    arguments: Dict[str, Any]
+    # 读语句返回的结果集，None 表示 SMALL
+    shape: Optional[ResultShape] = None
+    iterations: int = 50
+    # 同时发起的调用数
+    concurrency: int = 1
+    # 每次调用前清空元数据缓存
+    cold: bool = False
+
+
+def _table_list(count: int, qualified: bool) -> str:
+    catalog = Catalog(tables=CATALOG_TABLES)
+    names = catalog.table_names("bench_db0", count)
+    return ",".join(f"bench_db0.{name}" if qualified else name for name in names)
+
+
+def build_scenarios() -> List[Scenario]:
+    rows_1k = ResultShape(rows=1000, columns=8)
+    rows_1m = ResultShape(rows=1_000_000, columns=8)
+    select = "SELECT * FROM bench_db0.orders"
+    return [
+        Scenario("select_1k_csv", "execute_sql", {"query": select}, rows_1k, 200),
+        Scenario("select_1k_ndjson", "execute_sql", {"query": select, "output_format": "ndjson"}, rows_1k, 200),
+        Scenario("select_1k_columnar", "execute_sql", {"query": select, "output_format": "columnar"}, rows_1k, 200),
+        Scenario("select_1k_csv_x8", "execute_sql", {"query": select}, rows_1k, 200, concurrency=8),
+        Scenario("select_100k_csv", "execute_sql", {"query": select}, ResultShape(rows=100_000, columns=8), 5),
+        Scenario("serialize_1m_csv", "execute_sql", {"query": select}, rows_1m, 2),
+        Scenario("serialize_1m_columnar", "execute_sql", {"query": select, "output_format": "columnar"}, rows_1m, 2),
+        Scenario("wide_1k_x100_csv", "execute_sql", {"query": select},
+                 ResultShape(rows=1000, columns=100, types=("int", "str", "decimal", "null")), 20),
+        Scenario("point_select_params", "execute_sql",
+                 {"query": "SELECT * FROM bench_db0.orders WHERE id = %s", "params": [42]},
+                 ResultShape(rows=1, columns=8), 2000),
+        Scenario("multi_statement_20", "execute_sql",
+                 {"query": ";".join(f"SELECT * FROM bench_db0.orders WHERE id = {i}" for i in range(20))},
+                 ResultShape(rows=5, columns=8), 200),
+        Scenario("transaction_10_writes", "execute_sql",
+                 {"query": ";".join(f"UPDATE bench_db0.orders SET status = 'paid' WHERE id = {i}" for i in range(10)),
+                  "transaction": True}, None, 500),
+        Scenario("bulk_insert_10k", "bulk_insert",
+                 {"query": "INSERT INTO bench_db0.orders (id, name, amount) VALUES (%s, %s, %s)",
+                  "rows": [[i, f"name-{i}", i * 1.5] for i in range(10_000)]}, None, 20),
+        Scenario("chinese_initials_500", "get_chinese_initials",
+                 {"names": [f"{prefix}{suffix}{i}" for i in range(50)
+                            for prefix, suffix in zip(Catalog.COMMENTS, Catalog.COLUMN_COMMENTS)], "dedupe": True},
+                 None, 200),
+        Scenario("table_desc_500_cold", "get_table_desc", {"table_names": _table_list(500, True)}, None, 20, cold=True),
+        Scenario("table_desc_500_warm", "get_table_desc", {"table_names": _table_list(500, True)}, None, 200),
+        Scenario("table_desc_500_unqualified", "get_table_desc", {"table_names": _table_list(500, False)},
+                 None, 20, cold=True),
+        Scenario("table_index_500_cold", "get_table_index", {"table_names": _table_list(500, True)}, None, 20, cold=True),
+        Scenario("table_name_search", "get_table_name", {"text": "订单"}, None, 200),
+        Scenario("table_name_initials", "get_table_name", {"text": "dd"}, None, 200),
+        Scenario("databases", "get_databases", {}, None, 500, cold=True),
+        Scenario("table_lock", "get_table_lock", {}, None, 200),
+        Scenario("health_running", "get_db_health_running", {}, None, 200),
+        Scenario("health_index_usage", "get_db_health_index_usage", {}, None, 200),
+    ]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """最近秩法的分位数"""
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def _call(scenario: Scenario) -> float:
+    from handles.base import ToolRegistry, is_error_text
+    from db import get_metadata_cache
+
+    if scenario.cold:
+        get_metadata_cache().clear()
+    started = time.perf_counter()
+    result = await ToolRegistry.call_tool(scenario.tool, scenario.arguments)
+    elapsed = time.perf_counter() - started
+    if result and is_error_text(result[0].text):
+        raise RuntimeError(f"{scenario.name}: {result[0].text[:200]}")
+    return elapsed
+
+
+async def run_scenario(scenario: Scenario, backend: FakeBackend, iterations: int, memory: bool) -> Dict[str, Any]:
+    backend.shape = scenario.shape or SMALL
+    # 预热：导入工具模块、建立连接、缓存预处理语句与词法分析结果
+    await _call(scenario)
+
+    latencies: List[float] = []
+    started = time.perf_counter()
+    remaining = iterations
+    while remaining > 0:
+        batch = min(scenario.concurrency, remaining)
+        latencies.extend(await asyncio.gather(*(_call(scenario) for _ in range(batch))))
+        remaining -= batch
+    wall = time.perf_counter() - started
+    latencies.sort()
+
+    result = {
+        "calls": iterations,
+        "calls_per_sec": iterations / wall if wall > 0 else 0.0,
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await _call(scenario)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_bytes"] = max(0, peak - baseline)
+    return result
+
+
+def _format_bytes(size: Optional[float]) -> str:
+    if size is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _delta(current: float, previous: Optional[float]) -> str:
+    if not previous:
+        return ""
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """与基线比较，返回 p50 或内存峰值变差超过容差的场景"""
+    regressions = []
+    previous_results = baseline.get("results", {})
+    print(f"\ncompared with baseline from {baseline.get('created', '?')} (python {baseline.get('python', '?')})")
+    print(f"{'scenario':28} {'calls/s':>9} {'p50':>7} {'p99':>7} {'peak':>7}")
+    for name, result in results.items():
+        previous = previous_results.get(name)
+        if previous is None:
+            print(f"{name:28} (not in baseline)")
+            continue
+        print(f"{name:28} {_delta(result['calls_per_sec'], previous['calls_per_sec']):>9} "
+              f"{_delta(result['p50_ms'], previous['p50_ms']):>7} {_delta(result['p99_ms'], previous['p99_ms']):>7} "
+              f"{_delta(result.get('peak_bytes', 0), previous.get('peak_bytes')) if 'peak_bytes' in result else '':>7}")
+        if result["p50_ms"] > previous["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {previous['p50_ms']:.3f} -> {result['p50_ms']:.3f} ms")
+        if previous.get("peak_bytes") and result.get("peak_bytes", 0) > previous["peak_bytes"] * (1 + tolerance):
+            regressions.append(f"{name}: peak {_format_bytes(previous['peak_bytes'])} -> "
+                               f"{_format_bytes(result['peak_bytes'])}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="只运行名称或工具名包含该子串的场景")
+    parser.add_argument("--scale", type=float, default=1.0, help="各场景调用次数的倍数，如 0.2 用于快速检查")
+    parser.add_argument("--no-memory", action="store_true", help="不测量内存峰值")
+    parser.add_argument("--save", metavar="PATH", help="将结果保存为基线")
+    parser.add_argument("--compare", metavar="PATH", help="与保存的基线比较")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="判定为回退的变差比例，默认 0.2")
+    args = parser.parse_args()
+
+    from handles.base import ToolRegistry
+
+    scenarios = [scenario for scenario in build_scenarios()
+                 if args.filter in scenario.name or args.filter in scenario.tool]
+    covered = {scenario.tool for scenario in build_scenarios()}
+    missing = [d.name for d in ToolRegistry.descriptors() if d.name not in covered]
+    if missing:
+        print(f"warning: no scenario for {', '.join(missing)}", file=sys.stderr)
+
+    backend = FakeBackend(SMALL, Catalog(tables=CATALOG_TABLES))
+    install(backend)
+    if any(scenario.tool == "get_table_name" for scenario in scenarios):
+        from db import get_search_index
+        # 在计时之前同步建立表名搜索索引，否则第一次调用只会在后台开始构建
+        get_search_index().refresh()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'scenario':28} {'calls':>6} {'calls/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak':>10}")
+    for scenario in scenarios:
+        iterations = max(1, int(scenario.iterations * args.scale))
+        result = asyncio.run(run_scenario(scenario, backend, iterations, not args.no_memory))
+        results[scenario.name] = result
+        print(f"{scenario.name:28} {result['calls']:>6} {result['calls_per_sec']:>10.1f} "
+              f"{result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f} {_format_bytes(result.get('peak_bytes')):>10}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "python": platform.python_version(),
+                "scale": args.scale,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nbaseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nno regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
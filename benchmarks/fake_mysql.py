@@ -0,0 +1,426 @@
+"""进程内的 mysql.connector 兼容假后端，供基准测试在没有 MySQL 服务器时驱动各工具
+
+FakeBackend.connect 与 mysql.connector.connect 的调用方式相同，返回的连接与游标实现了
+连接池和各工具用到的接口（非缓冲/预处理游标、fetchmany、executemany、事务、ping 等）。
+
+- 读语句默认返回 ResultShape 描述的合成结果集（行数 × 列数 × 列类型），
+  行按列类型预先生成一批后循环使用，生成数据的耗时不计入被测代码
+- information_schema 的 SCHEMATA/TABLES/COLUMNS/STATISTICS 查询按 Catalog 中的库、表、列应答，
+  并按 IN 列表中的参数过滤，用于元数据类工具和表名搜索索引
+- 健康检查类的 SHOW/系统表查询返回少量固定结构的行
+- 可以用 FakeBackend.route 为匹配的语句注册自定义应答
+
+用法:
+    backend = FakeBackend(ResultShape(rows=1000, columns=8))
+    install(backend)  # 替换全局连接池，之后通过 ToolRegistry 调用工具
+"""
+import datetime
+import decimal
+import itertools
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from mysql.connector.constants import FieldFlag, FieldType
+
+Description = List[Tuple[Any, ...]]
+Responder = Callable[[str, Optional[Sequence[Any]]], Optional[Tuple[Description, Sequence[Tuple[Any, ...]]]]]
+
+# 列类型 -> (FieldType, 第 i 行的值)
+_EPOCH = datetime.datetime(2024, 1, 1, 8, 0, 0)
+COLUMN_TYPES: Dict[str, Tuple[int, Callable[[int], Any]]] = {
+    "int": (FieldType.LONGLONG, lambda i: i * 7919 % 1000003),
+    "float": (FieldType.DOUBLE, lambda i: i * 0.618),
+    "decimal": (FieldType.NEWDECIMAL, lambda i: decimal.Decimal(i * 37 % 100000) / 100),
+    "str": (FieldType.VAR_STRING, lambda i: f"name-{i:06d}"),
+    "text": (FieldType.BLOB, lambda i: f"第{i}行的备注, 含有逗号和\"引号\"\n以及换行"),
+    "datetime": (FieldType.DATETIME, lambda i: _EPOCH + datetime.timedelta(seconds=i * 61)),
+    "date": (FieldType.DATE, lambda i: (_EPOCH + datetime.timedelta(days=i % 3650)).date()),
+    "null": (FieldType.VAR_STRING, lambda i: None if i % 2 else f"v{i}"),
+}
+DEFAULT_TYPES = ("int", "str", "decimal", "datetime", "float", "text", "date", "null")
+
+# 预先生成的不同行数，结果集超过该行数时循环使用
+DISTINCT_ROWS = 1024
+
+
+def _describe(name: str, type_code: int, flags: int = 0) -> Tuple[Any, ...]:
+    """与 mysql.connector 相同结构的 cursor.description 条目"""
+    return (name, type_code, None, None, None, None, 1, flags, 45)
+
+
+def _text_columns(*names: str) -> Description:
+    return [_describe(name, FieldType.VAR_STRING) for name in names]
+
+
+class ResultShape:
+    """合成结果集的形状
+
+    参数:
+        rows (int): 行数
+        columns (int): 列数
+        types (Sequence[str]): 列类型，见 COLUMN_TYPES，列数多于类型数时循环使用
+    """
+
+    def __init__(self, rows: int = 1000, columns: int = 8, types: Sequence[str] = DEFAULT_TYPES):
+        unknown = [kind for kind in types if kind not in COLUMN_TYPES]
+        if unknown:
+            raise ValueError(f"未知的列类型: {', '.join(unknown)}")
+        self.rows = rows
+        self.columns = columns
+        self.types = tuple(itertools.islice(itertools.cycle(types), columns))
+        self.description: Description = [
+            _describe(f"{kind}_{index}", COLUMN_TYPES[kind][0],
+                      FieldFlag.BLOB if kind == "text" else 0)
+            for index, kind in enumerate(self.types)
+        ]
+        generators = [COLUMN_TYPES[kind][1] for kind in self.types]
+        self._distinct = [tuple(generate(i + column) for column, generate in enumerate(generators))
+                          for i in range(min(rows, DISTINCT_ROWS))]
+
+    def __repr__(self) -> str:
+        return f"ResultShape(rows={self.rows}, columns={self.columns}, types={list(self.types)})"
+
+    def iter_rows(self) -> Iterator[Tuple[Any, ...]]:
+        return itertools.islice(itertools.cycle(self._distinct), self.rows) if self._distinct else iter(())
+
+
+class Catalog:
+    """合成的库、表、列，用于应答 information_schema 查询
+
+    参数:
+        schemas (int): 库数量
+        tables (int): 每个库的表数量
+        columns (int): 每张表的列数
+        indexes (int): 每张表的索引数
+    """
+    COMMENTS = ("用户", "订单", "商品", "支付", "物流", "库存", "会员", "门店", "供应商", "合同")
+    COLUMN_COMMENTS = ("编号", "名称", "状态", "金额", "数量", "创建时间", "更新时间", "备注", "类型", "地址")
+
+    def __init__(self, schemas: int = 2, tables: int = 500, columns: int = 12, indexes: int = 3):
+        self.schemas = [f"bench_db{i}" for i in range(schemas)]
+        self.tables = [(schema, f"table_{i:04d}") for schema in self.schemas for i in range(tables)]
+        self.column_count = columns
+        self.index_count = indexes
+        self.created = datetime.datetime(2024, 1, 1)
+
+    def table_names(self, schema: Optional[str] = None, limit: Optional[int] = None) -> List[str]:
+        names = [table for table_schema, table in self.tables if schema is None or table_schema == schema]
+        return names[:limit] if limit is not None else names
+
+    def table_comment(self, table: str) -> str:
+        number = int(table.rsplit("_", 1)[1])
+        return f"{self.COMMENTS[number % len(self.COMMENTS)]}表{number}"
+
+    def column_values(self, column: str, schema: str, table: str, position: int) -> Any:
+        """information_schema.COLUMNS 中一列的值"""
+        values = {
+            "TABLE_SCHEMA": schema,
+            "TABLE_NAME": table,
+            "COLUMN_NAME": f"col_{position}",
+            "COLUMN_TYPE": ("bigint", "varchar(64)", "decimal(12,2)", "datetime")[position % 4],
+            "IS_NULLABLE": "YES" if position % 3 else "NO",
+            "COLUMN_KEY": "PRI" if position == 0 else "",
+            "COLUMN_DEFAULT": None,
+            "COLUMN_COMMENT": self.COLUMN_COMMENTS[position % len(self.COLUMN_COMMENTS)],
+            "ORDINAL_POSITION": position + 1,
+        }
+        return values.get(column.upper(), f"{column.lower()}_{position}")
+
+    def index_values(self, column: str, schema: str, table: str, position: int) -> Any:
+        """information_schema.STATISTICS 中一列的值"""
+        values = {
+            "TABLE_SCHEMA": schema,
+            "TABLE_NAME": table,
+            "INDEX_NAME": "PRIMARY" if position == 0 else f"idx_{position}",
+            "COLUMN_NAME": f"col_{position}",
+            "INDEX_TYPE": "BTREE",
+            "NON_UNIQUE": 0 if position == 0 else 1,
+            "SEQ_IN_INDEX": 1,
+        }
+        return values.get(column.upper(), f"{column.lower()}_{position}")
+
+
+# SELECT 与 FROM 之间的列（information_schema 查询中只有简单的列名）
+_SELECT_LIST = re.compile(r"^\s*SELECT\s+(.*?)\s+FROM\s+information_schema\.(\w+)", re.IGNORECASE | re.DOTALL)
+_PAIR_FILTER = re.compile(r"\(TABLE_SCHEMA,\s*TABLE_NAME\)\s+IN", re.IGNORECASE)
+_NAME_FILTER = re.compile(r"\bTABLE_NAME\s+IN", re.IGNORECASE)
+_SCHEMA_LITERALS = re.compile(r"'([^']*)'")
+
+INNODB_STATUS = """
+=====================================
+2024-01-01 08:00:00 0x7f00 INNODB MONITOR OUTPUT
+=====================================
+Per second averages calculated from the last 20 seconds
+-----------------
+BACKGROUND THREAD
+-----------------
+srv_master_thread loops: 1000 srv_active, 0 srv_shutdown, 5000 srv_idle
+----------
+SEMAPHORES
+----------
+OS WAIT ARRAY INFO: reservation count 120
+OS WAIT ARRAY INFO: signal count 118
+RW-shared spins 0, rounds 0, OS waits 0
+RW-excl spins 0, rounds 0, OS waits 0
+Spin rounds per wait: 0.00 RW-shared, 0.00 RW-excl, 0.00 RW-sx
+------------
+TRANSACTIONS
+------------
+Trx id counter 123456
+Purge done for trx's n:o < 123450 undo n:o < 0 state: running but idle
+History list length 42
+LIST OF TRANSACTIONS FOR EACH SESSION:
+---TRANSACTION 421000000000000, not started
+0 lock struct(s), heap size 1128, 0 row lock(s)
+--------
+FILE I/O
+--------
+Pending normal aio reads: [0, 0, 0, 0] , aio writes: [0, 0, 0, 0] ,
+-------------------------------------
+INSERT BUFFER AND ADAPTIVE HASH INDEX
+-------------------------------------
+Ibuf: size 1, free list len 0, seg size 2, 0 merges
+---
+LOG
+---
+Log sequence number          123456789
+Log flushed up to            123456789
+Pages flushed up to          123456000
+Last checkpoint at           123450000
+----------------------
+BUFFER POOL AND MEMORY
+----------------------
+Total large memory allocated 137363456
+Buffer pool size   8192
+Free buffers       1024
+Database pages     7000
+Modified db pages  12
+Buffer pool hit rate 1000 / 1000, young-making rate 0 / 1000 not 0 / 1000
+--------------
+ROW OPERATIONS
+--------------
+0 queries inside InnoDB, 0 queries in queue
+Number of rows inserted 1000, updated 200, deleted 10, read 500000
+1.50 inserts/s, 0.20 updates/s, 0.00 deletes/s, 250.00 reads/s
+----------------------------
+END OF INNODB MONITOR OUTPUT
+============================
+"""
+
+
+class FakeBackend:
+    """假的 MySQL 服务器：按语句应答，并统计执行的语句数
+
+    参数:
+        shape (ResultShape): 没有专门应答的读语句返回的结果集
+        catalog (Catalog): information_schema 查询使用的库表结构
+        latency (float): 每次执行语句前等待的时间（秒），模拟网络往返，默认 0
+    """
+
+    def __init__(self, shape: Optional[ResultShape] = None, catalog: Optional[Catalog] = None, latency: float = 0.0):
+        self.shape = shape or ResultShape()
+        self.catalog = catalog or Catalog()
+        self.latency = latency
+        self.statements = 0
+        self._routes: List[Tuple[Pattern, Responder]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.route(r"^\s*SELECT\s+@@SESSION\.max_allowed_packet", lambda sql, params: (
+            _text_columns("@@SESSION.max_allowed_packet"), [(64 * 1024 * 1024,)]))
+        self.route(r"^\s*EXPLAIN\s+FORMAT\s*=\s*JSON", lambda sql, params: (
+            _text_columns("EXPLAIN"),
+            [('{"query_block": {"cost_info": {"query_cost": "10.00"}, '
+              '"table": {"table_name": "t", "access_type": "ref", "rows_examined_per_scan": 10}}}',)]))
+        self.route(r"^\s*SHOW\s+ENGINE\s+INNODB\s+STATUS", lambda sql, params: (
+            _text_columns("Type", "Name", "Status"), [("InnoDB", "", INNODB_STATUS)]))
+        self.route(r"^\s*SHOW\s+(?:FULL\s+)?PROCESSLIST", lambda sql, params: (
+            _text_columns("Id", "User", "Host", "db", "Command", "Time", "State", "Info"),
+            [(i, "app", f"10.0.0.{i}:5{i:04d}", "bench_db0", "Sleep" if i % 3 else "Query", i % 60, "", None)
+             for i in range(1, 51)]))
+        self.route(r"^\s*SHOW\s+(?:GLOBAL\s+|SESSION\s+)?(?:VARIABLES|STATUS)", self._variables)
+        self.route(r"^\s*SHOW\s+OPEN\s+TABLES", lambda sql, params: (
+            _text_columns("Database", "Table", "In_use", "Name_locked"), [("bench_db0", "table_0001", 1, 0)]))
+        self.route(r"\binformation_schema\.(?:SCHEMATA|TABLES|COLUMNS|STATISTICS)\b", self._information_schema)
+        self.route(r"\b(?:information_schema\.innodb_|performance_schema\.)", lambda sql, params: (
+            _text_columns("object_schema", "object_name", "index_name", "value"),
+            [("bench_db0", f"table_{i:04d}", f"idx_{i % 3}", i) for i in range(20)]))
+
+    def route(self, pattern: str, responder: Responder) -> None:
+        """为匹配 pattern（不区分大小写）的语句注册应答，后注册的优先
+
+        参数:
+            pattern (str): 正则表达式
+            responder (callable): 接收 (sql, params)，返回 (description, rows)；返回None时按默认规则应答
+        """
+        self._routes.insert(0, (re.compile(pattern, re.IGNORECASE), responder))
+
+    def connect(self, **kwargs: Any) -> "FakeConnection":
+        """与 mysql.connector.connect 相同的调用方式，连接参数被忽略"""
+        return FakeConnection(self, next(self._ids), kwargs.get("database"))
+
+    def respond(self, sql: str, params: Optional[Sequence[Any]]) -> Optional[Tuple[Description, Iterator]]:
+        """应答一条语句，返回 (description, 行迭代器)，不返回结果集的语句返回None"""
+        with self._lock:
+            self.statements += 1
+        if self.latency:
+            time.sleep(self.latency)
+        for pattern, responder in self._routes:
+            if pattern.search(sql):
+                result = responder(sql, params)
+                if result is not None:
+                    description, rows = result
+                    return description, iter(rows)
+        if re.match(r"\s*(?:/\*.*?\*/\s*)?(?:SELECT|SHOW|WITH|DESCRIBE|DESC|EXPLAIN|\()", sql, re.IGNORECASE | re.DOTALL):
+            return self.shape.description, self.shape.iter_rows()
+        return None
+
+    @staticmethod
+    def _variables(sql: str, params: Optional[Sequence[Any]]) -> Tuple[Description, List[Tuple[Any, ...]]]:
+        names = _SCHEMA_LITERALS.findall(sql) or ["max_connections"]
+        return _text_columns("Variable_name", "Value"), [(name.replace("%", ""), "151") for name in names]
+
+    def _information_schema(self, sql: str, params: Optional[Sequence[Any]]):
+        match = _SELECT_LIST.match(sql)
+        if match is None:
+            return None
+        columns = [column.strip().split()[-1] for column in match.group(1).split(",")]
+        source = match.group(2).upper()
+        catalog = self.catalog
+        params = list(params or [])
+
+        if source == "SCHEMATA":
+            schemas = catalog.schemas + ["information_schema", "mysql", "performance_schema", "sys"]
+            excluded = set(_SCHEMA_LITERALS.findall(sql))
+            return _text_columns(*columns), [(schema,) for schema in schemas if schema not in excluded]
+
+        if _PAIR_FILTER.search(sql):
+            wanted = {(params[i].lower(), params[i + 1].lower()) for i in range(0, len(params) - 1, 2)}
+            tables = [key for key in catalog.tables if key in wanted]
+        elif _NAME_FILTER.search(sql):
+            wanted = {str(value).lower() for value in params}
+            tables = [key for key in catalog.tables if key[1] in wanted]
+        else:
+            tables = list(catalog.tables)
+
+        if source == "TABLES":
+            values = {
+                "TABLE_SCHEMA": lambda schema, table: schema,
+                "TABLE_NAME": lambda schema, table: table,
+                "TABLE_COMMENT": lambda schema, table: catalog.table_comment(table),
+                "CREATE_TIME": lambda schema, table: catalog.created,
+                "UPDATE_TIME": lambda schema, table: None,
+            }
+            return _text_columns(*columns), [
+                tuple(values.get(column.upper(), lambda schema, table: None)(schema, table) for column in columns)
+                for schema, table in tables
+            ]
+
+        if source == "COLUMNS":
+            count, value = catalog.column_count, catalog.column_values
+        else:
+            count, value = catalog.index_count, catalog.index_values
+        return _text_columns(*columns), [
+            tuple(value(column, schema, table, position) for column in columns)
+            for schema, table in tables for position in range(count)
+        ]
+
+
+class FakeCursor:
+    """非缓冲、缓冲与预处理游标共用的实现"""
+
+    def __init__(self, connection: "FakeConnection"):
+        self.connection = connection
+        self.description: Optional[Description] = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self._rows: Iterator[Tuple[Any, ...]] = iter(())
+
+    def execute(self, operation: str, params: Optional[Sequence[Any]] = None, **kwargs: Any) -> None:
+        if self.connection.closed:
+            from mysql.connector import Error
+            raise Error(msg="MySQL Connection not available")
+        result = self.connection.backend.respond(operation, params)
+        if result is None:
+            self.description, self._rows, self.rowcount = None, iter(()), 1
+        else:
+            self.description, self._rows = result
+            self.rowcount = -1
+
+    def executemany(self, operation: str, seq_params: Sequence[Sequence[Any]]) -> None:
+        seq_params = list(seq_params)
+        self.connection.backend.respond(operation, seq_params[0] if seq_params else None)
+        self.description, self._rows, self.rowcount = None, iter(()), len(seq_params)
+
+    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        return next(self._rows, None)
+
+    def fetchmany(self, size: int = 1) -> List[Tuple[Any, ...]]:
+        return list(itertools.islice(self._rows, size))
+
+    def fetchall(self) -> List[Tuple[Any, ...]]:
+        return list(self._rows)
+
+    def close(self) -> bool:
+        self._rows = iter(())
+        return True
+
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class FakeConnection:
+    """实现连接池与各工具用到的 MySQLConnection 接口"""
+
+    def __init__(self, backend: FakeBackend, connection_id: int, database: Optional[str] = None):
+        self.backend = backend
+        self.connection_id = connection_id
+        self.database = database
+        self.in_transaction = False
+        self.closed = False
+
+    def cursor(self, buffered: Optional[bool] = None, prepared: Optional[bool] = None, **kwargs: Any) -> FakeCursor:
+        return FakeCursor(self)
+
+    def start_transaction(self, **kwargs: Any) -> None:
+        self.in_transaction = True
+
+    def commit(self) -> None:
+        self.in_transaction = False
+
+    def rollback(self) -> None:
+        self.in_transaction = False
+
+    def ping(self, reconnect: bool = False, attempts: int = 1, delay: int = 0) -> None:
+        pass
+
+    def reset_session(self, user_variables: Any = None, session_variables: Any = None) -> None:
+        self.in_transaction = False
+
+    def reconnect(self, attempts: int = 1, delay: int = 0) -> None:
+        self.closed = False
+        self.in_transaction = False
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def install(backend: FakeBackend, max_size: int = 10) -> None:
+    """关闭当前的全局连接池，换成连接到 backend 的连接池
+
+    连接池的其他参数（校验方式、预处理语句缓存等）沿用当前配置
+    """
+    from config import get_settings
+    from db import pool
+
+    pool.close_pool()
+    settings = get_settings()
+    options = dict(settings.pool, max_size=max_size, min_size=min(settings.pool["min_size"], max_size))
+    pool._pool = pool.ConnectionPool(dict(settings.connection), connector=backend.connect, **options)
@@ -1,7 +1,53 @@
-from .dbconfig import get_db_config, get_role_permissions, get_db_config_without_database
+from .dbconfig import (
+    get_db_config,
+    get_role_permissions,
+    get_db_config_without_database,
+    get_pool_config,
+    get_executor_config,
+    get_result_config,
+    get_metadata_cache_config,
+    get_result_cache_config,
+    get_health_config,
+    get_bulk_insert_config,
+    get_search_index_config,
+    get_timeout_config,
+    get_server_config,
+    get_tracing_config,
+    get_cost_guard_config,
+    classify_operation,
+    get_role_classifier,
+    RolePermissions,
+)
+from .settings import (
+    Settings,
+    get_settings,
+    reload_settings,
+    add_reload_listener,
+    install_reload_triggers,
+)
 
 __all__ = [
     "get_db_config",
     "get_role_permissions",
     "get_db_config_without_database",
+    "get_pool_config",
+    "get_executor_config",
+    "get_result_config",
+    "get_metadata_cache_config",
+    "get_result_cache_config",
+    "get_health_config",
+    "get_bulk_insert_config",
+    "get_search_index_config",
+    "get_timeout_config",
+    "get_server_config",
+    "get_tracing_config",
+    "get_cost_guard_config",
+    "classify_operation",
+    "get_role_classifier",
+    "RolePermissions",
+    "Settings",
+    "get_settings",
+    "reload_settings",
+    "add_reload_listener",
+    "install_reload_triggers",
 ]
\ No newline at end of file
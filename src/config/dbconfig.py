@@ -44,6 +44,270 @@ def get_db_config_without_database():
     connection_config = {k: v for k, v in config.items() if k not in ["database", "role"]}
     return connection_config, config["role"]
 
+def get_pool_config():
+    """从环境变量获取连接池配置信息
+
+    返回:
+        dict: 连接池配置
+        - min_size: 池中保持的最小连接数
+        - max_size: 池中允许的最大连接数
+        - idle_timeout: 空闲连接的最长保留时间（秒），超过后关闭
+        - acquire_timeout: 连接池耗尽时等待可用连接的最长时间（秒）
+        - validate: 借出连接时的校验方式，可选 ping、reset、none
+        - statement_cache_size: 每条连接缓存的预处理语句数量
+    """
+    load_dotenv()
+
+    config = {
+        "min_size": int(os.getenv("MYSQL_POOL_MIN_SIZE", "1")),
+        "max_size": int(os.getenv("MYSQL_POOL_MAX_SIZE", "10")),
+        "idle_timeout": float(os.getenv("MYSQL_POOL_IDLE_TIMEOUT", "300")),
+        "acquire_timeout": float(os.getenv("MYSQL_POOL_ACQUIRE_TIMEOUT", "30")),
+        "validate": os.getenv("MYSQL_POOL_VALIDATE", "ping").lower(),
+        "statement_cache_size": int(os.getenv("MYSQL_PREPARED_CACHE_SIZE", "64")),
+    }
+
+    if config["max_size"] < 1 or config["min_size"] < 0 or config["min_size"] > config["max_size"]:
+        raise ValueError("连接池配置错误：需满足 0 <= MYSQL_POOL_MIN_SIZE <= MYSQL_POOL_MAX_SIZE 且最大连接数至少为1")
+    if config["validate"] not in ("ping", "reset", "none"):
+        raise ValueError("连接池配置错误：MYSQL_POOL_VALIDATE 只能为 ping、reset 或 none")
+    if config["statement_cache_size"] < 1:
+        raise ValueError("连接池配置错误：MYSQL_PREPARED_CACHE_SIZE 至少为1")
+
+    return config
+
+def get_executor_config():
+    """从环境变量获取数据库执行线程池配置
+
+    返回:
+        dict: 执行线程池配置
+        - max_workers: 同时在事件循环之外执行数据库操作的最大线程数，
+          默认与连接池最大连接数一致
+    """
+    load_dotenv()
+
+    max_workers = int(os.getenv("MYSQL_MAX_CONCURRENCY", os.getenv("MYSQL_POOL_MAX_SIZE", "10")))
+    if max_workers < 1:
+        raise ValueError("执行线程池配置错误：MYSQL_MAX_CONCURRENCY 至少为1")
+
+    return {"max_workers": max_workers}
+
+def get_result_config():
+    """从环境变量获取结果集读取配置
+
+    返回:
+        dict: 结果集读取配置
+        - fetch_batch_size: 每次从服务器读取的行数
+        - max_rows: 单次调用最多返回的行数，0 表示不限制
+        - max_bytes: 单次调用最多返回的字节数，0 表示不限制
+    """
+    load_dotenv()
+
+    config = {
+        "fetch_batch_size": int(os.getenv("MYSQL_FETCH_BATCH_SIZE", "1000")),
+        "max_rows": int(os.getenv("MYSQL_RESULT_MAX_ROWS", "100000")),
+        "max_bytes": int(os.getenv("MYSQL_RESULT_MAX_BYTES", str(16 * 1024 * 1024))),
+    }
+
+    if config["fetch_batch_size"] < 1 or config["max_rows"] < 0 or config["max_bytes"] < 0:
+        raise ValueError("结果集配置错误：MYSQL_FETCH_BATCH_SIZE 至少为1，行数和字节数上限不能为负数")
+
+    return config
+
+def get_metadata_cache_config():
+    """从环境变量获取元数据缓存配置
+
+    返回:
+        dict: 元数据缓存配置
+        - ttl: 缓存条目有效期（秒），0 表示关闭缓存
+        - max_bytes: 缓存占用内存上限（字节），超出后按LRU淘汰
+    """
+    load_dotenv()
+
+    config = {
+        "ttl": float(os.getenv("MYSQL_METADATA_CACHE_TTL", "300")),
+        "max_bytes": int(os.getenv("MYSQL_METADATA_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+    }
+
+    if config["ttl"] < 0 or config["max_bytes"] < 0:
+        raise ValueError("元数据缓存配置错误：MYSQL_METADATA_CACHE_TTL 和 MYSQL_METADATA_CACHE_MAX_BYTES 不能为负数")
+
+    return config
+
+def get_result_cache_config():
+    """从环境变量获取 execute_sql 查询结果缓存配置
+
+    返回:
+        dict: 查询结果缓存配置
+        - ttl: 缓存条目有效期（秒），0 表示关闭缓存（默认关闭）
+        - max_bytes: 缓存占用内存上限（字节），超出后按LRU淘汰
+    """
+    load_dotenv()
+
+    config = {
+        "ttl": float(os.getenv("MYSQL_RESULT_CACHE_TTL", "0")),
+        "max_bytes": int(os.getenv("MYSQL_RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    }
+
+    if config["ttl"] < 0 or config["max_bytes"] < 0:
+        raise ValueError("查询结果缓存配置错误：MYSQL_RESULT_CACHE_TTL 和 MYSQL_RESULT_CACHE_MAX_BYTES 不能为负数")
+
+    return config
+
+def get_health_config():
+    """从环境变量获取健康检查类工具的配置
+
+    返回:
+        dict: 健康检查配置
+        - probe_timeout: 单个子查询的超时时间（秒），超时的子查询以说明文本代替，0 表示不限制
+        - sample_interval: 后台采样全局状态、会话与事务概况的间隔（秒），0 表示不采样
+        - sample_history: 内存中保留的最近采样个数，超出后丢弃最早的采样
+    """
+    load_dotenv()
+
+    config = {
+        "probe_timeout": float(os.getenv("MYSQL_HEALTH_PROBE_TIMEOUT", "10")),
+        "sample_interval": float(os.getenv("MYSQL_HEALTH_SAMPLE_INTERVAL", "0")),
+        "sample_history": int(os.getenv("MYSQL_HEALTH_SAMPLE_HISTORY", "720")),
+    }
+
+    if config["probe_timeout"] < 0:
+        raise ValueError("健康检查配置错误：MYSQL_HEALTH_PROBE_TIMEOUT 不能为负数")
+    if config["sample_interval"] < 0:
+        raise ValueError("健康检查配置错误：MYSQL_HEALTH_SAMPLE_INTERVAL 不能为负数")
+    if config["sample_history"] < 2:
+        raise ValueError("健康检查配置错误：MYSQL_HEALTH_SAMPLE_HISTORY 至少为2")
+
+    return config
+
+def get_bulk_insert_config():
+    """从环境变量获取 bulk_insert 批量写入配置
+
+    返回:
+        dict: 批量写入配置
+        - chunk_size: 每个分块的最大行数，每个分块合并为一条多行INSERT并提交一次
+    """
+    load_dotenv()
+
+    config = {
+        "chunk_size": int(os.getenv("MYSQL_BULK_CHUNK_SIZE", "1000")),
+    }
+
+    if config["chunk_size"] < 1:
+        raise ValueError("批量写入配置错误：MYSQL_BULK_CHUNK_SIZE 至少为1")
+
+    return config
+
+def get_search_index_config():
+    """从环境变量获取表名搜索索引配置
+
+    返回:
+        dict: 搜索索引配置
+        - refresh_interval: 后台增量刷新的间隔（秒），0 表示不建立索引，get_table_name 直接查询 information_schema
+    """
+    load_dotenv()
+
+    config = {
+        "refresh_interval": float(os.getenv("MYSQL_SEARCH_INDEX_REFRESH", "300")),
+    }
+
+    if config["refresh_interval"] < 0:
+        raise ValueError("搜索索引配置错误：MYSQL_SEARCH_INDEX_REFRESH 不能为负数")
+
+    return config
+
+def get_timeout_config(role: str = None):
+    """从环境变量获取 execute_sql 的执行超时配置
+
+    MYSQL_QUERY_TIMEOUT 对所有角色生效，MYSQL_QUERY_TIMEOUT_<ROLE>（如 MYSQL_QUERY_TIMEOUT_READONLY）
+    为单个角色单独设置
+
+    参数:
+        role (str, 可选): 角色名称，默认取 MYSQL_ROLE
+
+    返回:
+        dict: 超时配置
+        - query_timeout: 单次调用的最长执行时间（秒），0 表示不限制；调用时传入的 timeout 只能更短
+    """
+    load_dotenv()
+
+    role = role or os.getenv("MYSQL_ROLE", "readonly")
+    default = os.getenv("MYSQL_QUERY_TIMEOUT", "0")
+    config = {
+        "query_timeout": float(os.getenv(f"MYSQL_QUERY_TIMEOUT_{role.upper()}", default)),
+    }
+
+    if config["query_timeout"] < 0:
+        raise ValueError("超时配置错误：MYSQL_QUERY_TIMEOUT 不能为负数")
+
+    return config
+
+def get_server_config():
+    """从环境变量获取HTTP传输（SSE 与 streamable HTTP）的监听配置，只在启动时读取，修改后需重启服务
+
+    返回:
+        dict: 监听配置
+        - host: 监听地址
+        - port: 监听端口
+        - workers: 工作进程数，0 表示与CPU核数相同；只有无状态的 streamable HTTP 模式支持多个进程
+        - debug: 是否开启 Starlette 调试模式（出错时向客户端返回调用栈），默认关闭
+    """
+    load_dotenv()
+
+    config = {
+        "host": os.getenv("MYSQL_MCP_HOST", "0.0.0.0"),
+        "port": int(os.getenv("MYSQL_MCP_PORT", "9000")),
+        "workers": int(os.getenv("MYSQL_MCP_WORKERS", "1")),
+        "debug": os.getenv("MYSQL_MCP_DEBUG", "false").strip().lower() in ("1", "true", "yes", "on"),
+    }
+
+    if not 0 < config["port"] < 65536:
+        raise ValueError("服务配置错误：MYSQL_MCP_PORT 必须在 1-65535 之间")
+    if config["workers"] < 0:
+        raise ValueError("服务配置错误：MYSQL_MCP_WORKERS 不能为负数")
+    if config["workers"] == 0:
+        config["workers"] = os.cpu_count() or 1
+
+    return config
+
+# 采样分析器的模式
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+def get_tracing_config():
+    """从环境变量获取工具调用的慢调用日志与采样分析配置，修改 .env 后重新加载即生效，无需重启
+
+    返回:
+        dict: 跟踪配置
+        - slow_call_threshold: 调用耗时达到该值（秒）时输出一行JSON慢调用日志，0 表示关闭
+        - slow_call_log: 慢调用与分析结果写入的文件，为空时写到标准错误
+        - profile_tools: 开启采样分析的工具名称，"*" 表示全部工具，为空时关闭
+        - profile_mode: cprofile（线程池中数据库操作的函数耗时）或 tracemalloc（调用期间的内存分配）
+        - profile_sample_rate: 被分析工具的调用中进行分析的比例（0-1）
+        - profile_top: 分析结果输出的条目数
+    """
+    load_dotenv()
+
+    tools = os.getenv("MYSQL_PROFILE_TOOLS", "")
+    config = {
+        "slow_call_threshold": float(os.getenv("MYSQL_SLOW_CALL_THRESHOLD", "0")),
+        "slow_call_log": os.getenv("MYSQL_SLOW_CALL_LOG", "").strip(),
+        "profile_tools": tuple(sorted({name.strip() for name in tools.split(",") if name.strip()})),
+        "profile_mode": os.getenv("MYSQL_PROFILE_MODE", "cprofile").strip().lower(),
+        "profile_sample_rate": float(os.getenv("MYSQL_PROFILE_SAMPLE_RATE", "1")),
+        "profile_top": int(os.getenv("MYSQL_PROFILE_TOP", "20")),
+    }
+
+    if config["slow_call_threshold"] < 0:
+        raise ValueError("跟踪配置错误：MYSQL_SLOW_CALL_THRESHOLD 不能为负数")
+    if config["profile_mode"] not in PROFILE_MODES:
+        raise ValueError(f"跟踪配置错误：MYSQL_PROFILE_MODE 只能是 {', '.join(PROFILE_MODES)}")
+    if not 0 <= config["profile_sample_rate"] <= 1:
+        raise ValueError("跟踪配置错误：MYSQL_PROFILE_SAMPLE_RATE 必须在 0-1 之间")
+    if config["profile_top"] < 1:
+        raise ValueError("跟踪配置错误：MYSQL_PROFILE_TOP 至少为1")
+
+    return config
+
 # 定义角色权限
 ROLE_PERMISSIONS = {
     "readonly": ["SELECT", "SHOW", "DESCRIBE", "EXPLAIN", "USE"],  # 只读权限
@@ -102,4 +366,193 @@ def get_role_permissions(role: str) -> list:
     返回:
         list: 该角色允许执行的SQL操作列表
     """
-    return ROLE_PERMISSIONS.get(role, ROLE_PERMISSIONS["readonly"])  # 默认返回只读权限
\ No newline at end of file
+    return ROLE_PERMISSIONS.get(role, ROLE_PERMISSIONS["readonly"])  # 默认返回只读权限
+
+# 由多个前导关键字组成的操作，未匹配时以第一个关键字作为操作名；"*" 匹配任意单词
+OPERATION_RULES = {
+    # 数据库操作
+    ("CREATE", "DATABASE"): "CREATE DATABASE",
+    ("DROP", "DATABASE"): "DROP DATABASE",
+    ("ALTER", "DATABASE"): "ALTER DATABASE",
+    # 索引操作
+    ("CREATE", "INDEX"): "CREATE INDEX",
+    ("DROP", "INDEX"): "DROP INDEX",
+    ("ALTER", "INDEX"): "ALTER INDEX",
+    # 视图操作
+    ("CREATE", "VIEW"): "CREATE VIEW",
+    ("DROP", "VIEW"): "DROP VIEW",
+    ("ALTER", "VIEW"): "ALTER VIEW",
+    # 存储过程操作
+    ("CREATE", "PROCEDURE"): "CREATE PROCEDURE",
+    ("DROP", "PROCEDURE"): "DROP PROCEDURE",
+    ("ALTER", "PROCEDURE"): "ALTER PROCEDURE",
+    # 函数操作
+    ("CREATE", "FUNCTION"): "CREATE FUNCTION",
+    ("DROP", "FUNCTION"): "DROP FUNCTION",
+    ("ALTER", "FUNCTION"): "ALTER FUNCTION",
+    # 触发器操作
+    ("CREATE", "TRIGGER"): "CREATE TRIGGER",
+    ("DROP", "TRIGGER"): "DROP TRIGGER",
+    # 事件操作
+    ("CREATE", "EVENT"): "CREATE EVENT",
+    ("DROP", "EVENT"): "DROP EVENT",
+    ("ALTER", "EVENT"): "ALTER EVENT",
+    # 用户操作
+    ("CREATE", "USER"): "CREATE USER",
+    ("DROP", "USER"): "DROP USER",
+    ("ALTER", "USER"): "ALTER USER",
+    ("RENAME", "USER"): "RENAME USER",
+    # 临时表
+    ("CREATE", "TEMPORARY"): "CREATE TEMPORARY TABLES",
+    # 复制相关
+    ("REPLICATION", "SLAVE"): "REPLICATION SLAVE",
+    ("REPLICATION", "CLIENT"): "REPLICATION CLIENT",
+    # 文件操作
+    ("SELECT", "INTO"): "SELECT INTO OUTFILE",
+    ("*", "INTO", "OUTFILE"): "SELECT INTO OUTFILE",
+    ("LOAD", "DATA"): "LOAD DATA",
+}
+
+# 判断操作类型最多需要的前导关键字数量
+OPERATION_KEYWORD_DEPTH = max(len(keywords) for keywords in OPERATION_RULES)
+
+# 单个角色缓存的判定结果数量上限，超出后清空重建
+VERDICT_CACHE_SIZE = 4096
+
+
+def _compile_operation_trie(rules: dict) -> dict:
+    """将 OPERATION_RULES 编译为按关键字逐层查找的前缀树，操作名存放在键 None 下"""
+    trie = {}
+    for keywords, operation in rules.items():
+        node = trie
+        for keyword in keywords:
+            node = node.setdefault(keyword, {})
+        node[None] = operation
+    return trie
+
+
+_OPERATION_TRIE = _compile_operation_trie(OPERATION_RULES)
+
+
+def classify_operation(keywords: tuple) -> str:
+    """根据语句的前导关键字判断操作类型
+
+    参数:
+        keywords (tuple): 大写的前导关键字，如 ("CREATE", "TEMPORARY", "TABLE")
+
+    返回:
+        str: 与角色权限列表中名称一致的操作名，如 "CREATE TEMPORARY TABLES"；
+        没有关键字时返回空字符串
+    """
+    if not keywords:
+        return ""
+
+    # 精确匹配的规则优先于通配规则，同类规则中匹配的关键字越少越优先
+    exact = wildcard = None
+    node = _OPERATION_TRIE
+    for keyword in keywords[:OPERATION_KEYWORD_DEPTH]:
+        node = node.get(keyword)
+        if node is None:
+            break
+        if None in node:
+            exact = node[None]
+            break
+    if exact is None:
+        node = _OPERATION_TRIE.get("*")
+        for keyword in keywords[1:OPERATION_KEYWORD_DEPTH]:
+            node = node.get(keyword) if node else None
+            if node is None:
+                break
+            if None in node:
+                wildcard = node[None]
+                break
+    return exact or wildcard or keywords[0]
+
+
+class RolePermissions:
+    """编译后的角色权限：允许的操作集合及按前导关键字缓存的判定结果"""
+
+    def __init__(self, role: str, operations: list):
+        self.role = role
+        self.operations = frozenset(operations)
+        self._verdicts = {}
+
+    def allows(self, keywords: tuple) -> bool:
+        """判断前导关键字为 keywords 的语句是否允许执行
+
+        参数:
+            keywords (tuple): 大写的前导关键字
+
+        返回:
+            bool: 是否有权限执行
+        """
+        # 只有前 OPERATION_KEYWORD_DEPTH 个关键字影响判定，以此作为缓存键
+        key = keywords[:OPERATION_KEYWORD_DEPTH]
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            verdict = bool(key) and classify_operation(key) in self.operations
+            if len(self._verdicts) >= VERDICT_CACHE_SIZE:
+                self._verdicts.clear()
+            self._verdicts[key] = verdict
+        return verdict
+
+
+# 启动时为每个角色编译一次
+ROLE_CLASSIFIERS = {role: RolePermissions(role, operations) for role, operations in ROLE_PERMISSIONS.items()}
+
+
+def get_role_classifier(role: str) -> RolePermissions:
+    """获取指定角色编译后的权限判定器，未知角色按只读处理
+
+    参数:
+        role (str): 角色名称
+
+    返回:
+        RolePermissions: 该角色的权限判定器
+    """
+    return ROLE_CLASSIFIERS.get(role, ROLE_CLASSIFIERS["readonly"])
+
+
+# 查询成本保护：各角色执行读语句前 EXPLAIN 估算的扫描行数与查询成本上限，0 表示不限制
+ROLE_COST_LIMITS = {
+    "readonly": {"max_rows": 1000000, "max_cost": 200000},
+    "writer": {"max_rows": 1000000, "max_cost": 200000},
+    "admin": {"max_rows": 10000000, "max_cost": 2000000},
+}
+
+# off: 不检查；reject: 拒绝超限的语句；limit: 能通过 LIMIT 提前结束的语句自动加上 LIMIT，其余拒绝
+COST_GUARD_MODES = ("off", "reject", "limit")
+
+
+def get_cost_guard_config(role: str = None):
+    """从环境变量获取查询成本保护配置
+
+    上限默认取 ROLE_COST_LIMITS 中该角色的值，MYSQL_COST_GUARD_MAX_ROWS / MYSQL_COST_GUARD_MAX_COST 可覆盖
+
+    参数:
+        role (str, 可选): 角色名称，默认取 MYSQL_ROLE
+
+    返回:
+        dict: 成本保护配置
+        - mode: off、reject 或 limit，默认为 off
+        - max_rows: 预计扫描行数上限，0 表示不限制
+        - max_cost: 预计查询成本上限，0 表示不限制
+        - limit: limit 模式下自动添加的 LIMIT 行数
+    """
+    load_dotenv()
+
+    role = role or os.getenv("MYSQL_ROLE", "readonly")
+    limits = ROLE_COST_LIMITS.get(role, ROLE_COST_LIMITS["readonly"])
+    config = {
+        "mode": os.getenv("MYSQL_COST_GUARD", "off").lower(),
+        "max_rows": float(os.getenv("MYSQL_COST_GUARD_MAX_ROWS", str(limits["max_rows"]))),
+        "max_cost": float(os.getenv("MYSQL_COST_GUARD_MAX_COST", str(limits["max_cost"]))),
+        "limit": int(os.getenv("MYSQL_COST_GUARD_LIMIT", "1000")),
+    }
+
+    if config["mode"] not in COST_GUARD_MODES:
+        raise ValueError(f"成本保护配置错误：MYSQL_COST_GUARD 必须是 {', '.join(COST_GUARD_MODES)} 之一")
+    if config["max_rows"] < 0 or config["max_cost"] < 0 or config["limit"] < 1:
+        raise ValueError("成本保护配置错误：行数和成本上限不能为负数，MYSQL_COST_GUARD_LIMIT 至少为1")
+
+    return config
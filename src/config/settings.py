@@ -0,0 +1,243 @@
+import os
+import signal
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional
+
+from dotenv import dotenv_values, find_dotenv
+
+from .dbconfig import (
+    get_db_config,
+    get_role_permissions,
+    get_pool_config,
+    get_executor_config,
+    get_result_config,
+    get_metadata_cache_config,
+    get_result_cache_config,
+    get_health_config,
+    get_bulk_insert_config,
+    get_search_index_config,
+    get_timeout_config,
+    get_cost_guard_config,
+    get_tracing_config,
+    get_role_classifier,
+    RolePermissions,
+)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """启动时加载一次的只读配置快照
+
+    请求路径上只读取该对象，不再访问 .env 文件或解析环境变量；
+    重新加载时整体替换为新的快照，已取得旧快照的调用不受影响。
+    """
+    # 不含 database/role 的连接参数
+    connection: Mapping[str, Any]
+    database: Optional[str]
+    role: str
+    # 当前角色允许的操作，预先转换为 frozenset
+    allowed_operations: FrozenSet[str]
+    # 当前角色编译后的权限判定器
+    permissions: RolePermissions
+    pool: Mapping[str, Any]
+    executor: Mapping[str, Any]
+    result: Mapping[str, Any]
+    metadata_cache: Mapping[str, Any]
+    result_cache: Mapping[str, Any]
+    health: Mapping[str, Any]
+    bulk_insert: Mapping[str, Any]
+    search_index: Mapping[str, Any]
+    # 当前角色的执行超时
+    timeout: Mapping[str, Any]
+    # 当前角色的查询成本保护
+    cost_guard: Mapping[str, Any]
+    # 慢调用日志与采样分析
+    tracing: Mapping[str, Any]
+    # 检查 .env 是否被修改的间隔（秒），0 表示不检查
+    watch_interval: float
+
+
+# 回调参数为 (旧配置, 新配置)
+ReloadListener = Callable[[Settings, Settings], None]
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.RLock()
+_listeners: List[ReloadListener] = []
+# 进程启动时已存在的环境变量，优先级高于 .env，重新加载时不覆盖
+_process_env: FrozenSet[str] = frozenset(os.environ)
+# 上一次从 .env 写入环境变量的键，文件中删除的键在重新加载时一并移除
+_dotenv_keys: FrozenSet[str] = frozenset()
+
+
+def _dotenv_path() -> str:
+    return find_dotenv()
+
+
+def _apply_dotenv() -> Dict[str, Optional[str]]:
+    """将 .env 的当前内容同步到环境变量，不覆盖进程启动时已设置的变量
+
+    返回:
+        dict: 被修改的环境变量原来的值（None 表示原来不存在），用于还原
+    """
+    global _dotenv_keys
+    path = _dotenv_path()
+    values = {k: v for k, v in (dotenv_values(path) if path else {}).items()
+              if v is not None and k not in _process_env}
+    removed = _dotenv_keys - set(values)
+    previous = {key: os.environ.get(key) for key in set(values) | removed}
+    for key in removed:
+        os.environ.pop(key, None)
+    os.environ.update(values)
+    _dotenv_keys = frozenset(values)
+    return previous
+
+
+def _restore_env(previous: Mapping[str, Optional[str]], dotenv_keys: FrozenSet[str]) -> None:
+    global _dotenv_keys
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+    _dotenv_keys = dotenv_keys
+
+
+def _build() -> Settings:
+    db_config = get_db_config()
+    role = db_config["role"]
+    return Settings(
+        connection=MappingProxyType({k: v for k, v in db_config.items() if k not in ("database", "role")}),
+        database=db_config["database"],
+        role=role,
+        allowed_operations=frozenset(get_role_permissions(role)),
+        permissions=get_role_classifier(role),
+        pool=MappingProxyType(get_pool_config()),
+        executor=MappingProxyType(get_executor_config()),
+        result=MappingProxyType(get_result_config()),
+        metadata_cache=MappingProxyType(get_metadata_cache_config()),
+        result_cache=MappingProxyType(get_result_cache_config()),
+        health=MappingProxyType(get_health_config()),
+        bulk_insert=MappingProxyType(get_bulk_insert_config()),
+        search_index=MappingProxyType(get_search_index_config()),
+        timeout=MappingProxyType(get_timeout_config(role)),
+        cost_guard=MappingProxyType(get_cost_guard_config(role)),
+        tracing=MappingProxyType(get_tracing_config()),
+        watch_interval=float(os.getenv("MYSQL_CONFIG_WATCH_INTERVAL", "5")),
+    )
+
+
+def get_settings() -> Settings:
+    """获取当前配置快照，首次调用时从 .env 和环境变量加载
+
+    异常:
+        ValueError: 当配置缺失或不合法时抛出
+    """
+    settings = _settings
+    if settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _load()
+            settings = _settings
+    return settings
+
+
+def _load() -> None:
+    global _settings
+    _apply_dotenv()
+    _settings = _build()
+
+
+def reload_settings() -> Settings:
+    """重新读取 .env 并替换配置快照，随后通知所有监听者
+
+    新配置不合法时保留旧配置并抛出异常
+
+    返回:
+        Settings: 新的配置快照
+
+    异常:
+        ValueError: 当新配置缺失或不合法时抛出
+    """
+    global _settings
+    with _settings_lock:
+        old = get_settings()
+        saved_keys = _dotenv_keys
+        previous = _apply_dotenv()
+        try:
+            new = _build()
+        except Exception:
+            _restore_env(previous, saved_keys)
+            raise
+        _settings = new
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(old, new)
+        except Exception as e:
+            print(f"配置重新加载回调出错: {str(e)}", file=sys.stderr)
+    return new
+
+
+def add_reload_listener(listener: ReloadListener) -> None:
+    """注册配置重新加载后的回调，用于连接池、缓存等按新配置调整"""
+    with _settings_lock:
+        _listeners.append(listener)
+
+
+def _reload_quietly(reason: str) -> None:
+    try:
+        reload_settings()
+        print(f"配置已重新加载({reason})", file=sys.stderr)
+    except Exception as e:
+        print(f"配置重新加载失败({reason})，继续使用旧配置: {str(e)}", file=sys.stderr)
+
+
+def install_reload_triggers() -> None:
+    """安装配置重新加载的触发方式
+
+    - SIGHUP 信号（仅限支持该信号的平台，需在主线程调用）
+    - 按 MYSQL_CONFIG_WATCH_INTERVAL 间隔检查 .env 的修改时间，变化后重新加载
+
+    配置缺失或不合法时不抛出异常，服务照常启动，错误在第一次调用工具时返回；
+    修改 .env 后由上述方式重新加载
+    """
+    if hasattr(signal, "SIGHUP") and threading.current_thread() is threading.main_thread():
+        # 信号处理函数中只启动线程，避免在任意位置被打断的主线程里持锁
+        signal.signal(signal.SIGHUP, lambda signum, frame: threading.Thread(
+            target=_reload_quietly, args=("SIGHUP",), daemon=True
+        ).start())
+
+    try:
+        interval = get_settings().watch_interval
+    except Exception as e:
+        print(f"配置加载失败，将在调用工具时报告: {str(e)}", file=sys.stderr)
+        try:
+            interval = float(os.getenv("MYSQL_CONFIG_WATCH_INTERVAL", "5"))
+        except ValueError:
+            interval = 0
+    if interval > 0:
+        threading.Thread(target=_watch_dotenv, args=(interval,), name="config-watcher", daemon=True).start()
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _watch_dotenv(interval: float) -> None:
+    path = _dotenv_path()
+    last = _mtime(path) if path else None
+    while True:
+        time.sleep(interval)
+        # .env 可能在启动后才创建
+        path = path or _dotenv_path()
+        current = _mtime(path) if path else None
+        if current != last:
+            last = current
+            _reload_quietly(".env 已修改")
@@ -0,0 +1,33 @@
+from .pool import ConnectionPool, PoolTimeoutError, get_pool, close_pool
+from .executor import get_executor, run_blocking, shutdown_executor
+from .serializers import ResultWriter, SERIALIZERS, get_serializer
+from .metadata_cache import MetadataCache, get_metadata_cache
+from .result_cache import ResultCache, get_result_cache
+from .deadline import QueryDeadline, with_max_execution_time
+from .search_index import SearchIndex, get_search_index
+from .health_sampler import HealthSampler, get_health_sampler
+from .innodb_status import parse_innodb_status
+
+__all__ = [
+    "ConnectionPool",
+    "PoolTimeoutError",
+    "get_pool",
+    "close_pool",
+    "get_executor",
+    "run_blocking",
+    "shutdown_executor",
+    "ResultWriter",
+    "SERIALIZERS",
+    "get_serializer",
+    "MetadataCache",
+    "get_metadata_cache",
+    "ResultCache",
+    "get_result_cache",
+    "QueryDeadline",
+    "with_max_execution_time",
+    "SearchIndex",
+    "get_search_index",
+    "HealthSampler",
+    "get_health_sampler",
+    "parse_innodb_status",
+]
@@ -0,0 +1,183 @@
+import json
+import re
+from typing import Any, FrozenSet, List, NamedTuple, Optional, Tuple
+
+# 只对读语句做成本检查
+GUARDED_OPERATIONS = ("SELECT", "WITH")
+
+# 聚合函数：没有 GROUP BY 时需要读完全部行才能返回，LIMIT 无法让查询提前结束
+AGGREGATE_FUNCTIONS = frozenset([
+    "COUNT", "SUM", "AVG", "MIN", "MAX", "GROUP_CONCAT", "JSON_ARRAYAGG", "JSON_OBJECTAGG",
+    "STD", "STDDEV", "STDDEV_POP", "STDDEV_SAMP", "VARIANCE", "VAR_POP", "VAR_SAMP",
+    "BIT_AND", "BIT_OR", "BIT_XOR",
+])
+
+# 出现在最外层时不能在语句末尾追加 LIMIT 的子句
+_NOT_LIMITABLE = frozenset(["LIMIT", "INTO", "FOR", "LOCK", "PROCEDURE"])
+
+_TOKEN = re.compile(
+    r"'(?:[^'\\]|\\[\s\S]|'')*'|\"(?:[^\"\\]|\\[\s\S]|\"\")*\"|`(?:[^`]|``)*`"
+    r"|(?P<open>\()|(?P<close>\))|(?P<word>[A-Za-z_][\w$]*)(?P<call>\s*\()?"
+)
+
+
+class TableEstimate(NamedTuple):
+    """执行计划中单个表的估算"""
+    table: str
+    access_type: str
+    # 整个查询中该表预计被扫描的行数（单次扫描行数 × 被驱动的次数）
+    rows_examined: float
+
+
+class PlanEstimate(NamedTuple):
+    """EXPLAIN FORMAT=JSON 的估算结果"""
+    rows_examined: float
+    cost: float
+    tables: Tuple[TableEstimate, ...]
+    # 执行计划包含文件排序或临时表，需要读完全部输入后才能输出第一行
+    blocking: bool
+
+    @property
+    def worst_table(self) -> Optional[TableEstimate]:
+        """预计扫描行数最多的表"""
+        return max(self.tables, key=lambda table: table.rows_examined, default=None)
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _walk(node: Any, loops: float, tables: List[TableEstimate], flags: List[bool]) -> None:
+    if isinstance(node, list):
+        for item in node:
+            _walk(item, loops, tables, flags)
+        return
+    if not isinstance(node, dict):
+        return
+    for key, value in node.items():
+        if key == "nested_loop" and isinstance(value, list):
+            # 嵌套循环连接中，后一个表被驱动的次数为前面各表连接后产生的行数
+            prefix = loops
+            for item in value:
+                _walk(item, prefix, tables, flags)
+                table = item.get("table") if isinstance(item, dict) else None
+                if isinstance(table, dict):
+                    prefix = loops * max(_number(table.get("rows_produced_per_join", table.get("rows"))), 1)
+        elif key == "table" and isinstance(value, dict):
+            # MySQL 为 rows_examined_per_scan，MariaDB 为 rows
+            per_scan = _number(value.get("rows_examined_per_scan", value.get("rows")))
+            tables.append(TableEstimate(
+                str(value.get("table_name", "?")), str(value.get("access_type", "?")), per_scan * loops,
+            ))
+            _walk(value, loops, tables, flags)
+        elif key in ("using_filesort", "using_temporary_table", "filesort", "temporary_table") and value:
+            flags.append(True)
+            _walk(value, loops, tables, flags)
+        else:
+            _walk(value, loops, tables, flags)
+
+
+def _query_costs(node: Any, costs: List[float]) -> None:
+    if isinstance(node, list):
+        for item in node:
+            _query_costs(item, costs)
+    elif isinstance(node, dict):
+        cost_info = node.get("cost_info")
+        if isinstance(cost_info, dict) and "query_cost" in cost_info:
+            costs.append(_number(cost_info["query_cost"]))
+            return
+        for value in node.values():
+            _query_costs(value, costs)
+
+
+def parse_explain_json(text: str) -> Optional[PlanEstimate]:
+    """解析 EXPLAIN FORMAT=JSON 的输出
+
+    参数:
+        text (str): EXPLAIN 返回的JSON文本
+
+    返回:
+        PlanEstimate: 各表的估算扫描行数、总成本及是否包含阻塞操作；无法解析时返回None
+    """
+    try:
+        plan = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(plan, dict) or "query_block" not in plan:
+        return None
+
+    tables: List[TableEstimate] = []
+    flags: List[bool] = []
+    _walk(plan, 1.0, tables, flags)
+    # 最外层查询块的成本已包含子查询；UNION 没有总成本，累加各分支
+    costs: List[float] = []
+    _query_costs(plan["query_block"], costs)
+    return PlanEstimate(sum(table.rows_examined for table in tables), sum(costs), tuple(tables), bool(flags))
+
+
+def _top_level(code: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """找出不在括号内的关键字与函数调用（大写）"""
+    words, calls = set(), set()
+    depth = 0
+    for match in _TOKEN.finditer(code):
+        if match.group("open"):
+            depth += 1
+        elif match.group("close"):
+            depth = max(depth - 1, 0)
+        elif match.group("word"):
+            if depth == 0:
+                (calls if match.group("call") else words).add(match.group("word").upper())
+            if match.group("call"):
+                depth += 1
+    return frozenset(words), frozenset(calls)
+
+
+def _reads_everything(plan: PlanEstimate, words: FrozenSet[str], calls: FrozenSet[str]) -> bool:
+    """执行计划是否需要读完全部输入才能返回结果：文件排序、临时表或没有 GROUP BY 的聚合"""
+    return plan.blocking or bool(calls & AGGREGATE_FUNCTIONS and "GROUP" not in words)
+
+
+def has_effective_limit(code: str, plan: PlanEstimate) -> bool:
+    """语句最外层已有 LIMIT 且执行计划能在读到足够的行后提前结束
+
+    EXPLAIN 的扫描行数估算不考虑 LIMIT，这类语句的实际扫描行数远小于估算，不应被拒绝
+    """
+    words, calls = _top_level(code)
+    return "LIMIT" in words and not _reads_everything(plan, words, calls)
+
+
+def inject_limit(text: str, code: str, limit: int, plan: PlanEstimate) -> Optional[str]:
+    """在语句末尾追加 LIMIT，使查询读到足够的行后提前结束
+
+    参数:
+        text (str): 要执行的原始语句
+        code (str): 去掉注释后的语句，用于分析子句
+        limit (int): 追加的行数上限
+        plan (PlanEstimate): 该语句的执行计划估算
+
+    返回:
+        str: 追加 LIMIT 后的语句；已有 LIMIT、包含 INTO/锁定读，或执行计划需要读完全部行
+        （文件排序、临时表、没有 GROUP BY 的聚合）时 LIMIT 无法降低成本，返回None
+    """
+    words, calls = _top_level(code)
+    if words & _NOT_LIMITABLE or _reads_everything(plan, words, calls):
+        return None
+    # 换行后追加，语句末尾的 -- 注释不会吞掉 LIMIT
+    return f"{text}\nLIMIT {int(limit)}"
+
+
+def exceeds(plan: PlanEstimate, max_rows: float, max_cost: float) -> bool:
+    """估算的扫描行数或成本是否超过上限，上限为 0 表示不限制"""
+    return bool((max_rows and plan.rows_examined > max_rows) or (max_cost and plan.cost > max_cost))
+
+
+def describe(plan: PlanEstimate, max_rows: float, max_cost: float) -> str:
+    """说明执行计划超限的原因及主要来源的表和访问方式"""
+    reason = f"预计扫描 {plan.rows_examined:.0f} 行、查询成本 {plan.cost:.1f}，上限为 {max_rows:.0f} 行、成本 {max_cost:.1f}（0 表示不限制）"
+    worst = plan.worst_table
+    if worst is not None:
+        reason += f"；主要来自表 `{worst.table}`（访问方式 {worst.access_type}，预计扫描 {worst.rows_examined:.0f} 行）"
+    return reason
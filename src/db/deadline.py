@@ -0,0 +1,89 @@
+import re
+import threading
+from typing import Any, Optional
+
+from .pool import ConnectionPool
+
+# 语句开头的空白和注释，优化器提示只能紧跟在第一个 SELECT 之后
+_LEADING_SELECT = re.compile(r"\A((?:\s+|/\*(?!!|\+)[\s\S]*?\*/|(?:--(?=\s)|#)[^\n]*\n)*)(SELECT\b)", re.IGNORECASE)
+_HAS_HINT = re.compile(r"\bMAX_EXECUTION_TIME\s*\(", re.IGNORECASE)
+_HINT_COMMENT = re.compile(r"\s*/\*\+")
+
+
+def with_max_execution_time(sql: str, timeout: float) -> str:
+    """为 SELECT 语句加上 MAX_EXECUTION_TIME 优化器提示，由服务器在超时后终止查询
+
+    参数:
+        sql (str): 单条SQL语句
+        timeout (float): 超时时间（秒），0 表示不限制
+
+    返回:
+        str: 加上提示后的语句；不是 SELECT、已带有该提示或无法定位 SELECT 时原样返回
+    """
+    if timeout <= 0 or _HAS_HINT.search(sql):
+        return sql
+    match = _LEADING_SELECT.match(sql)
+    if match is None:
+        return sql
+    hint = f"MAX_EXECUTION_TIME({max(1, int(timeout * 1000))})"
+    # 一个查询块只识别一个提示注释，已有提示注释时合并进去
+    existing = _HINT_COMMENT.match(sql, match.end())
+    if existing:
+        return f"{sql[:existing.end()]} {hint}{sql[existing.end():]}"
+    return f"{sql[:match.end()]} /*+ {hint} */{sql[match.end():]}"
+
+
+class QueryDeadline:
+    """一次工具调用的执行期限
+
+    记录调用当前使用的连接；超过期限或调用被取消时，通过连接池在旁路连接上
+    KILL QUERY，让服务器立即停止执行并释放锁。只在连接借出期间才会发出 KILL，
+    归还后的连接不受影响。
+    """
+
+    def __init__(self, pool: ConnectionPool, timeout: float = 0):
+        self.pool = pool
+        self.timeout = timeout
+        self.expired = False
+        self.cancelled = False
+        self._conn: Any = None
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        if timeout > 0:
+            self._timer = threading.Timer(timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def stopped(self) -> bool:
+        """已超时或已取消，后续语句不应再执行"""
+        return self.expired or self.cancelled
+
+    def attach(self, conn: Any) -> None:
+        """记录调用借出的连接，在连接归还前调用 detach"""
+        with self._lock:
+            self._conn = conn
+
+    def detach(self) -> None:
+        with self._lock:
+            self._conn = None
+
+    def _kill(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self.pool.kill_query(self._conn)
+
+    def _expire(self) -> None:
+        self.expired = True
+        self._kill()
+
+    def cancel(self) -> None:
+        """调用被取消时调用，在后台线程中终止正在执行的语句，不阻塞事件循环"""
+        self.cancelled = True
+        self.close()
+        threading.Thread(target=self._kill, name="kill-query", daemon=True).start()
+
+    def close(self) -> None:
+        """调用结束后停止计时"""
+        if self._timer is not None:
+            self._timer.cancel()
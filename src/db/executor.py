@@ -0,0 +1,61 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from config import Settings, get_settings, add_reload_listener
+from utils import tracing
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """获取执行数据库操作的全局线程池，线程数即数据库操作的最大并发数"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_settings().executor["max_workers"],
+                    thread_name_prefix="mysql-worker",
+                )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """在线程池中执行阻塞的数据库操作，避免阻塞事件循环
+
+    func 在调用方上下文的副本中执行，当前调用的跟踪（见 utils.tracing）在线程池中同样可见
+
+    参数:
+        func: 要执行的同步函数
+        *args, **kwargs: 传给 func 的参数
+
+    返回:
+        func 的返回值
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, tracing.profiled(func), *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """关闭全局线程池"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def _on_config_reload(old: Settings, new: Settings) -> None:
+    """线程数变化时替换线程池，已提交的任务在旧线程池中继续执行完毕"""
+    if old.executor != new.executor:
+        shutdown_executor(wait=False)
+
+
+add_reload_listener(_on_config_reload)
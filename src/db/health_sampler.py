@@ -0,0 +1,326 @@
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from config import Settings, get_settings, add_reload_listener
+from utils import get_metrics
+from .pool import get_pool
+
+# 采样的全局状态计数器（只增不减，服务器重启后归零）
+STATUS_COUNTERS = (
+    "Questions", "Com_select", "Com_insert", "Com_update", "Com_delete", "Com_commit", "Com_rollback",
+    "Innodb_rows_read", "Innodb_rows_inserted", "Innodb_rows_updated", "Innodb_rows_deleted",
+    "Innodb_buffer_pool_read_requests", "Innodb_buffer_pool_reads",
+    "Innodb_row_lock_waits", "Innodb_row_lock_time",
+    "Slow_queries", "Created_tmp_disk_tables", "Bytes_sent", "Uptime",
+)
+# 采样的全局状态瞬时值
+STATUS_GAUGES = ("Threads_connected", "Threads_running")
+
+_STATUS_SQL = "SHOW GLOBAL STATUS WHERE Variable_name IN ({})".format(
+    ", ".join(f"'{name}'" for name in STATUS_COUNTERS + STATUS_GAUGES)
+)
+_IDLE_COMMANDS = "('Sleep', 'Daemon', 'Binlog Dump', 'Binlog Dump GTID')"
+_PROCESSLIST_SQL = (
+    f"SELECT COUNT(*), COALESCE(SUM(COMMAND NOT IN {_IDLE_COMMANDS}), 0), "
+    f"COALESCE(MAX(IF(COMMAND NOT IN {_IDLE_COMMANDS}, TIME, 0)), 0) FROM information_schema.PROCESSLIST"
+)
+_TRX_SQL = (
+    "SELECT COUNT(*), COALESCE(SUM(trx_state = 'LOCK WAIT'), 0), "
+    "COALESCE(MAX(TIMESTAMPDIFF(SECOND, trx_started, NOW())), 0) FROM information_schema.INNODB_TRX"
+)
+
+# 趋势的变化幅度小于该比例时视为持平
+TREND_THRESHOLD = 0.1
+
+
+class HealthSample(NamedTuple):
+    """一次采样"""
+    # 采样时间（Unix 时间戳）与单调时钟，速率按单调时钟计算
+    at: float
+    monotonic: float
+    # STATUS_COUNTERS 与 STATUS_GAUGES 的值，服务器没有的变量不出现
+    status: Dict[str, int]
+    sessions: int
+    active_sessions: int
+    # 非空闲会话中执行时间最长的秒数
+    longest_query: int
+    transactions: int
+    # 处于 LOCK WAIT 状态的事务数
+    lock_wait_transactions: int
+    oldest_transaction: int
+
+
+def _counter(name: str) -> Callable[[HealthSample, HealthSample, float], Optional[float]]:
+    def rate(first: HealthSample, last: HealthSample, seconds: float) -> Optional[float]:
+        if name not in first.status or name not in last.status:
+            return None
+        return (last.status[name] - first.status[name]) / seconds
+    return rate
+
+
+def _counters(*names: str) -> Callable[[HealthSample, HealthSample, float], Optional[float]]:
+    rates = [_counter(name) for name in names]
+
+    def rate(first: HealthSample, last: HealthSample, seconds: float) -> Optional[float]:
+        values = [func(first, last, seconds) for func in rates]
+        return None if None in values else sum(values)
+    return rate
+
+
+def _ratio(numerator: str, denominator: str, scale: float, complement: bool = False):
+    def ratio(first: HealthSample, last: HealthSample, seconds: float) -> Optional[float]:
+        if any(name not in sample.status for name in (numerator, denominator) for sample in (first, last)):
+            return None
+        delta = last.status[denominator] - first.status[denominator]
+        if delta <= 0:
+            return None
+        value = (last.status[numerator] - first.status[numerator]) / delta
+        return (1 - value) * scale if complement else value * scale
+    return ratio
+
+
+# 由相邻两次采样计算的指标: (名称, 说明, 计算函数)
+RATE_METRICS: Tuple[Tuple[str, str, Callable[[HealthSample, HealthSample, float], Optional[float]]], ...] = (
+    ("qps", "每秒语句数 (Questions/s)", _counter("Questions")),
+    ("select_per_sec", "每秒 SELECT", _counter("Com_select")),
+    ("insert_per_sec", "每秒 INSERT", _counter("Com_insert")),
+    ("update_per_sec", "每秒 UPDATE", _counter("Com_update")),
+    ("delete_per_sec", "每秒 DELETE", _counter("Com_delete")),
+    ("commit_per_sec", "每秒 COMMIT", _counter("Com_commit")),
+    ("rollback_per_sec", "每秒 ROLLBACK", _counter("Com_rollback")),
+    ("rows_read_per_sec", "InnoDB 每秒读取行数", _counter("Innodb_rows_read")),
+    ("rows_written_per_sec", "InnoDB 每秒插入/更新/删除行数",
+     _counters("Innodb_rows_inserted", "Innodb_rows_updated", "Innodb_rows_deleted")),
+    ("buffer_pool_reads_per_sec", "缓冲池未命中、从磁盘读取的页数/秒", _counter("Innodb_buffer_pool_reads")),
+    ("buffer_pool_hit_pct", "缓冲池命中率 (%)",
+     _ratio("Innodb_buffer_pool_reads", "Innodb_buffer_pool_read_requests", 100, complement=True)),
+    ("row_lock_waits_per_sec", "每秒行锁等待次数", _counter("Innodb_row_lock_waits")),
+    ("row_lock_wait_avg_ms", "平均每次行锁等待时间 (毫秒)", _ratio("Innodb_row_lock_time", "Innodb_row_lock_waits", 1)),
+    ("slow_queries_per_sec", "每秒慢查询数", _counter("Slow_queries")),
+    ("tmp_disk_tables_per_sec", "每秒创建的磁盘临时表", _counter("Created_tmp_disk_tables")),
+    ("bytes_sent_per_sec", "每秒发送字节数", _counter("Bytes_sent")),
+)
+
+# 取自单次采样的瞬时值: (名称, 说明, 取值函数)
+GAUGE_METRICS: Tuple[Tuple[str, str, Callable[[HealthSample], Optional[float]]], ...] = (
+    ("threads_connected", "当前连接数", lambda sample: sample.status.get("Threads_connected")),
+    ("threads_running", "正在运行的线程数", lambda sample: sample.status.get("Threads_running")),
+    ("active_sessions", "非空闲会话数", lambda sample: sample.active_sessions),
+    ("longest_query_seconds", "执行时间最长的语句 (秒)", lambda sample: sample.longest_query),
+    ("transactions", "活动事务数", lambda sample: sample.transactions),
+    ("lock_wait_transactions", "等待锁的事务数", lambda sample: sample.lock_wait_transactions),
+    ("oldest_transaction_seconds", "最长事务已运行时间 (秒)", lambda sample: sample.oldest_transaction),
+)
+
+SUMMARY_COLUMNS = ["metric", "description", "latest", "avg", "min", "max", "trend"]
+
+
+def _trend(before: Optional[float], after: Optional[float]) -> str:
+    """比较窗口前后两半的平均值"""
+    if before is None or after is None:
+        return ""
+    if before == 0:
+        return "flat" if after == 0 else "up"
+    change = (after - before) / abs(before)
+    if abs(change) < TREND_THRESHOLD:
+        return "flat"
+    return f"{'up' if change > 0 else 'down'} {change:+.0%}"
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 2)
+
+
+def _since_restart(samples: List[HealthSample]) -> List[HealthSample]:
+    """服务器重启后计数器归零，只保留最后一次重启之后的采样"""
+    for index in range(len(samples) - 1, 0, -1):
+        previous, current = samples[index - 1].status.get("Uptime"), samples[index].status.get("Uptime")
+        if previous is not None and current is not None and current < previous:
+            return samples[index:]
+    return samples
+
+
+class HealthSampler:
+    """在后台按固定间隔采样全局状态计数器、会话和事务概况，保存在固定大小的环形缓冲中
+
+    每次采样在一条连接上执行三条轻量查询（SHOW GLOBAL STATUS 的指定变量，以及
+    PROCESSLIST、INNODB_TRX 的聚合），健康检查工具据此计算每秒速率和趋势，不必在调用时执行重查询。
+    """
+
+    def __init__(self, sample_interval: float = 0, sample_history: int = 720):
+        self.sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._samples: Deque[HealthSample] = deque(maxlen=sample_history)
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self.last_error: Optional[str] = None
+        self._stats = {"samples": 0, "failures": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_interval > 0
+
+    def configure(self, sample_interval: float, sample_history: int) -> None:
+        """按新配置调整采样间隔与缓冲大小，保留最近的采样"""
+        with self._lock:
+            self.sample_interval = sample_interval
+            if self._samples.maxlen != sample_history:
+                self._samples = deque(self._samples, maxlen=sample_history)
+        self._wake.set()
+        self.start()
+
+    def start(self) -> None:
+        """开启采样时启动后台线程，已在运行时不做任何事"""
+        with self._lock:
+            if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+                return
+            # 丢弃 configure 留下的唤醒，否则启动后会紧接着连续采样两次
+            self._wake.clear()
+            self._thread = threading.Thread(target=self._run, name="health-sampler", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            interval = self.sample_interval
+            if interval <= 0:
+                return
+            started = time.monotonic()
+            try:
+                self.sample()
+            except Exception as e:
+                with self._lock:
+                    self._stats["failures"] += 1
+                    first_failure = self.last_error is None
+                    self.last_error = str(e)
+                if first_failure:
+                    print(f"健康状态采样失败: {str(e)}", file=sys.stderr)
+            # 配置修改后立即按新间隔继续
+            self._wake.wait(max(0.0, interval - (time.monotonic() - started)))
+            self._wake.clear()
+
+    def sample(self) -> HealthSample:
+        """同步采样一次并加入缓冲
+
+        异常:
+            Error: 查询失败时抛出
+        """
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(_STATUS_SQL)
+                status = {}
+                for name, value in cursor.fetchall():
+                    try:
+                        status[name] = int(value)
+                    except (TypeError, ValueError):
+                        continue
+                at, monotonic = time.time(), time.monotonic()
+                cursor.execute(_PROCESSLIST_SQL)
+                sessions, active, longest = cursor.fetchone()
+                cursor.execute(_TRX_SQL)
+                transactions, lock_waits, oldest = cursor.fetchone()
+        sample = HealthSample(at, monotonic, status, int(sessions), int(active), int(longest),
+                              int(transactions), int(lock_waits), int(oldest))
+        with self._lock:
+            self._samples.append(sample)
+            self._stats["samples"] += 1
+            self.last_error = None
+        return sample
+
+    def samples(self, seconds: Optional[float] = None) -> List[HealthSample]:
+        """获取最近 seconds 秒内的采样，按时间顺序"""
+        with self._lock:
+            samples = list(self._samples)
+        if seconds is not None and samples:
+            since = samples[-1].monotonic - seconds
+            samples = [sample for sample in samples if sample.monotonic >= since]
+        return samples
+
+    def summarize(self, minutes: float = 5) -> Optional[Tuple[str, List[Tuple[Any, ...]]]]:
+        """计算最近 minutes 分钟内各指标的速率与趋势
+
+        速率指标中 latest 为最后两次采样之间的值，avg 为窗口首尾采样之间的值，min/max 为相邻采样之间的
+        最小/最大值；瞬时值指标按各次采样计算。trend 比较窗口前后两半，变化小于 10% 时为 flat
+
+        参数:
+            minutes (float): 统计窗口（分钟）
+
+        返回:
+            tuple: (说明文字, 按 SUMMARY_COLUMNS 排列的行)；采样少于两次时返回None
+        """
+        samples = _since_restart(self.samples(minutes * 60))
+        if len(samples) < 2:
+            return None
+        first, last = samples[0], samples[-1]
+        middle = samples[len(samples) // 2]
+        pairs = [(a, b, b.monotonic - a.monotonic) for a, b in zip(samples, samples[1:]) if b.monotonic > a.monotonic]
+
+        rows: List[Tuple[Any, ...]] = []
+        for name, description, func in RATE_METRICS:
+            values = [value for value in (func(a, b, seconds) for a, b, seconds in pairs) if value is not None]
+            if not values:
+                continue
+            before = func(first, middle, middle.monotonic - first.monotonic) if middle is not first else None
+            after = func(middle, last, last.monotonic - middle.monotonic) if middle is not last else None
+            rows.append((name, description, _round(values[-1]),
+                         _round(func(first, last, last.monotonic - first.monotonic)),
+                         _round(min(values)), _round(max(values)), _trend(before, after)))
+        half = len(samples) // 2
+        for name, description, getter in GAUGE_METRICS:
+            values = [getter(sample) for sample in samples]
+            if any(value is None for value in values):
+                continue
+            before, after = values[:half], values[half:]
+            rows.append((name, description, values[-1], _round(sum(values) / len(values)), min(values), max(values),
+                         _trend(sum(before) / len(before) if before else None, sum(after) / len(after))))
+
+        span = last.monotonic - first.monotonic
+        header = (f"最近 {span / 60:.1f} 分钟的 {len(samples)} 次采样"
+                  f"（{time.strftime('%H:%M:%S', time.localtime(first.at))} - "
+                  f"{time.strftime('%H:%M:%S', time.localtime(last.at))}，间隔 {self.sample_interval:g} 秒）")
+        return header, rows
+
+    def clear(self) -> None:
+        """丢弃已有的采样"""
+        with self._lock:
+            self._samples.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """获取采样统计信息"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["buffered"] = len(self._samples)
+            stats["capacity"] = self._samples.maxlen
+        return stats
+
+
+_sampler: Optional[HealthSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_health_sampler() -> HealthSampler:
+    """获取全局健康状态采样器，首次调用时根据配置创建（不会立即开始采样，见 HealthSampler.start）"""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                config = get_settings().health
+                _sampler = HealthSampler(config["sample_interval"], config["sample_history"])
+    return _sampler
+
+
+def _on_config_reload(old: Settings, new: Settings) -> None:
+    if _sampler is not None and old.health != new.health:
+        _sampler.configure(new.health["sample_interval"], new.health["sample_history"])
+    # 连到另一台服务器后旧的采样没有意义
+    if _sampler is not None and old.connection != new.connection:
+        _sampler.clear()
+
+
+add_reload_listener(_on_config_reload)
+
+get_metrics().register_collector(
+    "health_sampler", lambda: _sampler.stats() if _sampler is not None else None, ("samples", "failures"),
+)
@@ -0,0 +1,408 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# SHOW ENGINE INNODB STATUS 中可能出现的段落，不同版本会少几个；未出现的段落在结果中为None
+SECTIONS = (
+    "BACKGROUND THREAD",
+    "SEMAPHORES",
+    "LATEST FOREIGN KEY ERROR",
+    "LATEST DETECTED DEADLOCK",
+    "TRANSACTIONS",
+    "FILE I/O",
+    "INSERT BUFFER AND ADAPTIVE HASH INDEX",
+    "LOG",
+    "BUFFER POOL AND MEMORY",
+    "INDIVIDUAL BUFFER POOL INFO",
+    "ROW OPERATIONS",
+)
+# 未指定段落时返回的段落，均解析为结构化字段
+DEFAULT_SECTIONS = (
+    "SEMAPHORES",
+    "LATEST DETECTED DEADLOCK",
+    "TRANSACTIONS",
+    "BUFFER POOL AND MEMORY",
+    "ROW OPERATIONS",
+    "LOG",
+)
+# 事务列表最多返回的活动事务数，按已运行时间从长到短
+MAX_TRANSACTIONS = 20
+# 事务正在执行的语句的最大长度，超出部分截断
+MAX_QUERY_LENGTH = 1000
+# 没有专门解析的段落原样返回，超出该长度的部分截断
+MAX_TEXT_LENGTH = 4000
+
+_RULE = re.compile(r"^-{3,}$")
+# 5.7 为 2024-01-01 08:00:00，8.0 为 2024-01-01T08:00:00.123456+08:00，其后为线程号
+_TIMESTAMP = re.compile(r"^(\d{4}-\d\d-\d\d[ T][\d:.]+(?:[+-]\d\d:\d\d|Z)?)")
+_AVERAGES = re.compile(r"Per second averages calculated from the last (\d+) seconds")
+_NUMBER = re.compile(r"^-?\d+$")
+
+_TRX_HEADER = re.compile(
+    r"^(?:---)?TRANSACTION (\d+), (?:(ACTIVE)(?: \(PREPARED\))? (\d+) sec|not started)(?:,?\s*(.*))?$"
+)
+_TRX_LINES = (
+    (re.compile(r"^mysql tables in use (\d+), locked (\d+)"), ("tables_in_use", "tables_locked")),
+    (re.compile(r"(\d+) lock struct\(s\), heap size (\d+), (\d+) row lock\(s\)(?:, undo log entries (\d+))?"),
+     ("lock_structs", "heap_size", "row_locks", "undo_log_entries")),
+    (re.compile(r"^MySQL thread id (\d+), OS thread handle \S+, query id (\d+)\s*(.*)$"),
+     ("thread_id", "query_id", "client")),
+    (re.compile(r"^------- TRX HAS BEEN WAITING (\d+) SEC"), ("lock_wait_seconds",)),
+)
+# 事务详情中不属于语句文本的行
+_TRX_DETAIL = re.compile(
+    r"^(?:mysql tables in use|LOCK WAIT|\d+ lock struct|MySQL thread id|Trx read view|Trx #rec lock|"
+    r"------- TRX HAS BEEN WAITING|RECORD LOCKS|TABLE LOCK|Record lock|\s*\d+: len|---|\*\*\* )"
+)
+
+_RECORD_LOCK = re.compile(
+    r"^RECORD LOCKS space id (\d+) page no (\d+) n bits \d+ index (\S+) of table (\S+) trx id (\d+) (.*)$"
+)
+_TABLE_LOCK = re.compile(r"^TABLE LOCK table (\S+) trx id (\d+) (.*)$")
+_DEADLOCK_MARK = re.compile(r"^\*\*\* \((\d+)\) (TRANSACTION|HOLDS THE LOCK\(S\)|WAITING FOR THIS LOCK TO BE GRANTED):")
+_ROLL_BACK = re.compile(r"^\*\*\* WE ROLL BACK TRANSACTION \((\d+)\)")
+
+_LONG_SEMAPHORE_WAIT = re.compile(r"has waited at (\S+ line \d+) for ([\d.]+) seconds the semaphore")
+
+_SECTION_PATTERNS = {
+    "SEMAPHORES": (
+        (re.compile(r"OS WAIT ARRAY INFO: reservation count (\d+)"), ("reservation_count",)),
+        (re.compile(r"OS WAIT ARRAY INFO: signal count (\d+)"), ("signal_count",)),
+        (re.compile(r"RW-shared spins (\d+), rounds (\d+), OS waits (\d+)"),
+         ("rw_shared_spins", "rw_shared_rounds", "rw_shared_os_waits")),
+        (re.compile(r"RW-excl spins (\d+), rounds (\d+), OS waits (\d+)"),
+         ("rw_excl_spins", "rw_excl_rounds", "rw_excl_os_waits")),
+        (re.compile(r"RW-sx spins (\d+), rounds (\d+), OS waits (\d+)"),
+         ("rw_sx_spins", "rw_sx_rounds", "rw_sx_os_waits")),
+    ),
+    "TRANSACTIONS": (
+        (re.compile(r"Trx id counter (\d+)"), ("trx_id_counter",)),
+        (re.compile(r"Purge done for trx's n:o < (\d+) undo n:o < (\d+)(?: state: (.+))?"),
+         ("purge_done_trx_id", "purge_done_undo_no", "purge_state")),
+        (re.compile(r"History list length (\d+)"), ("history_list_length",)),
+    ),
+    "BUFFER POOL AND MEMORY": (
+        (re.compile(r"Total (?:large )?memory allocated (\d+)"), ("total_memory_allocated",)),
+        (re.compile(r"Dictionary memory allocated (\d+)"), ("dictionary_memory_allocated",)),
+        (re.compile(r"Buffer pool size\s+(\d+)"), ("pool_size_pages",)),
+        (re.compile(r"Free buffers\s+(\d+)"), ("free_pages",)),
+        (re.compile(r"^Database pages\s+(\d+)", re.MULTILINE), ("database_pages",)),
+        (re.compile(r"Old database pages\s+(\d+)"), ("old_database_pages",)),
+        (re.compile(r"Modified db pages\s+(\d+)"), ("modified_pages",)),
+        (re.compile(r"Pending reads\s+(\d+)"), ("pending_reads",)),
+        (re.compile(r"Pending writes: LRU (\d+), flush list (\d+)"), ("pending_writes_lru", "pending_writes_flush_list")),
+        (re.compile(r"Pages made young (\d+), not young (\d+)"), ("pages_made_young", "pages_not_young")),
+        (re.compile(r"Pages read (\d+), created (\d+), written (\d+)"), ("pages_read", "pages_created", "pages_written")),
+        (re.compile(r"([\d.]+) reads/s, ([\d.]+) creates/s, ([\d.]+) writes/s"),
+         ("reads_per_sec", "creates_per_sec", "writes_per_sec")),
+        (re.compile(r"Buffer pool hit rate (\d+) / (\d+)"), ("hit_rate", "hit_rate_base")),
+        (re.compile(r"evicted without access ([\d.]+)/s"), ("evicted_without_access_per_sec",)),
+        (re.compile(r"LRU len: (\d+)"), ("lru_len",)),
+    ),
+    "ROW OPERATIONS": (
+        (re.compile(r"(\d+) queries inside InnoDB, (\d+) queries in queue"), ("queries_inside", "queries_in_queue")),
+        (re.compile(r"(\d+) read views open inside InnoDB"), ("read_views_open",)),
+        (re.compile(r"Main thread .*state:?\s*=?\s*(.+)$", re.MULTILINE), ("main_thread_state",)),
+        (re.compile(r"Number of rows inserted (\d+), updated (\d+), deleted (\d+), read (\d+)"),
+         ("rows_inserted", "rows_updated", "rows_deleted", "rows_read")),
+        (re.compile(r"([\d.]+) inserts/s, ([\d.]+) updates/s, ([\d.]+) deletes/s, ([\d.]+) reads/s"),
+         ("inserts_per_sec", "updates_per_sec", "deletes_per_sec", "reads_per_sec")),
+    ),
+    "LOG": (
+        (re.compile(r"Log sequence number\s+(\d+)"), ("log_sequence_number",)),
+        (re.compile(r"Log flushed up to\s+(\d+)"), ("log_flushed_up_to",)),
+        (re.compile(r"Pages flushed up to\s+(\d+)"), ("pages_flushed_up_to",)),
+        (re.compile(r"Last checkpoint at\s+(\d+)"), ("last_checkpoint_at",)),
+        (re.compile(r"(\d+) pending log (?:flushes|writes), (\d+) pending chkp writes"),
+         ("pending_log_flushes", "pending_checkpoint_writes")),
+        (re.compile(r"(\d+) log i/o's done, ([\d.]+) log i/o's/second"), ("log_ios", "log_ios_per_sec")),
+    ),
+}
+
+
+def section_key(title: str) -> str:
+    """段落标题对应的结果键，如 BUFFER POOL AND MEMORY -> buffer_pool_and_memory"""
+    return re.sub(r"\W+", "_", title.lower()).strip("_")
+
+
+_SECTION_BY_KEY = {section_key(title): title for title in SECTIONS}
+
+
+def normalize_sections(sections: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """将调用方指定的段落（标题或结果键，不区分大小写）转换为段落标题
+
+    参数:
+        sections (list[str], 可选): 段落列表，为空时返回 DEFAULT_SECTIONS
+
+    返回:
+        tuple[str]: 段落标题
+
+    异常:
+        ValueError: 包含未知的段落时抛出
+    """
+    if not sections:
+        return DEFAULT_SECTIONS
+    if isinstance(sections, str):
+        sections = [sections]
+    titles = []
+    for name in sections:
+        title = _SECTION_BY_KEY.get(section_key(str(name)))
+        if title is None:
+            raise ValueError(f"未知的段落 {name}，可选: {', '.join(_SECTION_BY_KEY)}")
+        if title not in titles:
+            titles.append(title)
+    return tuple(titles)
+
+
+def split_sections(text: str) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    """将 SHOW ENGINE INNODB STATUS 的输出按段落拆分
+
+    段落标题上下各有一行由短横线组成的分隔线
+
+    返回:
+        tuple: (输出时间、统计时长等概况, 段落标题 -> 段落内的行)
+    """
+    lines = text.splitlines()
+    overview: Dict[str, Any] = {}
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    index = 0
+    while index < len(lines):
+        line = lines[index].rstrip()
+        if (_RULE.match(line) and index + 2 < len(lines) and _RULE.match(lines[index + 2].rstrip())
+                and lines[index + 1].strip() and not _RULE.match(lines[index + 1].strip())):
+            title = lines[index + 1].strip()
+            if title == "END OF INNODB MONITOR OUTPUT":
+                break
+            current = sections.setdefault(title, [])
+            index += 3
+            continue
+        if current is None:
+            match = _TIMESTAMP.match(line)
+            if match and line.endswith("INNODB MONITOR OUTPUT"):
+                overview["time"] = match.group(1)
+            match = _AVERAGES.search(line)
+            if match:
+                overview["averages_seconds"] = int(match.group(1))
+        else:
+            current.append(line)
+        index += 1
+    return overview, sections
+
+
+def _number(value: Optional[str]) -> Any:
+    if value is None:
+        return None
+    if _NUMBER.match(value):
+        return int(value)
+    try:
+        return float(value)
+    except ValueError:
+        return value.strip()
+
+
+def _extract(text: str, patterns: Sequence[Tuple[Any, Sequence[str]]]) -> Dict[str, Any]:
+    """按 (正则, 各分组对应的键) 提取指标，每个正则取第一处匹配，未匹配的指标不出现在结果中"""
+    metrics: Dict[str, Any] = {}
+    for pattern, keys in patterns:
+        match = pattern.search(text)
+        if match is None:
+            continue
+        for key, value in zip(keys, match.groups()):
+            if value is not None:
+                metrics[key] = _number(value)
+    return metrics
+
+
+def _parse_lock(line: str) -> Optional[Dict[str, Any]]:
+    match = _RECORD_LOCK.match(line)
+    if match:
+        space, page, index, table, trx_id, mode = match.groups()
+        return {
+            "type": "RECORD", "table": table.replace("`", ""), "index": index, "space_id": int(space),
+            "page_no": int(page), "trx_id": int(trx_id), "mode": mode.replace(" waiting", "").strip(),
+        }
+    match = _TABLE_LOCK.match(line)
+    if match:
+        table, trx_id, mode = match.groups()
+        return {"type": "TABLE", "table": table.replace("`", ""), "trx_id": int(trx_id),
+                "mode": mode.replace(" waiting", "").strip()}
+    return None
+
+
+def _parse_transaction(lines: Sequence[str]) -> Dict[str, Any]:
+    """解析一个事务的描述：TRANSACTION 行及其后的锁、线程和语句信息"""
+    trx: Dict[str, Any] = {}
+    query: List[str] = []
+    locks: List[Dict[str, Any]] = []
+    record_count = 0
+    for line in lines:
+        match = _TRX_HEADER.match(line)
+        if match and "id" not in trx:
+            trx_id, active, seconds, state = match.groups()
+            trx["id"] = int(trx_id)
+            trx["active_seconds"] = int(seconds) if active else None
+            trx["prepared"] = "(PREPARED)" in line
+            if state:
+                trx["state"] = state.strip()
+            continue
+        if line.startswith("LOCK WAIT"):
+            trx["lock_wait"] = True
+        if line.startswith("Record lock, heap no"):
+            record_count += 1
+        lock = _parse_lock(line)
+        if lock is not None:
+            locks.append(lock)
+            continue
+        matched = False
+        for pattern, keys in _TRX_LINES:
+            found = pattern.search(line)
+            if found:
+                matched = True
+                for key, value in zip(keys, found.groups()):
+                    if value is not None:
+                        trx[key] = _number(value) if key != "client" else value.strip()
+        if not matched and line.strip() and not _TRX_DETAIL.match(line):
+            query.append(line.strip())
+    if "lock_wait_seconds" in trx:
+        trx["lock_wait"] = True
+    if query:
+        trx["query"] = " ".join(query)[:MAX_QUERY_LENGTH]
+    if locks:
+        trx["locks"] = locks
+    if record_count:
+        trx["locked_records"] = record_count
+    return trx
+
+
+def parse_deadlock(lines: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """解析 LATEST DETECTED DEADLOCK 段落
+
+    返回:
+        dict: time 为检测到死锁的时间；victim 为被回滚的事务；holders 为其余参与死锁的事务。
+        每个事务包含 holds（持有的锁）和 waiting_for（等待的锁）；没有死锁记录时返回None
+    """
+    deadlock: Dict[str, Any] = {}
+    transactions: Dict[int, Dict[str, Any]] = {}
+    blocks: Dict[Tuple[int, str], List[str]] = {}
+    current: Optional[List[str]] = None
+    rolled_back = None
+    for line in lines:
+        if not line.strip():
+            continue
+        match = _DEADLOCK_MARK.match(line)
+        if match:
+            current = blocks.setdefault((int(match.group(1)), match.group(2)), [])
+            continue
+        match = _ROLL_BACK.match(line)
+        if match:
+            rolled_back = int(match.group(1))
+            current = None
+            continue
+        if line.startswith("*** "):
+            # 如 TOO DEEP OR LONG SEARCH IN THE LOCK TABLE WAITS-FOR GRAPH
+            deadlock.setdefault("notes", []).append(line.strip("* ").strip())
+            current = None
+            continue
+        if current is not None:
+            current.append(line)
+        elif "time" not in deadlock:
+            match = _TIMESTAMP.match(line)
+            if match:
+                deadlock["time"] = match.group(1)
+    if not blocks:
+        return None
+
+    for (number, kind), block in blocks.items():
+        trx = transactions.setdefault(number, {"number": number})
+        if kind == "TRANSACTION":
+            trx.update(_parse_transaction(block))
+            continue
+        locks = [lock for lock in (_parse_lock(line) for line in block) if lock is not None]
+        key = "holds" if kind.startswith("HOLDS") else "waiting_for"
+        trx[key] = trx.get(key, []) + locks
+
+    for trx in transactions.values():
+        # TRANSACTION 块中的锁出现在 5.7 之前未分开标注持有/等待的格式中，视为正在等待的锁
+        locks = trx.pop("locks", None)
+        if locks and "waiting_for" not in trx:
+            trx["waiting_for"] = locks
+    deadlock["rolled_back"] = rolled_back
+    deadlock["victim"] = transactions.get(rolled_back)
+    deadlock["holders"] = [trx for number, trx in sorted(transactions.items()) if number != rolled_back]
+    return deadlock
+
+
+def parse_transactions(lines: Sequence[str]) -> Dict[str, Any]:
+    """解析 TRANSACTIONS 段落：事务计数器、purge 进度和各会话的活动事务"""
+    result = _extract("\n".join(lines), _SECTION_PATTERNS["TRANSACTIONS"])
+    blocks: List[List[str]] = []
+    for line in lines:
+        if line.startswith("---TRANSACTION "):
+            blocks.append([line])
+        elif blocks:
+            blocks[-1].append(line)
+    transactions = [_parse_transaction(block) for block in blocks]
+    active = [trx for trx in transactions if trx.get("active_seconds") is not None]
+    active.sort(key=lambda trx: trx["active_seconds"], reverse=True)
+    result["sessions"] = len(transactions)
+    result["active_transactions"] = len(active)
+    result["lock_wait_transactions"] = sum(1 for trx in active if trx.get("lock_wait"))
+    result["transactions"] = active[:MAX_TRANSACTIONS]
+    return result
+
+
+def parse_section(title: str, lines: Sequence[str]) -> Any:
+    """将一个段落解析为结构化字段，没有专门解析的段落返回截断后的原文"""
+    if title == "LATEST DETECTED DEADLOCK":
+        return parse_deadlock(lines)
+    if title == "TRANSACTIONS":
+        return parse_transactions(lines)
+    patterns = _SECTION_PATTERNS.get(title)
+    if patterns is None:
+        text = "\n".join(lines).strip()
+        return {"text": text[:MAX_TEXT_LENGTH], "truncated": len(text) > MAX_TEXT_LENGTH}
+
+    text = "\n".join(lines)
+    metrics = _extract(text, patterns)
+    if title == "SEMAPHORES":
+        metrics["long_waits"] = [
+            {"location": match.group(1), "seconds": float(match.group(2))}
+            for match in _LONG_SEMAPHORE_WAIT.finditer(text)
+        ]
+    elif title == "BUFFER POOL AND MEMORY":
+        if metrics.get("hit_rate_base"):
+            metrics["hit_rate_pct"] = round(metrics["hit_rate"] * 100 / metrics["hit_rate_base"], 2)
+        if metrics.get("pool_size_pages"):
+            metrics["free_pct"] = round(metrics.get("free_pages", 0) * 100 / metrics["pool_size_pages"], 2)
+            metrics["dirty_pct"] = round(metrics.get("modified_pages", 0) * 100 / metrics["pool_size_pages"], 2)
+    elif title == "LOG":
+        lsn = metrics.get("log_sequence_number")
+        if lsn is not None and "last_checkpoint_at" in metrics:
+            metrics["checkpoint_age"] = lsn - metrics["last_checkpoint_at"]
+        if lsn is not None and "log_flushed_up_to" in metrics:
+            metrics["unflushed_log"] = lsn - metrics["log_flushed_up_to"]
+    return metrics
+
+
+def parse_innodb_status(text: str, sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """解析 SHOW ENGINE INNODB STATUS 的 Status 列
+
+    参数:
+        text (str): Status 列的文本
+        sections (list[str], 可选): 需要的段落（标题或结果键，如 deadlock 段落可写为 latest_detected_deadlock），
+            默认为 DEFAULT_SECTIONS
+
+    返回:
+        dict: time 为输出时间，averages_seconds 为每秒平均值的统计时长，
+        其余键为各段落的结果键（见 section_key），输出中没有的段落为None
+
+    异常:
+        ValueError: 包含未知的段落时抛出
+    """
+    titles = normalize_sections(sections)
+    overview, found = split_sections(text)
+    result = dict(overview)
+    for title in titles:
+        lines = found.get(title)
+        result[section_key(title)] = parse_section(title, lines) if lines is not None else None
+    return result
@@ -0,0 +1,260 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from config import Settings, get_settings, add_reload_listener
+from utils import get_metrics
+
+# 数据库对象名：反引号包裹的任意名称，或由字母数字下划线/$组成的名称
+_NAME = r"(?:`(?:[^`]|``)+`|[\w$]+)"
+_QUALIFIED_NAME = rf"{_NAME}(?:\s*\.\s*{_NAME})?"
+
+DDL_KEYWORDS = ("CREATE", "ALTER", "DROP", "RENAME", "TRUNCATE")
+
+_TABLE_DDL = re.compile(
+    rf"^\s*(?:CREATE|ALTER|DROP)\s+(?:OR\s+REPLACE\s+)?(?:TEMPORARY\s+)?(?:ALGORITHM\s*=\s*\w+\s+)?"
+    rf"(?:DEFINER\s*=\s*\S+\s+)?(?:SQL\s+SECURITY\s+\w+\s+)?(?:TABLE|VIEW)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?"
+    rf"((?:{_QUALIFIED_NAME})(?:\s*,\s*{_QUALIFIED_NAME})*)",
+    re.IGNORECASE,
+)
+_TRUNCATE = re.compile(rf"^\s*TRUNCATE\s+(?:TABLE\s+)?({_QUALIFIED_NAME})", re.IGNORECASE)
+_INDEX_DDL = re.compile(
+    rf"^\s*(?:CREATE|DROP)\s+(?:UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)?INDEX\s+{_NAME}\s+ON\s+({_QUALIFIED_NAME})",
+    re.IGNORECASE,
+)
+_DATABASE_DDL = re.compile(
+    rf"^\s*(?:CREATE|ALTER|DROP)\s+(?:DATABASE|SCHEMA)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?({_NAME})",
+    re.IGNORECASE,
+)
+_RENAME_TABLE = re.compile(r"^\s*RENAME\s+TABLES?\s+(.+)$", re.IGNORECASE | re.DOTALL)
+_ALTER_RENAME = re.compile(rf"\bRENAME\s+(?:TO\s+|AS\s+)?({_QUALIFIED_NAME})", re.IGNORECASE)
+_NAME_PATTERN = re.compile(_QUALIFIED_NAME)
+
+
+def _unquote(name: str) -> str:
+    name = name.strip()
+    if name.startswith("`") and name.endswith("`"):
+        return name[1:-1].replace("``", "`")
+    return name
+
+
+def _split_name(name: str, current_schema: Optional[str]) -> Tuple[Optional[str], str]:
+    parts = re.findall(_NAME, name)
+    if len(parts) == 2:
+        return _unquote(parts[0]), _unquote(parts[1])
+    return current_schema, _unquote(parts[0])
+
+
+def ddl_targets(statement: str, current_schema: Optional[str] = None) -> Optional[List[Tuple[Optional[str], Optional[str]]]]:
+    """解析DDL语句影响的 (schema, table) 列表
+
+    参数:
+        statement (str): SQL语句
+        current_schema (str, 可选): 语句执行时的当前数据库
+
+    返回:
+        list | None: 受影响的 (schema, table) 列表，table 为 None 表示整个库；
+        非DDL语句返回空列表；无法识别的DDL返回 None，表示需要清空全部缓存
+    """
+    words = statement.lstrip().split(None, 1)
+    if not words or words[0].upper() not in DDL_KEYWORDS:
+        return []
+
+    match = _DATABASE_DDL.match(statement)
+    if match:
+        return [(_unquote(match.group(1)), None)]
+
+    match = _TABLE_DDL.match(statement) or _INDEX_DDL.match(statement) or _TRUNCATE.match(statement)
+    if match:
+        targets = [_split_name(name, current_schema) for name in _NAME_PATTERN.findall(match.group(1))]
+        # ALTER TABLE ... RENAME TO 新表名
+        targets.extend(_split_name(name, current_schema) for name in _ALTER_RENAME.findall(statement))
+        return targets
+
+    match = _RENAME_TABLE.match(statement)
+    if match:
+        return [_split_name(name, current_schema) for name in _NAME_PATTERN.findall(match.group(1))
+                if name.upper() != "TO"]
+
+    # 存储过程、用户等对象的DDL不影响表结构
+    upper = statement.upper()
+    if not any(keyword in upper for keyword in ("TABLE", "VIEW", "INDEX", "DATABASE", "SCHEMA")):
+        return []
+    return None
+
+
+class MetadataCache:
+    """表/列/索引等元数据查询结果的进程内缓存
+
+    缓存键为 (kind, schema, table, *extra)，schema/table 为 None 表示该条目依赖整个库或所有库。
+    条目按TTL过期，总大小超过预算时按LRU淘汰；执行DDL后按 (schema, table) 失效。
+    """
+
+    def __init__(self, ttl: float = 300, max_bytes: int = 16 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        # 每次失效递增，用于丢弃失效前开始加载、失效后才写入的旧数据
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    @staticmethod
+    def make_key(kind: str, schema: Optional[str], table: Optional[str], *extra: Hashable) -> Tuple:
+        """生成缓存键，库名/表名统一为小写"""
+        return (
+            kind,
+            schema.lower() if schema else None,
+            table.lower() if table else None,
+        ) + extra
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """获取缓存值，不存在或已过期时返回 None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def put(self, key: Tuple, value: Any, size: int, generation: Optional[int] = None) -> None:
+        """写入缓存
+
+        参数:
+            key: 由 make_key 生成的缓存键
+            value: 缓存值
+            size (int): 缓存值的大致字节数，用于内存预算
+            generation (int, 可选): 开始加载时的 generation，期间发生过失效则不写入
+        """
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def configure(self, ttl: float, max_bytes: int) -> None:
+        """调整有效期与内存上限，已缓存的条目超出新的上限时按LRU淘汰"""
+        with self._lock:
+            self.ttl = ttl
+            self.max_bytes = max_bytes
+            while self._entries and (self._bytes > max_bytes or not self.enabled):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    @staticmethod
+    def _depends_on(key: Tuple, value: Any, schema: Optional[str], table: Optional[str]) -> bool:
+        """条目是否依赖 (schema, table)，参数均已转换为小写，None 表示任意"""
+        return ((schema is None or key[1] is None or key[1] == schema)
+                and (table is None or key[2] is None or key[2] == table))
+
+    def invalidate(self, schema: Optional[str] = None, table: Optional[str] = None) -> int:
+        """使与 (schema, table) 相关的缓存失效
+
+        参数:
+            schema (str, 可选): 库名，None 表示所有库
+            table (str, 可选): 表名，None 表示库中所有表
+
+        返回:
+            int: 失效的条目数
+        """
+        schema = schema.lower() if schema else None
+        table = table.lower() if table else None
+        with self._lock:
+            removed = [
+                key for key, (_, _, value) in self._entries.items()
+                if self._depends_on(key, value, schema, table)
+            ]
+            for key in removed:
+                self._bytes -= self._entries.pop(key)[1]
+            self._stats["invalidations"] += len(removed)
+            self.generation += 1
+        return len(removed)
+
+    def invalidate_statement(self, statement: str, current_schema: Optional[str] = None) -> None:
+        """根据执行的SQL语句使相关缓存失效，非DDL语句不做处理"""
+        targets = ddl_targets(statement, current_schema)
+        if targets is None:
+            self.clear()
+            return
+        for schema, table in targets:
+            self.invalidate(schema, table)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存命中/未命中等统计信息"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+_metadata_cache: Optional[MetadataCache] = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """获取全局元数据缓存，首次调用时根据配置创建"""
+    global _metadata_cache
+    if _metadata_cache is None:
+        with _metadata_cache_lock:
+            if _metadata_cache is None:
+                _metadata_cache = MetadataCache(**get_settings().metadata_cache)
+    return _metadata_cache
+
+
+def _on_config_reload(old: Settings, new: Settings) -> None:
+    if _metadata_cache is not None and old.metadata_cache != new.metadata_cache:
+        _metadata_cache.configure(**new.metadata_cache)
+
+
+add_reload_listener(_on_config_reload)
+
+# 缓存统计中只增不减的计数
+CACHE_COUNTERS = ("hits", "misses", "evictions", "expirations", "invalidations")
+
+get_metrics().register_collector(
+    "metadata_cache", lambda: _metadata_cache.stats() if _metadata_cache is not None else None, CACHE_COUNTERS
+)
@@ -0,0 +1,432 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mysql.connector import connect, Error
+
+from config import Settings, get_settings, add_reload_listener
+from utils import get_metrics
+
+
+class PoolTimeoutError(Error):
+    """等待可用连接超时时抛出"""
+
+
+class _StatementCache:
+    """单条连接上按语句文本缓存的预处理游标
+
+    mysql.connector 的预处理游标再次执行同一个语句对象时不会重新 prepare，
+    因此缓存中同时保存游标和首次使用的语句字符串
+    """
+    __slots__ = ("max_size", "_cursors")
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._cursors: "OrderedDict[str, Tuple[Any, str]]" = OrderedDict()
+
+    def get(self, operation: str) -> Optional[Tuple[Any, str]]:
+        entry = self._cursors.get(operation)
+        if entry is not None:
+            self._cursors.move_to_end(operation)
+        return entry
+
+    def put(self, operation: str, cursor: Any) -> Tuple[Any, str]:
+        entry = (cursor, operation)
+        self._cursors[operation] = entry
+        while len(self._cursors) > self.max_size:
+            _, (evicted, _) = self._cursors.popitem(last=False)
+            try:
+                # 关闭游标会释放服务器端的预处理语句
+                evicted.close()
+            except Exception:
+                pass
+        return entry
+
+    def clear(self) -> None:
+        """连接重连或会话被重置后，服务器端的预处理语句已不存在，直接丢弃游标"""
+        self._cursors.clear()
+
+
+class _PooledConnection:
+    """连接池中的一条连接及其借还状态"""
+    __slots__ = ("conn", "created_at", "last_used", "discard", "statements")
+
+    def __init__(self, conn: Any, statement_cache_size: int = 64):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+        self.discard = False
+        self.statements = _StatementCache(statement_cache_size)
+
+
+class ConnectionPool:
+    """线程安全的MySQL连接池
+
+    支持最小/最大连接数、空闲超时回收、借出时校验(ping/reset)以及连接池统计。
+    连接在归还时若仍处于事务中会被回滚；被标记为失效的连接归还时直接关闭。
+    每条连接按语句文本缓存预处理游标，同一语句在该连接上只 prepare 一次。
+    """
+
+    def __init__(
+        self,
+        connection_config: Dict[str, Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300,
+        acquire_timeout: float = 30,
+        validate: str = "ping",
+        statement_cache_size: int = 64,
+        connector: Callable[..., Any] = connect,
+    ):
+        self._connection_config = dict(connection_config)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.validate = validate
+        self.statement_cache_size = statement_cache_size
+        self._connector = connector
+
+        self._lock = threading.Condition()
+        self._idle: List[_PooledConnection] = []
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._opening = 0
+        self._closed = False
+
+        self._stats = {
+            "created": 0,
+            "closed": 0,
+            "acquired": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "timeouts": 0,
+            "validation_failures": 0,
+            "idle_expired": 0,
+            "max_in_use": 0,
+            "prepared_hits": 0,
+            "prepared_misses": 0,
+        }
+
+    def _open(self) -> _PooledConnection:
+        conn = self._connector(**self._connection_config)
+        with self._lock:
+            self._stats["created"] += 1
+        return _PooledConnection(conn, self.statement_cache_size)
+
+    def _close(self, entry: _PooledConnection) -> None:
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._stats["closed"] += 1
+
+    def _validate(self, entry: _PooledConnection) -> bool:
+        """借出前校验连接是否可用"""
+        if self.validate == "none":
+            return True
+        try:
+            if self.validate == "reset":
+                # 重置会话会释放服务器端的预处理语句
+                entry.statements.clear()
+                entry.conn.reset_session()
+            else:
+                entry.conn.ping(reconnect=False)
+            return True
+        except Exception:
+            with self._lock:
+                self._stats["validation_failures"] += 1
+            return False
+
+    def _take_idle(self) -> Optional[_PooledConnection]:
+        """从空闲队列中取出一条未过期的连接，调用方需持有锁"""
+        now = time.monotonic()
+        expired = []
+        # 空闲队列按归还时间排序，队首最旧；回收时保留 min_size 条连接
+        while (self.idle_timeout > 0 and self._idle
+               and now - self._idle[0].last_used > self.idle_timeout
+               and self._total() > self.min_size):
+            expired.append(self._idle.pop(0))
+        # 后进先出，优先复用最近使用过的连接
+        entry = self._idle.pop() if self._idle else None
+        if expired:
+            self._stats["idle_expired"] += len(expired)
+            # 关闭连接涉及网络IO，放到锁外执行
+            threading.Thread(target=self._close_many, args=(expired,), daemon=True).start()
+        return entry
+
+    def _close_many(self, entries: List[_PooledConnection]) -> None:
+        for entry in entries:
+            self._close(entry)
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """从连接池借出一条连接
+
+        参数:
+            timeout (float, 可选): 池耗尽时的最长等待时间，默认使用 acquire_timeout
+
+        返回:
+            MySQL连接对象
+
+        异常:
+            PoolTimeoutError: 在超时时间内没有可用连接时抛出
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited_since = None
+
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise Error("连接池已关闭")
+                entry = self._take_idle()
+                if entry is None:
+                    if self._total() < self.max_size:
+                        self._opening += 1
+                    else:
+                        if waited_since is None:
+                            waited_since = time.monotonic()
+                            self._stats["waits"] += 1
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._stats["timeouts"] += 1
+                            self._stats["wait_time"] += time.monotonic() - waited_since
+                            raise PoolTimeoutError(
+                                msg=f"等待数据库连接超时({timeout}秒)，连接池已达到最大连接数 {self.max_size}"
+                            )
+                        self._lock.wait(remaining)
+                        continue
+
+            if entry is None:
+                try:
+                    entry = self._open()
+                finally:
+                    with self._lock:
+                        self._opening -= 1
+                        if entry is None:
+                            self._lock.notify()
+            elif not self._validate(entry):
+                self._close(entry)
+                continue
+
+            with self._lock:
+                self._in_use[id(entry.conn)] = entry
+                self._stats["acquired"] += 1
+                if waited_since is not None:
+                    self._stats["wait_time"] += time.monotonic() - waited_since
+                self._stats["max_in_use"] = max(self._stats["max_in_use"], len(self._in_use))
+            return entry.conn
+
+    def release(self, conn: Any, discard: bool = False) -> None:
+        """归还连接
+
+        参数:
+            conn: 通过 acquire 借出的连接
+            discard (bool): 为True时直接关闭连接而不放回池中
+        """
+        with self._lock:
+            entry = self._in_use.pop(id(conn), None)
+        if entry is None:
+            return
+
+        discard = discard or entry.discard or self._closed
+        if not discard:
+            try:
+                # 未提交的事务不能带给下一个使用者
+                if conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard:
+            self._close(entry)
+        else:
+            entry.last_used = time.monotonic()
+            with self._lock:
+                self._idle.append(entry)
+        with self._lock:
+            self._lock.notify()
+
+    def invalidate(self, conn: Any) -> None:
+        """标记连接在归还时关闭，用于会话状态已被修改（如执行了USE）的连接"""
+        with self._lock:
+            entry = self._in_use.get(id(conn))
+            if entry is not None:
+                entry.discard = True
+
+    def kill_query(self, conn: Any) -> bool:
+        """在独立的旁路连接上执行 KILL QUERY，终止 conn 上正在执行的语句
+
+        旁路连接不从池中借出，连接池耗尽时也能终止查询；conn 随后被标记为失效，
+        避免残留的中断状态影响下一个使用者
+
+        参数:
+            conn: 通过 acquire 借出、正在执行语句的连接
+
+        返回:
+            bool: 是否成功发出 KILL QUERY
+        """
+        self.invalidate(conn)
+        connection_id = getattr(conn, "connection_id", None)
+        if connection_id is None:
+            return False
+        try:
+            side = self._connector(**self._connection_config)
+        except Error:
+            return False
+        try:
+            with side.cursor() as cursor:
+                cursor.execute(f"KILL QUERY {int(connection_id)}")
+            return True
+        except Error:
+            # 语句恰好已执行完，或线程已不存在
+            return False
+        finally:
+            try:
+                side.close()
+            except Exception:
+                pass
+
+    def prepared_cursor(self, conn: Any, operation: str) -> Tuple[Any, str]:
+        """获取在 conn 上预处理 operation 的游标，同一语句文本复用已缓存的游标
+
+        参数:
+            conn: 通过 acquire 借出的连接
+            operation (str): 使用 %s 或 ? 占位符的单条SQL语句
+
+        返回:
+            tuple: (预处理游标, 传给 cursor.execute 的语句字符串)；
+            游标由连接池管理，调用方不要关闭，且必须读完或丢弃结果集
+
+        异常:
+            Error: 连接不是从该连接池借出时抛出
+        """
+        with self._lock:
+            entry = self._in_use.get(id(conn))
+        if entry is None:
+            raise Error("连接不是从连接池借出的，或已归还")
+        cached = entry.statements.get(operation)
+        with self._lock:
+            self._stats["prepared_hits" if cached else "prepared_misses"] += 1
+        if cached is not None:
+            return cached
+        return entry.statements.put(operation, conn.cursor(prepared=True))
+
+    def forget_statements(self, conn: Any) -> None:
+        """连接重新建立后调用，丢弃该连接上缓存的预处理游标"""
+        with self._lock:
+            entry = self._in_use.get(id(conn))
+        if entry is not None:
+            entry.statements.clear()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """以上下文管理器方式借出连接，退出时自动归还；发生异常时连接被丢弃"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        else:
+            self.release(conn)
+
+    def warm_up(self) -> None:
+        """预先建立 min_size 条连接"""
+        while True:
+            with self._lock:
+                if self._closed or self._total() >= self.min_size:
+                    return
+                self._opening += 1
+            entry = None
+            try:
+                entry = self._open()
+            finally:
+                with self._lock:
+                    self._opening -= 1
+                    if entry is not None:
+                        self._idle.append(entry)
+                        self._lock.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        """获取连接池统计信息"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "total": self._total(),
+            })
+        return stats
+
+    def close(self) -> None:
+        """关闭连接池及所有空闲连接，借出中的连接在归还时关闭"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._lock.notify_all()
+        self._close_many(idle)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """获取所有工具共享的全局连接池，首次调用时根据配置创建"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                settings = get_settings()
+                pool = ConnectionPool(dict(settings.connection), **settings.pool)
+                try:
+                    pool.warm_up()
+                except Error:
+                    # 预热失败不影响创建，借出连接时会再次尝试并返回具体错误
+                    pass
+                _pool = pool
+    return _pool
+
+
+def close_pool() -> None:
+    """关闭全局连接池"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+def _on_config_reload(old: Settings, new: Settings) -> None:
+    """连接参数或连接池配置变化时关闭旧连接池，下次使用时按新配置创建"""
+    if old.connection != new.connection or old.pool != new.pool:
+        close_pool()
+
+
+add_reload_listener(_on_config_reload)
+
+
+def _collect_metrics() -> Optional[Dict[str, Any]]:
+    """连接池指标，连接池尚未创建时不输出"""
+    pool = _pool
+    if pool is None:
+        return None
+    stats = pool.stats()
+    stats["connections"] = stats.pop("total")
+    stats["wait_seconds"] = stats.pop("wait_time")
+    return stats
+
+
+get_metrics().register_collector("pool", _collect_metrics, counters=(
+    "created", "closed", "acquired", "waits", "wait_seconds", "timeouts", "validation_failures",
+    "idle_expired", "prepared_hits", "prepared_misses",
+))
@@ -0,0 +1,180 @@
+import re
+import threading
+from typing import Any, FrozenSet, NamedTuple, Optional, Tuple
+
+from config import Settings, get_settings, add_reload_listener
+from utils import get_metrics
+from .metadata_cache import (
+    CACHE_COUNTERS, MetadataCache, _NAME, _QUALIFIED_NAME, _split_name, ddl_targets, DDL_KEYWORDS
+)
+
+# 结果依赖会话或时间、每次执行可能不同的函数，包含这些函数的查询不缓存
+NON_DETERMINISTIC_FUNCTIONS = frozenset([
+    "NOW", "SYSDATE", "CURDATE", "CURTIME", "CURRENT_DATE", "CURRENT_TIME", "CURRENT_TIMESTAMP",
+    "LOCALTIME", "LOCALTIMESTAMP", "UTC_DATE", "UTC_TIME", "UTC_TIMESTAMP", "UNIX_TIMESTAMP",
+    "RAND", "RANDOM_BYTES", "UUID", "UUID_SHORT", "SLEEP", "BENCHMARK",
+    "CONNECTION_ID", "LAST_INSERT_ID", "ROW_COUNT", "FOUND_ROWS",
+    "USER", "CURRENT_USER", "SESSION_USER", "SYSTEM_USER", "CURRENT_ROLE",
+    "GET_LOCK", "RELEASE_LOCK", "RELEASE_ALL_LOCKS", "IS_FREE_LOCK", "IS_USED_LOCK",
+    "NEXTVAL", "LASTVAL", "GTID_SUBSET", "MASTER_POS_WAIT", "SOURCE_POS_WAIT",
+])
+
+# 会写入数据的语句，执行后使相关表的缓存失效
+WRITE_KEYWORDS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "LOAD") + DDL_KEYWORDS
+
+SYSTEM_SCHEMAS = frozenset(["information_schema", "performance_schema", "mysql", "sys"])
+
+# 去掉字符串字面量和反引号标识符后查找函数调用、变量与锁定读
+_LITERAL = re.compile(r"'(?:[^'\\]|\\[\s\S]|'')*'|\"(?:[^\"\\]|\\[\s\S]|\"\")*\"|`(?:[^`]|``)*`")
+_FUNCTION_CALL = re.compile(r"\b([A-Za-z_]\w*)\s*\(")
+_BARE_FUNCTION = re.compile(r"\b(CURRENT_DATE|CURRENT_TIME|CURRENT_TIMESTAMP|CURRENT_USER|LOCALTIME|LOCALTIMESTAMP|UTC_DATE|UTC_TIME|UTC_TIMESTAMP)\b", re.IGNORECASE)
+_UNCACHEABLE = re.compile(r"@|\bFOR\s+UPDATE\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bFOR\s+SHARE\b|\bINTO\b|\bSQL_NO_CACHE\b", re.IGNORECASE)
+
+# 表名出现的位置：FROM/JOIN/INTO/UPDATE/TABLE 之后，逗号分隔的多个表
+_TABLE_KEYWORD = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\b", re.IGNORECASE)
+_TABLE_NAME = re.compile(rf"\s*({_QUALIFIED_NAME})")
+_TABLE_ALIAS = re.compile(rf"\s+(?:AS\s+)?({_NAME})", re.IGNORECASE)
+_TABLE_SEPARATOR = re.compile(r"\s*,")
+# 紧跟在表名后、不是别名的关键字
+_CLAUSE_WORDS = frozenset([
+    "WHERE", "GROUP", "ORDER", "HAVING", "LIMIT", "JOIN", "INNER", "LEFT", "RIGHT", "CROSS", "STRAIGHT_JOIN",
+    "NATURAL", "OUTER", "ON", "USING", "UNION", "EXCEPT", "INTERSECT", "WINDOW", "FOR", "LOCK", "SET",
+    "VALUES", "VALUE", "SELECT", "PARTITION", "USE", "IGNORE", "FORCE", "INTO", "AS", "WITH", "TABLE",
+    "LINES", "FIELDS", "COLUMNS", "CHARACTER", "DUPLICATE", "RETURNING",
+])
+_WHITESPACE = re.compile(r"(" + _LITERAL.pattern + r")|\s+")
+
+
+def normalize_statement(code: str) -> str:
+    """将字符串字面量以外的连续空白压缩为一个空格，作为缓存键"""
+    return _WHITESPACE.sub(lambda match: match.group(1) or " ", code).strip()
+
+
+def referenced_tables(code: str, current_schema: Optional[str] = None) -> FrozenSet[Tuple[Optional[str], str]]:
+    """找出语句中出现的表，返回小写的 (schema, table) 集合
+
+    宁多勿少：子查询、函数中的 FROM 等也会被当作表名，只会导致多余的失效
+    """
+    tables = set()
+    for match in _TABLE_KEYWORD.finditer(code):
+        pos = match.end()
+        while True:
+            name = _TABLE_NAME.match(code, pos)
+            if name is None:
+                break
+            schema, table = _split_name(name.group(1), current_schema)
+            tables.add((schema.lower() if schema else None, table.lower()))
+            pos = name.end()
+            alias = _TABLE_ALIAS.match(code, pos)
+            if alias and alias.group(1).upper() not in _CLAUSE_WORDS:
+                pos = alias.end()
+            separator = _TABLE_SEPARATOR.match(code, pos)
+            if separator is None:
+                break
+            pos = separator.end()
+    return frozenset(tables)
+
+
+def is_cacheable(code: str, keywords: Tuple[str, ...], current_schema: Optional[str] = None) -> bool:
+    """判断查询结果能否缓存：只缓存不含不确定函数、变量、锁定读且不访问系统库的 SELECT"""
+    if not keywords or keywords[0] != "SELECT":
+        return False
+    stripped = _LITERAL.sub("''", code)
+    if _UNCACHEABLE.search(stripped) or _BARE_FUNCTION.search(stripped):
+        return False
+    if any(name.upper() in NON_DETERMINISTIC_FUNCTIONS for name in _FUNCTION_CALL.findall(stripped)):
+        return False
+    current = current_schema.lower() if current_schema else None
+    for schema, _ in referenced_tables(code, current_schema):
+        if (schema or current) in SYSTEM_SCHEMAS:
+            return False
+    return True
+
+
+class CachedResult(NamedTuple):
+    """缓存的单条查询结果"""
+    text: str
+    rows: int
+    size: int
+    tables: FrozenSet[Tuple[Optional[str], str]]
+
+
+class ResultCache(MetadataCache):
+    """execute_sql 中可重复执行的 SELECT 结果缓存
+
+    缓存键为 (规范化的语句, 当前数据库, 输出格式, 参数)，条目记录查询涉及的表；
+    通过本工具执行写入或DDL后按表失效，其他客户端的写入只能依靠TTL过期。
+    """
+
+    def __init__(self, ttl: float = 0, max_bytes: int = 32 * 1024 * 1024):
+        super().__init__(ttl, max_bytes)
+        self._stats["bypasses"] = 0
+        self._stats["bytes_saved"] = 0
+
+    @staticmethod
+    def make_key(statement: str, schema: Optional[str], output_format: str, params: Tuple = ()) -> Tuple:
+        return (normalize_statement(statement), schema.lower() if schema else None, output_format, tuple(params))
+
+    def get(self, key: Tuple) -> Optional[CachedResult]:
+        result = super().get(key)
+        if result is not None:
+            with self._lock:
+                self._stats["bytes_saved"] += result.size
+        return result
+
+    def record_bypass(self) -> None:
+        """记录一次因语句不可缓存而跳过缓存的查询"""
+        with self._lock:
+            self._stats["bypasses"] += 1
+
+    @staticmethod
+    def _depends_on(key: Tuple, value: Any, schema: Optional[str], table: Optional[str]) -> bool:
+        if schema is None and table is None:
+            return True
+        return any(
+            (schema is None or cached_schema is None or cached_schema == schema)
+            and (table is None or cached_table == table)
+            for cached_schema, cached_table in value.tables
+        )
+
+    def invalidate_statement(self, statement: str, current_schema: Optional[str] = None) -> None:
+        """根据执行的写入/DDL语句使相关表的缓存失效，无法确定影响的表时清空全部缓存"""
+        words = statement.lstrip().split(None, 1)
+        if not words or words[0].upper() not in WRITE_KEYWORDS:
+            return
+        if words[0].upper() in DDL_KEYWORDS:
+            targets = ddl_targets(statement, current_schema)
+        else:
+            targets = list(referenced_tables(statement, current_schema)) or None
+        if targets is None:
+            self.clear()
+            return
+        for schema, table in targets:
+            self.invalidate(schema, table)
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """获取全局查询结果缓存，首次调用时根据配置创建"""
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache(**get_settings().result_cache)
+    return _result_cache
+
+
+def _on_config_reload(old: Settings, new: Settings) -> None:
+    if _result_cache is not None and old.result_cache != new.result_cache:
+        _result_cache.configure(**new.result_cache)
+
+
+add_reload_listener(_on_config_reload)
+
+get_metrics().register_collector(
+    "result_cache", lambda: _result_cache.stats() if _result_cache is not None else None,
+    CACHE_COUNTERS + ("bypasses", "bytes_saved"),
+)
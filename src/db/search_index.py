@@ -0,0 +1,397 @@
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from config import Settings, get_settings, add_reload_listener
+from utils import get_metrics, initials
+from .pool import get_pool
+from .result_cache import SYSTEM_SCHEMAS
+
+# 按 (库, 表) 批量读取列信息时每批的表数量
+COLUMN_BATCH_SIZE = 500
+
+# 各字段匹配方式的得分：(完全相同, 前缀, 包含)
+FIELD_SCORES = {
+    "name": (100, 70, 50),
+    "comment": (90, 65, 45),
+    "initials": (60, 40, 25),
+}
+# 同等匹配时表排在列之前
+TABLE_BONUS = 10
+
+_EXCLUDED = ", ".join(f"'{schema}'" for schema in sorted(SYSTEM_SCHEMAS))
+_TABLES_SQL = (
+    "SELECT TABLE_SCHEMA, TABLE_NAME, TABLE_COMMENT, CREATE_TIME, UPDATE_TIME "
+    f"FROM information_schema.TABLES WHERE TABLE_SCHEMA NOT IN ({_EXCLUDED})"
+)
+_COLUMNS_SQL = (
+    "SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, COLUMN_COMMENT "
+    f"FROM information_schema.COLUMNS WHERE TABLE_SCHEMA NOT IN ({_EXCLUDED})"
+)
+
+TableKey = Tuple[str, str]
+
+
+class IndexedObject(NamedTuple):
+    """索引中的一张表或一列"""
+    schema: str
+    table: str
+    # 表为 None
+    column: Optional[str]
+    comment: str
+    table_comment: str
+    # 用于匹配的小写字段: (名称, 注释, 名称与注释的拼音首字母)
+    name_text: str
+    comment_text: str
+    initials_text: str
+
+
+class TableMatch(NamedTuple):
+    """按表汇总的搜索结果"""
+    schema: str
+    table: str
+    table_comment: str
+    score: float
+    # 命中的列，格式为 "列名(注释)"
+    columns: Tuple[str, ...]
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    return str(value)
+
+
+def _normalize(text: str) -> str:
+    return "".join(text.lower().split())
+
+
+def _grams(text: str) -> Set[str]:
+    """字符二元组，单个字符的查询不使用倒排表"""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _make_object(schema: str, table: str, column: Optional[str], comment: str, table_comment: str) -> IndexedObject:
+    name = column if column is not None else table
+    # 纯ASCII的名称首字母就是名称本身，不重复索引
+    parts = [initials(text) for text in (name, comment) if text and not text.isascii()]
+    return IndexedObject(
+        schema, table, column, comment, table_comment, _normalize(name), _normalize(comment), " ".join(parts),
+    )
+
+
+def _forced(key: TableKey, forced: Optional[Set[Tuple[Optional[str], Optional[str]]]]) -> bool:
+    if forced is None:
+        return True
+    if not forced:
+        return False
+    schema, table = key[0].lower(), key[1].lower()
+    return bool({(schema, table), (schema, None), (None, table)} & forced)
+
+
+def _score(query: str, obj: IndexedObject) -> float:
+    best = 0.0
+    for field, text in (("name", obj.name_text), ("comment", obj.comment_text), ("initials", obj.initials_text)):
+        if not text or query not in text:
+            continue
+        exact, prefix, contains = FIELD_SCORES[field]
+        # initials 字段由名称和注释的首字母以空格拼接，按单词判断完全相同与前缀
+        words = text.split() if field == "initials" else (text,)
+        if query in words:
+            score = exact
+        elif any(word.startswith(query) for word in words):
+            score = prefix
+        else:
+            score = contains
+        # 同等匹配时较短的文本更相关
+        best = max(best, score - len(text) / 1000)
+    if best and obj.column is None:
+        best += TABLE_BONUS
+    return best
+
+
+class SearchIndex:
+    """表名、列名及其注释的内存倒排索引
+
+    对名称、注释和注释的拼音首字母建立字符二元组倒排表，查询时取各二元组倒排表的交集
+    作为候选，再按匹配位置打分排序，不访问数据库。索引在后台线程中构建，之后按
+    information_schema.TABLES 的 CREATE_TIME / UPDATE_TIME / 注释变化增量刷新，
+    只重新读取变化的表的列信息。
+    """
+
+    def __init__(self, refresh_interval: float = 300):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        # 保证同一时刻只有一次刷新在构建新索引
+        self._refresh_lock = threading.Lock()
+        self._objects: Dict[int, IndexedObject] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._by_table: Dict[TableKey, List[int]] = {}
+        # 每张表上次建立索引时的 (CREATE_TIME, UPDATE_TIME, TABLE_COMMENT)
+        self._versions: Dict[TableKey, Tuple[Any, Any, str]] = {}
+        self._next_id = 0
+        self._ready = False
+        self._stale = False
+        # 通过 execute_sql 执行DDL的表，下一次刷新时无论时间戳是否变化都重新索引；None 表示全部
+        self._forced: Optional[Set[Tuple[Optional[str], Optional[str]]]] = set()
+        self._refreshing = False
+        self._refreshed_at = 0.0
+        self._stats = {"refreshes": 0, "tables_indexed": 0, "tables_removed": 0, "failures": 0, "searches": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.refresh_interval > 0
+
+    @property
+    def ready(self) -> bool:
+        """首次构建是否已完成"""
+        return self._ready
+
+    def configure(self, refresh_interval: float) -> None:
+        self.refresh_interval = refresh_interval
+
+    def mark_stale(self, targets: Optional[Iterable[Tuple[Optional[str], Optional[str]]]] = ()) -> None:
+        """执行DDL后调用，下一次查询时触发后台刷新
+
+        参数:
+            targets: ddl_targets 返回的 (schema, table) 列表，这些表在刷新时强制重新索引
+                （如 ALGORITHM=INSTANT 加列不会改变 CREATE_TIME）；None 表示全部表
+        """
+        with self._lock:
+            if targets is None or self._forced is None:
+                self._forced = None
+            else:
+                self._forced.update((schema.lower() if schema else None, table.lower() if table else None)
+                                    for schema, table in targets)
+            self._stale = True
+
+    def ensure_fresh(self) -> bool:
+        """需要时在后台线程中构建或刷新索引，不等待刷新完成
+
+        返回:
+            bool: 索引当前是否可用于查询
+        """
+        if not self.enabled:
+            return False
+        with self._lock:
+            due = not self._ready or self._stale or time.monotonic() - self._refreshed_at >= self.refresh_interval
+            if due and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self._refresh_in_background, name="search-index", daemon=True).start()
+            return self._ready
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            with self._lock:
+                self._stats["failures"] += 1
+            print(f"刷新表名搜索索引失败: {str(e)}", file=sys.stderr)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    @staticmethod
+    def _fetch(sql: str, params: Optional[List[Any]] = None) -> List[Tuple[Any, ...]]:
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+
+    def _load_columns(self, tables: List[TableKey], full: bool) -> Dict[TableKey, List[Tuple[str, str]]]:
+        columns: Dict[TableKey, List[Tuple[str, str]]] = defaultdict(list)
+        if full:
+            batches: Iterable[Tuple[str, List[Any]]] = [(_COLUMNS_SQL, None)]
+        else:
+            batches = []
+            for start in range(0, len(tables), COLUMN_BATCH_SIZE):
+                batch = tables[start:start + COLUMN_BATCH_SIZE]
+                placeholders = ", ".join(["(%s, %s)"] * len(batch))
+                batches.append((
+                    f"{_COLUMNS_SQL} AND (TABLE_SCHEMA, TABLE_NAME) IN ({placeholders})",
+                    [name for key in batch for name in key],
+                ))
+        for sql, params in batches:
+            for schema, table, column, comment in self._fetch(sql, params):
+                columns[(_text(schema), _text(table))].append((_text(column), _text(comment)))
+        return columns
+
+    def refresh(self) -> int:
+        """同步刷新索引：只重新索引新建、修改或删除的表
+
+        返回:
+            int: 重新索引或移除的表数量
+
+        异常:
+            Error: 查询 information_schema 失败时抛出
+        """
+        # 刷新期间执行的DDL会重新标记，留到下一次刷新
+        with self._lock:
+            forced, self._forced = self._forced, set()
+            self._stale = False
+        try:
+            current = {
+                (_text(schema), _text(table)): (created, updated, _text(comment))
+                for schema, table, comment, created, updated in self._fetch(_TABLES_SQL)
+            }
+            with self._lock:
+                previous = self._versions
+            changed = [key for key, version in current.items() if previous.get(key) != version or _forced(key, forced)]
+            removed = [key for key in previous if key not in current]
+            # 首次构建或大部分表有变化时一次读取全部列，比按表分批更快
+            columns = self._load_columns(changed, full=len(changed) > len(current) // 2) if changed else {}
+        except Exception:
+            # 失败时保留强制刷新的表，下一次查询时重试
+            self.mark_stale(forced)
+            raise
+
+        # 拼音首字母和二元组的计算耗时较长，在锁外基于当前索引的副本完成，最后只在锁内替换引用，
+        # 刷新期间的查询使用旧索引；副本中只复制受影响的倒排表，未变化的倒排表与旧索引共享
+        with self._refresh_lock:
+            with self._lock:
+                objects, postings, by_table = dict(self._objects), dict(self._postings), dict(self._by_table)
+            copied: Set[str] = set()
+            for key in removed + changed:
+                self._remove_table(key, objects, postings, by_table, copied)
+            for key in changed:
+                self._add_table(key, current[key][2], columns.get(key, ()), objects, postings, by_table, copied)
+            with self._lock:
+                self._objects, self._postings, self._by_table = objects, postings, by_table
+                self._versions = current
+                self._ready = True
+                self._refreshed_at = time.monotonic()
+                self._stats["refreshes"] += 1
+                self._stats["tables_indexed"] += len(changed)
+                self._stats["tables_removed"] += len(removed)
+        return len(changed) + len(removed)
+
+    @staticmethod
+    def _posting(postings: Dict[str, Set[int]], gram: str, copied: Set[str]) -> Set[int]:
+        """取出可修改的倒排表：与旧索引共享的倒排表先复制一份"""
+        if gram not in copied:
+            copied.add(gram)
+            postings[gram] = set(postings.get(gram, ()))
+        return postings[gram]
+
+    def _add(self, obj: IndexedObject, objects: Dict[int, IndexedObject], postings: Dict[str, Set[int]],
+             copied: Set[str]) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        objects[object_id] = obj
+        for text in (obj.name_text, obj.comment_text, obj.initials_text):
+            for gram in _grams(text):
+                self._posting(postings, gram, copied).add(object_id)
+        return object_id
+
+    def _add_table(self, key: TableKey, comment: str, columns: Iterable[Tuple[str, str]],
+                   objects: Dict[int, IndexedObject], postings: Dict[str, Set[int]],
+                   by_table: Dict[TableKey, List[int]], copied: Set[str]) -> None:
+        schema, table = key
+        ids = [self._add(_make_object(schema, table, None, comment, comment), objects, postings, copied)]
+        for column, column_comment in columns:
+            obj = _make_object(schema, table, column, column_comment, comment)
+            ids.append(self._add(obj, objects, postings, copied))
+        by_table[key] = ids
+
+    def _remove_table(self, key: TableKey, objects: Dict[int, IndexedObject], postings: Dict[str, Set[int]],
+                      by_table: Dict[TableKey, List[int]], copied: Set[str]) -> None:
+        for object_id in by_table.pop(key, ()):
+            obj = objects.pop(object_id)
+            for text in (obj.name_text, obj.comment_text, obj.initials_text):
+                for gram in _grams(text):
+                    if gram not in postings:
+                        continue
+                    posting = self._posting(postings, gram, copied)
+                    posting.discard(object_id)
+                    if not posting:
+                        del postings[gram]
+                        copied.discard(gram)
+
+    def search(self, text: str, schema: Optional[str] = None, limit: int = 50) -> List[TableMatch]:
+        """在名称、注释和拼音首字母中搜索，按表汇总并按相关度排序
+
+        参数:
+            text (str): 搜索文本，如 "用户"、"user" 或 "yhb"
+            schema (str, 可选): 只返回该库中的表
+            limit (int): 最多返回的表数量
+
+        返回:
+            list[TableMatch]: 按得分从高到低排列的表
+        """
+        query = _normalize(text)
+        if not query:
+            return []
+        grams = _grams(query)
+        with self._lock:
+            self._stats["searches"] += 1
+            if grams:
+                postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+                candidates = set(postings[0]).intersection(*postings[1:])
+            else:
+                candidates = self._objects.keys()
+            objects = [self._objects[object_id] for object_id in candidates]
+
+        schema_filter = schema.lower() if schema else None
+        tables: Dict[TableKey, List[Any]] = {}
+        for obj in objects:
+            if schema_filter is not None and obj.schema.lower() != schema_filter:
+                continue
+            score = _score(query, obj)
+            if not score:
+                continue
+            entry = tables.setdefault((obj.schema, obj.table), [0.0, obj.table_comment, []])
+            entry[0] = max(entry[0], score)
+            if obj.column is not None:
+                entry[2].append(f"{obj.column}({obj.comment})" if obj.comment else obj.column)
+
+        ranked = sorted(tables.items(), key=lambda item: (-item[1][0], item[0]))
+        return [
+            TableMatch(schema_name, table, comment, round(score, 3), tuple(sorted(columns)))
+            for (schema_name, table), (score, comment, columns) in ranked[:limit]
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """获取索引统计信息"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "ready": self._ready,
+                "tables": len(self._by_table),
+                "objects": len(self._objects),
+                "grams": len(self._postings),
+            })
+        return stats
+
+
+_search_index: Optional[SearchIndex] = None
+_search_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """获取全局表名搜索索引，首次调用时根据配置创建（不会立即构建）"""
+    global _search_index
+    if _search_index is None:
+        with _search_index_lock:
+            if _search_index is None:
+                _search_index = SearchIndex(**get_settings().search_index)
+    return _search_index
+
+
+def _on_config_reload(old: Settings, new: Settings) -> None:
+    if _search_index is not None and old.search_index != new.search_index:
+        _search_index.configure(**new.search_index)
+    # 连接配置变化后可能连到了另一台服务器，下一次查询时重新对比全部表
+    if _search_index is not None and old.connection != new.connection:
+        _search_index.mark_stale()
+
+
+add_reload_listener(_on_config_reload)
+
+get_metrics().register_collector(
+    "search_index", lambda: _search_index.stats() if _search_index is not None else None,
+    ("refreshes", "tables_indexed", "tables_removed", "failures", "searches"),
+)
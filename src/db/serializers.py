@@ -0,0 +1,266 @@
+import re
+from decimal import Decimal
+from json import dumps
+from json.encoder import encode_basestring
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type
+
+from mysql.connector.constants import FieldFlag, FieldType
+
+# 整行拼接后若不含这些字符且逗号数量正确，则所有字段都无需加引号
+_needs_quote = re.compile(r'[",\r\n]').search
+_line_needs_quote = re.compile(r'["\r\n]').search
+
+# 按列类型划分，值的Python类型由 mysql.connector 的转换规则决定
+_INTEGER_TYPES = frozenset([
+    FieldType.TINY, FieldType.SHORT, FieldType.LONG, FieldType.LONGLONG,
+    FieldType.INT24, FieldType.YEAR, FieldType.BIT,
+])
+_DECIMAL_TYPES = frozenset([FieldType.DECIMAL, FieldType.NEWDECIMAL])
+_FLOAT_TYPES = frozenset([FieldType.FLOAT, FieldType.DOUBLE])
+_DATETIME_TYPES = frozenset([FieldType.DATETIME, FieldType.TIMESTAMP])
+_DATE_TYPES = frozenset([FieldType.DATE, FieldType.NEWDATE])
+# 带 BINARY 标志时返回 bytes 的字符串/BLOB类型
+_STRING_TYPES = frozenset([
+    FieldType.TINY_BLOB, FieldType.MEDIUM_BLOB, FieldType.LONG_BLOB, FieldType.BLOB,
+    FieldType.VAR_STRING, FieldType.STRING, FieldType.VARCHAR,
+])
+# 总是需要转换后才能输出为文本的类型
+_CONVERT_TYPES = frozenset([FieldType.GEOMETRY, FieldType.SET, FieldType.VECTOR])
+
+
+def text_size(text: str) -> int:
+    """文本按UTF-8编码后的字节数，纯ASCII文本直接取长度"""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _bytes_text(value: bytes) -> str:
+    """二进制值优先按UTF-8解码，无法解码时输出十六进制"""
+    try:
+        return value.decode("utf-8")
+    except UnicodeDecodeError:
+        return "0x" + value.hex()
+
+
+def to_text(value: Any) -> str:
+    """将非 None 值转换为文本，bytes 与 SET 类型特殊处理"""
+    if type(value) is str:
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return _bytes_text(value)
+    if isinstance(value, (set, frozenset)):
+        # SET 类型列返回 Python set，按字典序输出保证结果稳定
+        return ",".join(sorted(value))
+    return str(value)
+
+
+def _needs_convert(description: Sequence[Any]) -> bool:
+    """该列的值是否可能是 bytes/set 等 str() 无法正确输出的类型"""
+    if len(description) < 2:
+        return True
+    type_code = description[1]
+    if type_code in _STRING_TYPES:
+        flags = description[7] if len(description) > 7 else None
+        return flags is None or bool(flags & FieldFlag.BINARY)
+    return type_code in _CONVERT_TYPES
+
+
+def _float_json(value: float) -> str:
+    # JSON 不支持 NaN/Infinity
+    return repr(value) if value - value == 0 else "null"
+
+
+def _datetime_json(value: Any) -> str:
+    return '"' + str(value) + '"'
+
+
+def json_value(value: Any) -> str:
+    """将任意单个值编码为JSON片段，用于无法根据列类型确定编码方式的场景"""
+    kind = type(value)
+    if kind is str:
+        return encode_basestring(value)
+    if kind is int or kind is Decimal:
+        return str(value)
+    if kind is float:
+        return _float_json(value)
+    if value is None:
+        return "null"
+    if kind is bool:
+        return "true" if value else "false"
+    return encode_basestring(to_text(value))
+
+
+def _json_encoder(description: Sequence[Any]) -> Callable[[Any], str]:
+    """根据列类型选择JSON编码函数，编码函数不处理 None"""
+    type_code = description[1] if len(description) > 1 else None
+    if type_code in _INTEGER_TYPES or type_code in _DECIMAL_TYPES:
+        return str
+    if type_code in _FLOAT_TYPES:
+        return _float_json
+    if type_code in _DATETIME_TYPES or type_code in _DATE_TYPES or type_code == FieldType.TIME:
+        return _datetime_json
+    return json_value
+
+
+class ResultWriter:
+    """结果集序列化器基类
+
+    每个结果集创建一个实例，按批写入行并返回该批占用的字节数，
+    由调用方据此执行行数/字节数预算，最后通过 getvalue 取得完整文本。
+    编码方式根据 cursor.description 中的列类型预先确定，避免逐个值判断类型。
+    """
+    name: str = ""
+
+    def __init__(self, description: Sequence[Any]):
+        """
+        参数:
+            description: cursor.description，也可以只传列名列表
+        """
+        self.description = [(column,) if isinstance(column, str) else column for column in description]
+        self.columns = [column[0] for column in self.description]
+        self.header_size = 0
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> int:
+        raise NotImplementedError
+
+    def getvalue(self, trailer: Optional[str] = None) -> str:
+        """返回序列化后的文本
+
+        参数:
+            trailer (str, 可选): 结果被截断时的说明，由各格式以合适的方式附加
+        """
+        raise NotImplementedError
+
+
+def csv_field(text: str) -> str:
+    """按 RFC-4180 规则为字段加引号"""
+    if _needs_quote(text):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+class CsvWriter(ResultWriter):
+    """RFC-4180 CSV，首行为列名，NULL 输出为 NULL"""
+    name = "csv"
+
+    def __init__(self, description: Sequence[Any]):
+        super().__init__(description)
+        header = ",".join([csv_field(to_text(column)) for column in self.columns])
+        self._chunks = [header]
+        self._separators = len(self.columns) - 1
+        # 只有可能返回 bytes/set 的列需要额外转换，其余列直接使用 str()
+        self._convert = [index for index, column in enumerate(self.description) if _needs_convert(column)]
+        self.header_size = text_size(header) + 1
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> int:
+        convert = self._convert
+        separators = self._separators
+        lines = []
+        append = lines.append
+        for row in rows:
+            if convert:
+                row = list(row)
+                for index in convert:
+                    value = row[index]
+                    if value is not None and type(value) is not str:
+                        row[index] = to_text(value)
+            cells = ["NULL" if value is None else str(value) for value in row]
+            line = ",".join(cells)
+            # 快速路径：整行没有引号、换行，且逗号全部是分隔符时无需逐个字段处理
+            if line.count(",") != separators or _line_needs_quote(line):
+                line = ",".join([csv_field(cell) for cell in cells])
+            append(line)
+        chunk = "\n".join(lines)
+        self._chunks.append(chunk)
+        return text_size(chunk) + 1
+
+    def getvalue(self, trailer: Optional[str] = None) -> str:
+        if trailer:
+            self._chunks.append(trailer)
+        return "\n".join(self._chunks)
+
+
+class NdjsonWriter(ResultWriter):
+    """JSON Lines，每行一个以列名为键的JSON对象"""
+    name = "ndjson"
+
+    def __init__(self, description: Sequence[Any]):
+        super().__init__(description)
+        # 键在每一行中都相同，预先编码
+        self._keys = [encode_basestring(to_text(column)) + ":" for column in self.columns]
+        self._encoders = [_json_encoder(column) for column in self.description]
+        self._chunks: List[str] = []
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> int:
+        keys = self._keys
+        encoders = self._encoders
+        lines = [
+            "{" + ",".join([
+                key + ("null" if value is None else encode(value))
+                for key, encode, value in zip(keys, encoders, row)
+            ]) + "}"
+            for row in rows
+        ]
+        chunk = "\n".join(lines)
+        self._chunks.append(chunk)
+        return text_size(chunk) + 1
+
+    def getvalue(self, trailer: Optional[str] = None) -> str:
+        if trailer:
+            self._chunks.append(dumps({"truncated": trailer}, ensure_ascii=False))
+        return "\n".join(self._chunks)
+
+
+class ColumnarWriter(ResultWriter):
+    """紧凑的列式JSON：列名只出现一次，每列的值组成一个数组
+
+    输出形如 {"columns": [...], "data": [[列1的值...], [列2的值...]], "row_count": n}
+    """
+    name = "columnar"
+
+    def __init__(self, description: Sequence[Any]):
+        super().__init__(description)
+        self._encoders = [_json_encoder(column) for column in self.description]
+        self._data: List[List[str]] = [[] for _ in self.columns]
+        self._row_count = 0
+        self._header = dumps([to_text(column) for column in self.columns], ensure_ascii=False, separators=(",", ":"))
+        self.header_size = text_size(self._header) + 40
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> int:
+        size = 0
+        # 按列编码，每列只确定一次编码函数
+        for values, encode, column in zip(self._data, self._encoders, zip(*rows)):
+            fragments = ["null" if value is None else encode(value) for value in column]
+            values.extend(fragments)
+            size += text_size(",".join(fragments)) + 1
+        self._row_count += len(rows)
+        return size
+
+    def getvalue(self, trailer: Optional[str] = None) -> str:
+        data = ",".join(["[" + ",".join(values) + "]" for values in self._data])
+        text = (
+            '{"columns":' + self._header
+            + ',"data":[' + data + ']'
+            + ',"row_count":' + str(self._row_count)
+        )
+        if trailer:
+            text += ',"truncated":' + encode_basestring(trailer)
+        return text + "}"
+
+
+SERIALIZERS: Dict[str, Type[ResultWriter]] = {
+    CsvWriter.name: CsvWriter,
+    NdjsonWriter.name: NdjsonWriter,
+    ColumnarWriter.name: ColumnarWriter,
+}
+
+
+def get_serializer(name: str) -> Type[ResultWriter]:
+    """根据格式名称获取序列化器
+
+    异常:
+        ValueError: 当格式名称不受支持时抛出
+    """
+    try:
+        return SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(f"不支持的输出格式: {name}，可选值: {', '.join(SERIALIZERS)}") from None
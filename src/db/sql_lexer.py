@@ -0,0 +1,143 @@
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Pattern, Tuple
+
+from utils import get_metrics
+
+# 每条语句提取的前导关键字数量，足以区分 CREATE TEMPORARY TABLE、LOAD DATA INFILE 等多单词操作
+KEYWORD_COUNT = 4
+
+# 超过该长度的SQL（如大批量INSERT）不进入缓存，避免缓存占用过多内存
+CACHE_MAX_QUERY_LENGTH = 64 * 1024
+CACHE_SIZE = 1024
+
+# mysql 客户端的 DELIMITER 命令，只在语句开头识别
+_DELIMITER_COMMAND = re.compile(r"[ \t\r\n]*DELIMITER[ \t]+(\S+)[^\n]*(?:\n|\Z)", re.IGNORECASE)
+_LEADING_WORD = re.compile(r"\s*([A-Za-z_][\w$]*)")
+
+
+class Statement(NamedTuple):
+    """拆分出的单条SQL语句"""
+    # 原始语句文本（不含分隔符，去除首尾空白），用于发送给服务器执行
+    text: str
+    # 去掉注释后的语句，可执行注释 /*! ... */ 的内容保留，用于权限判断和DDL解析
+    code: str
+    # 大写的前导关键字，如 ("CREATE", "TEMPORARY", "TABLE")
+    keywords: Tuple[str, ...]
+
+
+@lru_cache(maxsize=None)
+def _token_pattern(delimiter: str) -> Pattern:
+    """识别需要特殊处理的片段：字符串、标识符、注释、可执行注释及语句分隔符"""
+    return re.compile(
+        r"(?P<quoted>'(?:[^'\\]|\\[\s\S]|'')*'?"
+        r'|"(?:[^"\\]|\\[\s\S]|"")*"?'
+        r"|`(?:[^`]|``)*`?)"
+        r"|(?P<executable>/\*![0-9]*)"
+        r"|(?P<comment>/\*[\s\S]*?(?:\*/|\Z)|--(?=[ \t\r\n]|\Z)[^\n]*|#[^\n]*)"
+        r"|(?P<executable_end>\*/)"
+        rf"|(?P<delimiter>{re.escape(delimiter)})"
+    )
+
+
+def _leading_keywords(code: str) -> Tuple[str, ...]:
+    words: List[str] = []
+    pos = 0
+    while len(words) < KEYWORD_COUNT:
+        match = _LEADING_WORD.match(code, pos)
+        if match is None:
+            break
+        words.append(match.group(1).upper())
+        pos = match.end()
+    return tuple(words)
+
+
+def _statement(text: str, code: List[str]) -> Optional[Statement]:
+    code_text = "".join(code).strip()
+    # 只有空白或注释的片段不是语句
+    if not code_text:
+        return None
+    return Statement(text.strip(), code_text, _leading_keywords(code_text))
+
+
+def _lex(query: str) -> Tuple[Statement, ...]:
+    statements: List[Statement] = []
+    delimiter = ";"
+    pattern = _token_pattern(delimiter)
+    code: List[str] = []
+    in_executable = False
+    start = pos = 0
+
+    while True:
+        if pos == start:
+            match = _DELIMITER_COMMAND.match(query, pos)
+            if match:
+                delimiter = match.group(1)
+                pattern = _token_pattern(delimiter)
+                start = pos = match.end()
+                continue
+
+        match = pattern.search(query, pos)
+        if match is None:
+            code.append(query[pos:])
+            break
+        code.append(query[pos:match.start()])
+        kind = match.lastgroup
+
+        if kind == "delimiter":
+            statement = _statement(query[start:match.start()], code)
+            if statement:
+                statements.append(statement)
+            code = []
+            in_executable = False
+            start = pos = match.end()
+            continue
+
+        if kind == "quoted":
+            code.append(match.group())
+        elif kind == "comment":
+            code.append(" ")
+        elif kind == "executable":
+            # /*!50001 ... */ 中的内容会被服务器执行，按普通SQL处理
+            in_executable = True
+            code.append(" ")
+        elif in_executable:
+            in_executable = False
+            code.append(" ")
+        else:
+            code.append(match.group())
+        pos = match.end()
+
+    statement = _statement(query[start:], code)
+    if statement:
+        statements.append(statement)
+    return tuple(statements)
+
+
+_cached_lex = lru_cache(maxsize=CACHE_SIZE)(_lex)
+
+
+def split_statements(query: str) -> Tuple[Statement, ...]:
+    """将多条SQL拆分为单条语句，并提取每条语句的前导关键字
+
+    一次扫描完成，正确处理字符串与反引号标识符中的分隔符、转义字符、
+    -- / # / 块注释、MySQL可执行注释，以及 mysql 客户端风格的 DELIMITER 命令。
+    相同的SQL文本会命中LRU缓存，不再重复扫描。
+
+    参数:
+        query (str): 一条或多条SQL语句
+
+    返回:
+        tuple[Statement, ...]: 按出现顺序排列的语句，不包含只有注释或空白的片段
+    """
+    if len(query) > CACHE_MAX_QUERY_LENGTH:
+        return _lex(query)
+    return _cached_lex(query)
+
+
+def _cache_stats() -> dict:
+    info = _cached_lex.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "entries": info.currsize, "capacity": info.maxsize}
+
+
+get_metrics().register_collector("sql_lexer_cache", _cache_stats, ("hits", "misses"))
@@ -1,15 +1,12 @@
-from .execute_sql import ExecuteSQL
-from .get_chinese_initials import GetChineseInitials
-from .get_table_desc import GetTableDesc
-from .get_table_index import GetTableIndex
-from .get_table_lock import GetTableLock
-from .get_table_name import GetTableName
-from .get_db_health_running import GetDBHealthRunning
-from .get_db_health_index_usage import GetDBHealthIndexUsage
-from .get_databases import GetDatabases
+import importlib
+from typing import Any
+
+# 导入描述模块时登记全部工具，实现模块在第一次调用时才导入
+from .descriptors import TOOL_DESCRIPTORS
 
 __all__ = [
     "ExecuteSQL",
+    "BulkInsert",
     "GetChineseInitials",
     "GetTableDesc",
     "GetTableIndex",
@@ -18,4 +15,14 @@ __all__ = [
     "GetDBHealthRunning",
     "GetDBHealthIndexUsage",
     "GetDatabases"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    """按需导入工具类，导入 handles 时不加载各工具的实现模块"""
+    for descriptor in TOOL_DESCRIPTORS:
+        if descriptor.class_name == name:
+            value = getattr(importlib.import_module(descriptor.module), name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,56 @@
-from typing import Dict, Any, Sequence, Type, ClassVar
+import asyncio
+import importlib
+import time
+from typing import Dict, Any, Awaitable, List, NamedTuple, Sequence, Tuple, Type, ClassVar
 
 from mcp.types import TextContent, Tool
 
+from utils import get_metrics, tracing
+
+# 执行失败时返回文本的前缀，调用方据此判断结果能否缓存、调用是否出错
+ERROR_PREFIXES = ("执行查询时出错", "执行语句", "权限不足", "查询成本超限")
+
+
+def is_error_text(text: str) -> bool:
+    """判断工具返回的文本是否为执行失败的信息"""
+    return text.startswith(ERROR_PREFIXES)
+
+
+class ToolDescriptor(NamedTuple):
+    """工具的轻量描述
+
+    列出工具只需要名称、说明和参数结构；实现所在的模块会导入数据库驱动、连接池等，
+    在第一次调用该工具时才导入
+    """
+    name: str
+    # 实现所在的模块与类名，如 "handles.execute_sql"、"ExecuteSQL"
+    module: str
+    class_name: str
+    description: str
+    input_schema: Dict[str, Any]
+
+    def to_tool(self) -> Tool:
+        return Tool(name=self.name, description=self.description, inputSchema=self.input_schema)
+
 
 class ToolRegistry:
     """工具注册表，用于管理所有工具实例"""
     _tools: ClassVar[Dict[str, 'BaseHandler']] = {}
+    _descriptors: ClassVar[Dict[str, ToolDescriptor]] = {}
+
+    @classmethod
+    def declare(cls, descriptor: ToolDescriptor) -> None:
+        """登记工具描述，不导入实现模块
+
+        Args:
+            descriptor: 工具描述
+        """
+        cls._descriptors[descriptor.name] = descriptor
+
+    @classmethod
+    def descriptors(cls) -> List[ToolDescriptor]:
+        """获取所有已登记的工具描述"""
+        return list(cls._descriptors.values())
 
     @classmethod
     def register(cls, tool_class: Type['BaseHandler']) -> Type['BaseHandler']:
@@ -34,18 +79,56 @@ class ToolRegistry:
         Raises:
             ValueError: 当工具不存在时抛出
         """
+        if name not in cls._tools and name in cls._descriptors:
+            # 第一次调用时才导入实现模块，模块中的工具类定义时会自动注册
+            importlib.import_module(cls._descriptors[name].module)
         if name not in cls._tools:
             raise ValueError(f"未知的工具: {name}")
         return cls._tools[name]
 
+    @classmethod
+    async def call_tool(cls, name: str, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+        """调用工具，并记录调用次数、出错次数、耗时和返回的字节数
+
+        设置 MYSQL_SLOW_CALL_THRESHOLD 或对该工具开启采样分析时，同时跟踪各阶段耗时，见 utils.tracing
+
+        Args:
+            name: 工具名称
+            arguments: 工具参数
+
+        Returns:
+            工具执行结果
+
+        Raises:
+            ValueError: 当工具不存在时抛出
+        """
+        tool = cls.get_tool(name)
+        trace = None
+        started = time.perf_counter()
+        error, size = True, 0
+        try:
+            trace = tracing.begin(name)
+            result = await tool.run_tool(arguments)
+            texts = [content.text for content in result if isinstance(content, TextContent)]
+            error = bool(texts) and is_error_text(texts[0])
+            size = sum(len(text.encode("utf-8")) for text in texts)
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            get_metrics().observe_call(name, elapsed, error, size)
+            if trace is not None:
+                tracing.end(trace, elapsed, error)
+
     @classmethod
     def get_all_tools(cls) -> list[Tool]:
         """获取所有工具的描述
         
         Returns:
-            所有工具的描述列表
+            所有工具的描述列表，已登记描述的工具不会因此导入实现模块
         """
-        return [tool.get_tool_description() for tool in cls._tools.values()]
+        tools = [descriptor.to_tool() for descriptor in cls._descriptors.values()]
+        tools.extend(tool.get_tool_description() for name, tool in cls._tools.items() if name not in cls._descriptors)
+        return tools
 
 
 class BaseHandler:
@@ -60,8 +143,40 @@ class BaseHandler:
             ToolRegistry.register(cls)
 
     def get_tool_description(self) -> Tool:
-        raise NotImplementedError
+        """默认使用登记的工具描述，没有登记描述的工具需要重写该方法"""
+        descriptor = ToolRegistry._descriptors.get(self.name)
+        if descriptor is None:
+            raise NotImplementedError
+        return descriptor.to_tool()
 
     async def run_tool(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
         raise NotImplementedError
 
+
+async def gather_probes(
+    probes: Sequence[Tuple[str, Awaitable[Sequence[TextContent]]]],
+    timeout: float = 0,
+) -> List[TextContent]:
+    """并发执行多个相互独立的子查询，按传入顺序合并结果
+
+    单个子查询超时或出错时以说明文本代替其结果，不影响其他子查询返回
+
+    Args:
+        probes: (子查询说明, 返回TextContent列表的协程) 列表
+        timeout: 单个子查询的超时时间（秒），0 表示不限制
+
+    Returns:
+        按 probes 顺序合并后的TextContent列表
+    """
+    async def run(label: str, probe: Awaitable[Sequence[TextContent]]) -> Sequence[TextContent]:
+        try:
+            if timeout > 0:
+                return await asyncio.wait_for(probe, timeout)
+            return await probe
+        except asyncio.TimeoutError:
+            return [TextContent(type="text", text=f"执行查询时出错: {label}超过 {timeout:g} 秒未返回，已跳过")]
+        except Exception as e:
+            return [TextContent(type="text", text=f"执行查询时出错: {label}失败: {str(e)}")]
+
+    results = await asyncio.gather(*(run(label, probe) for label, probe in probes))
+    return [content for result in results for content in result]
@@ -0,0 +1,168 @@
+import re
+import time
+from typing import Dict, Any, Iterator, List, Sequence, Tuple
+
+from mcp.types import TextContent
+from mysql.connector import Error
+
+from config import get_settings
+from db import get_pool, run_blocking, get_result_cache
+from db.sql_lexer import Statement, split_statements
+from .base import BaseHandler
+from .execute_sql import normalize_params
+
+from handles import (
+    ExecuteSQL
+)
+
+execute_sql = ExecuteSQL()
+
+# 每个分块的SQL最多使用 max_allowed_packet 的比例，为转义字符和协议开销留出余量
+PACKET_USAGE = 0.75
+
+BULK_OPERATIONS = ("INSERT", "REPLACE")
+
+# 与 mysql.connector 改写多行 INSERT 时使用的规则一致，取出每行重复的 VALUES (...) 部分
+_VALUES_CLAUSE = re.compile(r"\bVALUES\s*(\(.+\))", re.IGNORECASE | re.DOTALL)
+
+
+def _value_size(value: Any) -> int:
+    """估算单个参数值在SQL文本中占用的字节数"""
+    if value is None:
+        return 4
+    if isinstance(value, str):
+        return len(value.encode("utf-8")) + 2
+    return len(str(value))
+
+
+def iter_chunks(rows: Sequence[Tuple[Any, ...]], chunk_size: int, max_bytes: int,
+                row_overhead: int) -> Iterator[Sequence[Tuple[Any, ...]]]:
+    """按行数和估算的SQL字节数将参数行切分为分块
+
+    参数:
+        rows (list[tuple]): 全部参数行
+        chunk_size (int): 每个分块的最大行数
+        max_bytes (int): 每个分块估算字节数的上限，单行超过上限时单独成块
+        row_overhead (int): 每行 VALUES (...) 模板本身占用的字节数
+
+    返回:
+        Iterator: 依次产生的分块
+    """
+    start = size = 0
+    for index, values in enumerate(rows):
+        row_size = row_overhead + sum(_value_size(value) for value in values)
+        if index > start and (index - start >= chunk_size or size + row_size > max_bytes):
+            yield rows[start:index]
+            start, size = index, 0
+        size += row_size
+    if start < len(rows):
+        yield rows[start:]
+
+
+class BulkInsert(BaseHandler):
+    name = "bulk_insert"
+
+    def parse_template(self, query: str) -> Statement:
+        """校验写入模板并返回拆分后的语句
+
+        异常:
+            ValueError: 当 query 不是带 VALUES 子句的单条 INSERT/REPLACE 语句时抛出
+        """
+        statements = split_statements(query)
+        if len(statements) != 1:
+            raise ValueError("bulk_insert 的 query 只能包含一条语句")
+        statement = statements[0]
+        if statement.keywords[0] not in BULK_OPERATIONS or not _VALUES_CLAUSE.search(statement.code):
+            raise ValueError("bulk_insert 的 query 必须是带 VALUES 子句的 INSERT 或 REPLACE 语句")
+        return statement
+
+    def bulk_insert(self, statement: Statement, rows: List[Tuple[Any, ...]], chunk_size: int) -> str:
+        """同步分块写入，会阻塞当前线程，应通过 run_blocking 在线程池中调用
+
+        每个分块通过 executemany 执行：INSERT 被 mysql.connector 改写为一条多行
+        INSERT，REPLACE 在同一事务中逐行执行；每个分块提交一次。某个分块出错时
+        回滚该分块并停止，之前已提交的分块保留
+
+        参数:
+            statement (Statement): parse_template 返回的写入模板
+            rows (list[tuple]): 全部参数行
+            chunk_size (int): 每个分块的最大行数
+
+        返回:
+            str: 写入行数、分块数、耗时和每秒写入行数，出错时为错误信息及已提交的行数
+
+        异常:
+            Error: 当数据库连接失败时抛出异常
+        """
+        values_clause = _VALUES_CLAUSE.search(statement.text)
+        row_overhead = len(values_clause.group(1) if values_clause else statement.text) + 2
+        written = affected = chunks = 0
+        error = None
+
+        start = time.perf_counter()
+        with get_pool().connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT @@SESSION.max_allowed_packet")
+                max_allowed_packet = int(cursor.fetchone()[0])
+                max_bytes = int(max_allowed_packet * PACKET_USAGE) - len(statement.text.encode("utf-8"))
+
+                for chunk in iter_chunks(rows, chunk_size, max_bytes, row_overhead):
+                    try:
+                        cursor.executemany(statement.text, chunk)
+                        conn.commit()
+                    except Error as e:
+                        conn.rollback()
+                        error = f"执行语句 '{statement.text}' 出错: {str(e)}。出错的分块（{len(chunk)} 行）已回滚"
+                        break
+                    written += len(chunk)
+                    affected += max(cursor.rowcount, 0)
+                    chunks += 1
+        elapsed = time.perf_counter() - start
+
+        if written:
+            get_result_cache().invalidate_statement(statement.code)
+        summary = f"写入行数: {written}，影响行数: {affected}，分块数: {chunks}，耗时: {elapsed:.3f} 秒"
+        if error is not None:
+            return f"{error}，之前已提交 {summary}"
+        rate = written / elapsed if elapsed > 0 else 0
+        return f"批量写入完成。{summary}，速率: {rate:.0f} 行/秒"
+
+    async def run_tool(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+        """批量写入数据
+
+        参数:
+            query (str): 带 VALUES 子句的单条 INSERT/REPLACE 模板
+            rows (list[list]): 每行一组占位符参数
+            chunk_size (int, 可选): 每个分块的最大行数
+
+        返回:
+            list[TextContent]: 写入结果与速率，权限不足或出错时为说明文本
+        """
+        try:
+            if "query" not in arguments or "rows" not in arguments:
+                raise ValueError("缺少 query 或 rows 参数")
+
+            settings = get_settings()
+            statement = self.parse_template(arguments["query"])
+            if not execute_sql.check_sql_permission(statement, settings.permissions):
+                return [TextContent(type="text", text=f"权限不足: 当前角色 '{settings.role}' 无权执行该SQL操作")]
+
+            rows = arguments["rows"]
+            if not isinstance(rows, list) or not rows or not all(isinstance(row, list) for row in rows):
+                raise ValueError("rows 必须是由数组组成的非空数组")
+            rows = normalize_params(rows)
+            if any(len(row) != len(rows[0]) for row in rows):
+                raise ValueError("rows 中每一行的值数量必须相同")
+
+            chunk_size = arguments.get("chunk_size") or settings.bulk_insert["chunk_size"]
+            if isinstance(chunk_size, bool) or not isinstance(chunk_size, int) or chunk_size < 1:
+                raise ValueError("chunk_size 必须是正整数")
+
+            text = await run_blocking(self.bulk_insert, statement, rows, chunk_size)
+            return [TextContent(type="text", text=text)]
+
+        except Error as e:
+            return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
+        except ValueError as e:
+            # 模板、rows 或 chunk_size 不合法
+            return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
@@ -0,0 +1,241 @@
+"""各工具的名称、说明与参数结构
+
+列出工具时只读取这里的描述，不导入实现模块；实现模块在第一次调用对应工具时才导入。
+本模块只能依赖 handles.base，不能导入数据库驱动、连接池等实现相关的模块。
+"""
+from .base import ToolDescriptor, ToolRegistry
+
+# 与 db.serializers.SERIALIZERS 的键保持一致，第一个为默认格式
+OUTPUT_FORMATS = ["csv", "ndjson", "columnar"]
+
+_TABLE_NAMES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "table_names": {
+            "type": "string",
+            "description": "要查询的表名，多个表名用逗号分隔，可以使用 database.table_name 格式指定数据库"
+        }
+    },
+    "required": ["table_names"]
+}
+
+TOOL_DESCRIPTORS = (
+    ToolDescriptor(
+        name="execute_sql",
+        module="handles.execute_sql",
+        class_name="ExecuteSQL",
+        description="在MySQL数据库上执行SQL，可以访问所有数据库 (multiple SQL execution, separated by ';')",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "要执行的SQL语句，可以包含数据库名称如：USE database_name; 或 SELECT * FROM database_name.table_name;"
+                },
+                "params": {
+                    "type": "array",
+                    "description": "可选：query 中 %s 或 ? 占位符对应的参数，使用服务器端预处理语句执行；"
+                                   "传入由数组组成的数组时按每组参数各执行一次（批量执行，只提交一次）。"
+                                   "使用 params 时 query 只能包含一条语句"
+                },
+                "transaction": {
+                    "type": "boolean",
+                    "description": "可选：为true时全部语句在同一事务中执行并只提交一次，默认遇到错误回滚整个事务；"
+                                   "不能包含DDL等会隐式提交的语句"
+                },
+                "stop_on_error": {
+                    "type": "boolean",
+                    "description": "可选：遇到第一个出错的语句即停止执行，默认与 transaction 相同；"
+                                   "transaction 为true且本项为false时，出错的语句回滚到各自的保存点，其余语句照常提交"
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "可选：本次调用的最长执行时间（秒），不能超过当前角色的上限；"
+                                   "SELECT 由服务器按 MAX_EXECUTION_TIME 终止，其他语句超时后被 KILL QUERY 终止"
+                },
+                "output_format": {
+                    "type": "string",
+                    "enum": OUTPUT_FORMATS,
+                    "description": "可选：结果集输出格式。csv(默认，RFC-4180)、ndjson(每行一个JSON对象)、columnar(列名只出现一次的列式JSON，体积最小)"
+                }
+            },
+            "required": ["query"]
+        },
+    ),
+    ToolDescriptor(
+        name="bulk_insert",
+        module="handles.bulk_insert",
+        class_name="BulkInsert",
+        description=(
+            "使用一条INSERT/REPLACE模板批量写入多行数据，按分块合并为多行INSERT并逐块提交 "
+            "(bulk load rows through one INSERT/REPLACE template)"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "带 VALUES 子句的单条 INSERT 或 REPLACE 语句，使用 %s 占位符，"
+                                   "如：INSERT INTO db.t (a, b) VALUES (%s, %s)"
+                },
+                "rows": {
+                    "type": "array",
+                    "items": {"type": "array"},
+                    "description": "要写入的数据，每个元素是一行，按顺序对应 query 中的占位符"
+                },
+                "chunk_size": {
+                    "type": "integer",
+                    "description": "可选：每个分块的最大行数，默认为 MYSQL_BULK_CHUNK_SIZE；"
+                                   "分块的SQL大小同时受服务器 max_allowed_packet 限制"
+                }
+            },
+            "required": ["query", "rows"]
+        },
+    ),
+    ToolDescriptor(
+        name="get_chinese_initials",
+        module="handles.get_chinese_initials",
+        class_name="GetChineseInitials",
+        description="创建表结构时，将中文字段名转换为拼音首字母字段",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "要获取拼音首字母的汉字文本，以“，”分隔"
+                },
+                "names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "可选：批量转换的字段名数组，传入后忽略 text，返回字段名到首字母的JSON对象"
+                },
+                "dedupe": {
+                    "type": "boolean",
+                    "description": (
+                        "可选：结果重复时依次追加 _2、_3 等后缀使结果互不相同，默认 false；"
+                        "text 模式下相同的词也追加后缀，names 模式下相同的字段名共用一个结果"
+                    )
+                }
+            }
+        },
+    ),
+    ToolDescriptor(
+        name="get_table_desc",
+        module="handles.get_table_desc",
+        class_name="GetTableDesc",
+        description="根据表名搜索所有数据库中对应的表结构，支持多表查询",
+        input_schema=_TABLE_NAMES_SCHEMA,
+    ),
+    ToolDescriptor(
+        name="get_table_index",
+        module="handles.get_table_index",
+        class_name="GetTableIndex",
+        description="根据表名搜索所有数据库中对应的表索引，支持多表查询",
+        input_schema=_TABLE_NAMES_SCHEMA,
+    ),
+    ToolDescriptor(
+        name="get_table_lock",
+        module="handles.get_table_lock",
+        class_name="GetTableLock",
+        description=(
+            "获取当前mysql服务器行级锁、表级锁情况(Check if there are row-level locks or table-level locks in the current MySQL server  )"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {}
+        },
+    ),
+    ToolDescriptor(
+        name="get_table_name",
+        module="handles.get_table_name",
+        class_name="GetTableName",
+        description=(
+            "根据表注释、表描述搜索所有数据库中对应的表名，同时匹配表名、列名、列注释及注释的拼音首字母（如 yhb 可找到 用户表）"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "要搜索的表中文注释关键词"
+                },
+                "database": {
+                    "type": "string",
+                    "description": "可选：指定要搜索的数据库名称，如果不指定则搜索所有数据库"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "可选：最多返回的表数量，默认为50"
+                }
+            },
+            "required": ["text"]
+        },
+    ),
+    ToolDescriptor(
+        name="get_db_health_running",
+        module="handles.get_db_health_running",
+        class_name="GetDBHealthRunning",
+        description=(
+            "获取当前mysql的健康状态，开启后台采样时返回QPS、行读取、缓冲池未命中、锁等待等每秒速率及趋势"
+            "(Analyze MySQL health status )"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "minutes": {
+                    "type": "number",
+                    "description": "可选：速率与趋势的统计窗口（分钟），默认为5，需开启 MYSQL_HEALTH_SAMPLE_INTERVAL"
+                },
+                "snapshot": {
+                    "type": "boolean",
+                    "description": "可选：是否同时查询连接、锁、事务和InnoDB状态的当前快照，默认只在没有采样数据时查询"
+                },
+                "sections": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "可选：InnoDB状态中需要返回的段落，解析为JSON，死锁段落拆分为被回滚的事务(victim)和其他事务(holders)。"
+                                   "默认为 semaphores、latest_detected_deadlock、transactions、buffer_pool_and_memory、"
+                                   "row_operations、log；另可选 background_thread、latest_foreign_key_error、file_i_o、"
+                                   "insert_buffer_and_adaptive_hash_index、individual_buffer_pool_info（返回原文）"
+                }
+            }
+        },
+    ),
+    ToolDescriptor(
+        name="get_db_health_index_usage",
+        module="handles.get_db_health_index_usage",
+        class_name="GetDBHealthIndexUsage",
+        description=(
+            "获取mysql库的索引使用情况,包含冗余索引情况、性能较差的索引情况、未使用索引且查询时间大于30秒top5情况"
+            + "(Get the index usage of mysql databases, including redundant index situations, "
+            + "poorly performing index situations, and the top 5 unused index situations with query times greater than 30 seconds)"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "database": {
+                    "type": "string",
+                    "description": "可选：指定要分析的数据库名称，如果不指定则分析所有数据库（排除系统数据库）"
+                }
+            }
+        },
+    ),
+    ToolDescriptor(
+        name="get_databases",
+        module="handles.get_databases",
+        class_name="GetDatabases",
+        description="获取MySQL服务器上所有可用的数据库列表（排除系统数据库）",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "include_system": {
+                    "type": "boolean",
+                    "description": "是否包含系统数据库（information_schema, performance_schema, mysql, sys），默认为false"
+                }
+            }
+        },
+    ),
+)
+
+for _descriptor in TOOL_DESCRIPTORS:
+    ToolRegistry.declare(_descriptor)
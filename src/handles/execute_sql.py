@@ -1,202 +1,642 @@
-from typing import Dict, Any, Sequence
+import asyncio
+import time
+from contextlib import ExitStack
+from typing import Dict, Any, Collection, List, Optional, Sequence, Tuple, Type, Union
 
-from mcp import Tool
 from mcp.types import TextContent
-from mysql.connector import connect, Error
+from mysql.connector import Error
 
-from config import get_db_config_without_database, get_role_permissions
-from .base import BaseHandler
+from config import RolePermissions, classify_operation, get_settings
+from db import (
+    QueryDeadline, ResultCache, get_pool, run_blocking, get_metadata_cache, get_result_cache, get_search_index,
+    with_max_execution_time,
+)
+from db.cost_guard import (
+    GUARDED_OPERATIONS, PlanEstimate, describe, exceeds, has_effective_limit, inject_limit, parse_explain_json
+)
+from db.metadata_cache import DDL_KEYWORDS, ddl_targets
+from db.result_cache import WRITE_KEYWORDS, CachedResult, is_cacheable, referenced_tables
+from db.serializers import CsvWriter, ResultWriter, get_serializer
+from db.sql_lexer import Statement, split_statements
+from utils import get_metrics, tracing
+from .base import BaseHandler, is_error_text
+
+# 会修改会话状态的语句，执行后连接不再放回连接池复用
+SESSION_STATE_OPERATIONS = ("USE", "SET", "LOCK")
+
+# 会隐式提交当前事务的语句，不能出现在 transaction 模式的批次中
+IMPLICIT_COMMIT_OPERATIONS = DDL_KEYWORDS + (
+    "GRANT", "REVOKE", "LOCK", "UNLOCK", "FLUSH", "RESET", "ANALYZE", "OPTIMIZE", "REPAIR",
+    "INSTALL", "UNINSTALL", "START", "BEGIN", "COMMIT", "ROLLBACK",
+)
+
+# 不修改数据的语句，transaction 模式下执行前不设置保存点
+READ_OPERATIONS = ("SELECT", "SHOW", "DESCRIBE", "DESC", "EXPLAIN", "USE", "SET")
+
+
+class ResultBudget:
+    """单次工具调用可返回的结果行数与字节数预算，0 表示不限制"""
+
+    def __init__(self, max_rows: int, max_bytes: int):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.rows = 0
+        self.bytes = 0
+        self.exhausted = False
+
+    def consume(self, rows: int, size: int) -> None:
+        self.rows += rows
+        self.bytes += size
+        if (self.max_rows and self.rows >= self.max_rows) or (self.max_bytes and self.bytes >= self.max_bytes):
+            self.exhausted = True
+
+    def fits(self, rows: int, size: int) -> bool:
+        """剩余预算能否容纳 rows 行、size 字节的结果"""
+        return ((not self.max_rows or self.rows + rows <= self.max_rows)
+                and (not self.max_bytes or self.bytes + size <= self.max_bytes))
+
+    def batch_size(self, batch_size: int) -> int:
+        """下一次 fetchmany 的行数，不超过剩余行数预算"""
+        if self.max_rows:
+            return max(1, min(batch_size, self.max_rows - self.rows))
+        return batch_size
+
+    def trailer(self) -> str:
+        return f"(结果已截断: truncated after {self.rows} rows / {self.bytes} bytes)"
+
+
+def _discard_unread_result(pool, conn, current_schema: str = None) -> None:
+    """丢弃未读完的结果集：重新建立连接并恢复当前数据库，原连接上的预处理语句随之失效"""
+    conn.reconnect()
+    pool.forget_statements(conn)
+    if current_schema:
+        conn.database = current_schema
+
+
+def _commits_implicitly(keywords: Tuple[str, ...]) -> bool:
+    """语句是否会隐式提交事务，CREATE/DROP TEMPORARY TABLE 除外"""
+    return keywords[0] in IMPLICIT_COMMIT_OPERATIONS and keywords[1:2] != ("TEMPORARY",)
+
+
+def _execute_control(conn, sql: str) -> None:
+    """执行 SAVEPOINT 等不返回结果集的事务控制语句"""
+    with conn.cursor() as cursor:
+        cursor.execute(sql)
+
+
+def _drain_result(cursor, batch_size: int) -> None:
+    """读完并丢弃未读完的结果集；事务中不能像 _discard_unread_result 那样重连"""
+    while cursor.fetchmany(batch_size):
+        pass
+
+
+def normalize_params(params: Any) -> List[Tuple[Any, ...]]:
+    """将 execute_sql 的 params 参数转换为每次执行的参数列表
+
+    参数:
+        params: 一维数组表示执行一次；二维数组表示按每组参数各执行一次
+
+    返回:
+        list[tuple]: 每次执行使用的参数
+
+    异常:
+        ValueError: 当 params 不是数组、二维数组中混入非数组元素，或参数值不是标量时抛出
+    """
+    if not isinstance(params, (list, tuple)):
+        raise ValueError("params 必须是数组，或由数组组成的数组")
+    nested = [isinstance(item, (list, tuple)) for item in params]
+    if params and all(nested):
+        param_sets = [tuple(item) for item in params]
+    elif any(nested):
+        raise ValueError("params 不能同时包含数组和单个值")
+    else:
+        param_sets = [tuple(params)]
+
+    for values in param_sets:
+        for value in values:
+            if value is not None and not isinstance(value, (str, int, float, bool)):
+                raise ValueError("params 中的值只能是字符串、数字、布尔值或 null")
+    return param_sets
+
+
+def resolve_timeout(requested: Any, role_timeout: float) -> float:
+    """计算本次调用的执行超时，调用方指定的 timeout 不能超过角色的上限
+
+    参数:
+        requested: 调用参数中的 timeout（秒），None 表示使用角色的配置
+        role_timeout (float): 角色的超时配置，0 表示不限制
+
+    返回:
+        float: 实际使用的超时时间（秒），0 表示不限制
+
+    异常:
+        ValueError: 当 timeout 不是正数时抛出
+    """
+    if requested is None:
+        return role_timeout
+    if isinstance(requested, bool) or not isinstance(requested, (int, float)) or requested <= 0:
+        raise ValueError("timeout 必须是正数（秒）")
+    return min(requested, role_timeout) if role_timeout else float(requested)
 
 
 class ExecuteSQL(BaseHandler):
     name = "execute_sql"
-    description = (
-        "在MySQL数据库上执行SQL，可以访问所有数据库 (multiple SQL execution, separated by ';')"
-    )
-
-    def get_tool_description(self) -> Tool:
-        return Tool(
-            name=self.name,
-            description=self.description,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "要执行的SQL语句，可以包含数据库名称如：USE database_name; 或 SELECT * FROM database_name.table_name;"
-                    }
-                },
-                "required": ["query"]
-            }
-        )
-
-    def check_sql_permission(self, sql: str, allowed_operations: list) -> bool:
+
+    @staticmethod
+    def is_error_result(text: str) -> bool:
+        """判断 run_tool 返回的文本是否为执行失败的信息"""
+        return is_error_text(text)
+
+    def check_sql_permission(self, sql: Union[str, Statement],
+                             allowed_operations: Union[RolePermissions, Collection[str]]) -> bool:
         """检查SQL语句是否有执行权限
-        
+
         参数:
-            sql (str): SQL语句
-            allowed_operations (list): 允许的操作列表
-            
+            sql (str | Statement): SQL语句，或 split_statements 拆分出的语句
+            allowed_operations (RolePermissions | Collection[str]): 角色编译后的权限判定器，或允许的操作集合
+
         返回:
             bool: 是否有权限执行
         """
-        # 清理和标准化SQL语句
-        sql_lines = sql.strip().split('\n')
-        
-        # 找到第一行非注释的SQL语句
-        actual_sql = ""
-        for line in sql_lines:
-            line = line.strip()
-            # 跳过空行和注释行
-            if not line or line.startswith('--') or line.startswith('/*'):
-                continue
-            # 如果行中有 -- 注释，只取注释前的部分
-            if '--' in line:
-                line = line.split('--')[0].strip()
-            if line:
-                actual_sql = line
+        if isinstance(sql, str):
+            statements = split_statements(sql)
+            if not statements:
+                return False
+            sql = statements[0]
+
+        # 前导关键字由词法分析得到，已跳过注释，可执行注释中的内容按SQL处理
+        if isinstance(allowed_operations, RolePermissions):
+            return allowed_operations.allows(sql.keywords)
+        return bool(sql.keywords) and classify_operation(sql.keywords) in allowed_operations
+
+    def read_result(self, cursor, budget: "ResultBudget", batch_size: int,
+                    serializer: Type[ResultWriter] = CsvWriter) -> Tuple[str, bool]:
+        """分批读取当前结果集并边读边序列化
+
+        参数:
+            cursor: 已执行语句且带有结果集的非缓冲游标
+            budget (ResultBudget): 本次调用剩余的行数/字节数预算
+            batch_size (int): 每次 fetchmany 读取的行数
+            serializer (type): 结果序列化器，默认为CSV
+
+        返回:
+            tuple[str, bool]: 序列化后的结果，以及结果集是否已全部读完；
+            超出预算时结果末尾附带截断说明，剩余行不再读取
+        """
+        with tracing.span("serialize"):
+            writer = serializer(cursor.description)
+        rows_before, bytes_before = budget.rows, budget.bytes
+        budget.consume(0, writer.header_size)
+
+        drained = False
+        while not budget.exhausted:
+            with tracing.span("fetch"):
+                rows = cursor.fetchmany(budget.batch_size(batch_size))
+            if not rows:
+                drained = True
                 break
-        
-        if not actual_sql:
-            return False
-            
-        # 标准化SQL语句
-        sql_upper = actual_sql.upper()
-        words = sql_upper.split()
-        
-        if not words:
-            return False
-        
-        # 定义多单词操作的映射
-        multi_word_operations = {
-            # 数据库操作
-            ('CREATE', 'DATABASE'): 'CREATE DATABASE',
-            ('DROP', 'DATABASE'): 'DROP DATABASE', 
-            ('ALTER', 'DATABASE'): 'ALTER DATABASE',
-            # 索引操作
-            ('CREATE', 'INDEX'): 'CREATE INDEX',
-            ('DROP', 'INDEX'): 'DROP INDEX',
-            ('ALTER', 'INDEX'): 'ALTER INDEX',
-            # 视图操作
-            ('CREATE', 'VIEW'): 'CREATE VIEW',
-            ('DROP', 'VIEW'): 'DROP VIEW',
-            ('ALTER', 'VIEW'): 'ALTER VIEW',
-            # 存储过程操作
-            ('CREATE', 'PROCEDURE'): 'CREATE PROCEDURE',
-            ('DROP', 'PROCEDURE'): 'DROP PROCEDURE',
-            ('ALTER', 'PROCEDURE'): 'ALTER PROCEDURE',
-            # 函数操作
-            ('CREATE', 'FUNCTION'): 'CREATE FUNCTION',
-            ('DROP', 'FUNCTION'): 'DROP FUNCTION',
-            ('ALTER', 'FUNCTION'): 'ALTER FUNCTION',
-            # 触发器操作
-            ('CREATE', 'TRIGGER'): 'CREATE TRIGGER',
-            ('DROP', 'TRIGGER'): 'DROP TRIGGER',
-            # 事件操作
-            ('CREATE', 'EVENT'): 'CREATE EVENT',
-            ('DROP', 'EVENT'): 'DROP EVENT',
-            ('ALTER', 'EVENT'): 'ALTER EVENT',
-            # 用户操作
-            ('CREATE', 'USER'): 'CREATE USER',
-            ('DROP', 'USER'): 'DROP USER',
-            ('ALTER', 'USER'): 'ALTER USER',
-            ('RENAME', 'USER'): 'RENAME USER',
-            # 临时表
-            ('CREATE', 'TEMPORARY'): 'CREATE TEMPORARY TABLES',
-            # 复制相关
-            ('REPLICATION', 'SLAVE'): 'REPLICATION SLAVE',
-            ('REPLICATION', 'CLIENT'): 'REPLICATION CLIENT',
-            # 文件操作
-            ('SELECT', 'INTO'): 'SELECT INTO OUTFILE',
-            ('LOAD', 'DATA'): 'LOAD DATA',
-        }
-        
-        # 检查多单词操作
-        if len(words) >= 2:
-            two_word_key = (words[0], words[1])
-            if two_word_key in multi_word_operations:
-                operation = multi_word_operations[two_word_key]
-                return operation in allowed_operations
-            
-            # 特殊处理一些三单词的操作
-            if len(words) >= 3:
-                if words[0] == 'CREATE' and words[1] == 'TEMPORARY' and words[2] == 'TABLE':
-                    return 'CREATE TEMPORARY TABLES' in allowed_operations
-                elif words[1] == 'INTO' and words[2] == 'OUTFILE':
-                    return 'SELECT INTO OUTFILE' in allowed_operations
-                elif words[0] == 'LOAD' and words[1] == 'DATA' and words[2] == 'INFILE':
-                    return 'LOAD DATA' in allowed_operations
-        
-        # 如果不是多单词操作，检查单个单词操作
-        single_operation = words[0]
-        return single_operation in allowed_operations
+            # 字节数预算按批检查，最多超出一个批次
+            with tracing.span("serialize"):
+                size = writer.write_rows(rows)
+            budget.consume(len(rows), size)
+
+        if not drained:
+            # 预算恰好在最后一批用完时，多取一行确认结果集是否已读完
+            with tracing.span("fetch"):
+                drained = cursor.fetchone() is None
+        get_metrics().record_serialized(serializer.name, budget.rows - rows_before, budget.bytes - bytes_before)
+        with tracing.span("serialize"):
+            return writer.getvalue(None if drained else budget.trailer()), drained
+
+    def explain(self, pool, conn, sql: str, params: Optional[Tuple[Any, ...]] = None) -> Optional[PlanEstimate]:
+        """执行 EXPLAIN FORMAT=JSON 并解析估算的扫描行数与成本
+
+        参数:
+            pool: 连接池，带参数时通过其预处理游标执行
+            conn: 当前借出的连接
+            sql (str): 要估算的单条读语句
+            params (tuple, 可选): 占位符对应的参数
+
+        返回:
+            PlanEstimate: 执行计划估算；服务器不支持或无法解析时返回None，语句照常执行
+        """
+        explain_sql = f"EXPLAIN FORMAT=JSON {sql}"
+        try:
+            if params is None:
+                with conn.cursor() as cursor:
+                    cursor.execute(explain_sql)
+                    rows = cursor.fetchall()
+            else:
+                cursor, operation = pool.prepared_cursor(conn, explain_sql)
+                cursor.execute(operation, params)
+                rows = cursor.fetchall()
+        except Error:
+            return None
+        return parse_explain_json(rows[0][0]) if rows else None
+
+    def guard_cost(self, pool, conn, statement: Statement, param_sets: Optional[List[Tuple[Any, ...]]],
+                   config: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """执行读语句前按 EXPLAIN 估算检查成本
+
+        参数:
+            pool: 连接池
+            conn: 当前借出的连接
+            statement (Statement): 要执行的读语句
+            param_sets (list[tuple], 可选): 每次执行的参数，批量执行时按第一组参数估算
+            config (dict): 当前角色的成本保护配置，见 get_cost_guard_config
+
+        返回:
+            tuple: (要执行的语句, 说明)。未超限时为 (原语句, None)；limit 模式下加上 LIMIT 后为
+            (新语句, 附加在结果末尾的说明)；拒绝执行时为 (None, 拒绝原因)
+        """
+        plan = self.explain(pool, conn, statement.text, param_sets[0] if param_sets else None)
+        if plan is None or not exceeds(plan, config["max_rows"], config["max_cost"]):
+            return statement.text, None
+        if has_effective_limit(statement.code, plan):
+            return statement.text, None
+        reason = describe(plan, config["max_rows"], config["max_cost"])
+        if config["mode"] == "limit":
+            limited = inject_limit(statement.text, statement.code, config["limit"], plan)
+            if limited is not None:
+                return limited, f"(已自动添加 LIMIT {config['limit']}: {reason})"
+        return None, reason
+
+    def execute_query(self, query: str, output_format: str = "csv",
+                      param_sets: Optional[List[Tuple[Any, ...]]] = None,
+                      transaction: bool = False, stop_on_error: Optional[bool] = None,
+                      deadline: Optional[QueryDeadline] = None) -> str:
+        """同步执行SQL语句，会阻塞当前线程，应通过 run_blocking 在线程池中调用
+
+        结果集使用非缓冲游标按批读取，超过 MYSQL_RESULT_MAX_ROWS / MYSQL_RESULT_MAX_BYTES
+        后停止读取，保证内存占用与表大小无关；开启 MYSQL_RESULT_CACHE_TTL 后，
+        可重复的 SELECT 结果直接从查询结果缓存返回。开启跟踪时按 connect、permission、
+        cost_guard、execute、fetch、serialize、commit 分阶段计时
+
+        参数:
+            query (str): 要执行的SQL语句，支持多条语句以分号分隔
+            output_format (str): 结果集输出格式，见 db.serializers.SERIALIZERS
+            param_sets (list[tuple], 可选): 每次执行的参数，见 normalize_params；
+                指定时 query 只能包含一条语句，通过连接上缓存的预处理游标执行
+            transaction (bool): 为True时全部语句在同一事务中执行，最后只提交一次；
+                不使用查询结果缓存，批次中不能包含会隐式提交的语句
+            stop_on_error (bool, 可选): 为True时遇到第一个出错的语句即停止，事务模式下回滚整个事务；
+                默认与 transaction 相同。事务模式下继续执行时，每条写入语句前设置保存点，
+                出错的语句回滚到保存点，其余语句照常提交
+            deadline (QueryDeadline, 可选): 本次调用的执行期限；SELECT 带上 MAX_EXECUTION_TIME 提示，
+                超时或调用被取消后正在执行的语句被 KILL QUERY 终止，其余语句不再执行
+
+        返回:
+            str: 各条语句的执行结果，以"---"分隔
+
+        异常:
+            Error: 当数据库连接失败时抛出异常
+            ValueError: 指定 param_sets 而 query 包含多条语句，或事务模式下包含会隐式提交的语句时抛出
+        """
+        # 获取角色权限，配置快照在启动时加载，这里不访问 .env
+        settings = get_settings()
+        role = settings.role
+        allowed_operations = settings.permissions
+        result_config = settings.result
+        cost_guard = settings.cost_guard
+        budget = ResultBudget(result_config["max_rows"], result_config["max_bytes"])
+        serializer = get_serializer(output_format)
+
+        # 按词法拆分语句，字符串/注释中的分号不会被当作分隔符
+        statements = split_statements(query)
+        if param_sets is not None and len(statements) != 1:
+            raise ValueError("使用 params 时 query 只能包含一条语句")
+        if stop_on_error is None:
+            stop_on_error = transaction
+        if transaction:
+            for statement in statements:
+                if _commits_implicitly(statement.keywords):
+                    raise ValueError(f"transaction 模式下不能执行会隐式提交事务的语句: {statement.text}")
+
+        pool = get_pool()
+        result_cache = get_result_cache()
+        metrics = get_metrics()
+        # 执行 SET 等修改会话状态的语句后，后续查询结果可能与缓存不一致，不再使用缓存；
+        # 事务中的查询能读到本事务未提交的写入，也不使用缓存
+        use_cache = result_cache.enabled and not transaction
+        results = []
+        current_schema = None
+        # 事务模式下写入语句在提交后才使相关表的缓存失效
+        pending_writes = []
+        failures = 0
+        # 因出错停止执行时，出错语句的序号；超时停止时为第一条未执行语句的序号
+        aborted = None
+        timed_out = False
+
+        with ExitStack() as stack:
+            # 全部语句都命中缓存时不借出连接
+            conn = None
+
+            for index, statement in enumerate(statements):
+                savepoint = None
+                if deadline is not None and deadline.stopped:
+                    aborted, timed_out = index, True
+                    break
+                try:
+                    # 检查权限
+                    with tracing.span("permission"):
+                        permitted = self.check_sql_permission(statement, allowed_operations)
+                    if not permitted:
+                        results.append(f"权限不足: 当前角色 '{role}' 无权执行该SQL操作")
+                        failures += 1
+                        if stop_on_error:
+                            aborted = index
+                            break
+                        continue
+
+                    cache_key = None
+                    # 批量执行的结果不缓存
+                    if use_cache and (param_sets is None or len(param_sets) == 1):
+                        if is_cacheable(statement.code, statement.keywords, current_schema):
+                            params = param_sets[0] if param_sets else ()
+                            cache_key = ResultCache.make_key(statement.code, current_schema, output_format, params)
+                            cached = result_cache.get(cache_key)
+                            if cached is not None and budget.fits(cached.rows, cached.size):
+                                budget.consume(cached.rows, cached.size)
+                                results.append(cached.text)
+                                continue
+                        elif statement.keywords[0] == "SELECT":
+                            result_cache.record_bypass()
+
+                    if conn is None:
+                        with tracing.span("connect"):
+                            conn = stack.enter_context(pool.connection())
+                            if deadline is not None:
+                                # 先于连接归还解除关联，归还后的连接不会再被 KILL
+                                deadline.attach(conn)
+                                stack.callback(deadline.detach)
+                            if transaction:
+                                conn.start_transaction()
+                    tracing.note_statement(statement.code)
+                    sql = statement.text
+                    guard_note = None
+                    if cost_guard["mode"] != "off" and statement.keywords[0] in GUARDED_OPERATIONS:
+                        with tracing.span("cost_guard"):
+                            sql, guard_note = self.guard_cost(pool, conn, statement, param_sets, cost_guard)
+                        if sql is None:
+                            results.append(f"查询成本超限: {guard_note}，语句未执行")
+                            failures += 1
+                            if stop_on_error:
+                                aborted = index
+                                break
+                            continue
+
+                    if transaction and not stop_on_error and statement.keywords[0] not in READ_OPERATIONS:
+                        savepoint = f"execute_sql_{index}"
+                        _execute_control(conn, f"SAVEPOINT {savepoint}")
+                    generation = result_cache.generation
+                    affected = None
+                    if deadline is not None and statement.keywords[0] == "SELECT":
+                        # 使用固定的超时时间而不是剩余时间，语句文本不变，预处理语句可以复用
+                        sql = with_max_execution_time(sql, deadline.timeout)
+
+                    for params in (param_sets if param_sets is not None else [None]):
+                        if params is None:
+                            cursor = conn.cursor(buffered=False)
+                            operation = sql
+                        else:
+                            # 同一语句在该连接上只 prepare 一次，之后每次执行只发送参数
+                            cursor, operation = pool.prepared_cursor(conn, sql)
+                        try:
+                            started = time.perf_counter()
+                            cursor.execute(operation, params)
+                            elapsed = time.perf_counter() - started
+                            metrics.observe_statement(statement.keywords[0], elapsed)
+                            tracing.record("execute", elapsed)
+
+                            # 检查语句是否返回了结果集 (SELECT, SHOW, EXPLAIN, etc.)
+                            if cursor.description:
+                                rows, size = budget.rows, budget.bytes
+                                text, drained = self.read_result(
+                                    cursor, budget, result_config["fetch_batch_size"], serializer
+                                )
+                                if guard_note is not None:
+                                    text = f"{text}\n{guard_note}"
+                                results.append(text)
+                                if not drained:
+                                    if transaction:
+                                        _drain_result(cursor, result_config["fetch_batch_size"])
+                                    else:
+                                        # 剩余行仍在网络缓冲中，重连以丢弃它们并让服务器终止该查询
+                                        _discard_unread_result(pool, conn, current_schema)
+                                elif cache_key is not None:
+                                    # 只缓存完整读取的结果
+                                    rows, size = budget.rows - rows, budget.bytes - size
+                                    tables = referenced_tables(statement.code, current_schema)
+                                    result_cache.put(cache_key, CachedResult(text, rows, size, tables), size, generation)
+                            else:
+                                affected = (affected or 0) + max(cursor.rowcount, 0)
+                        finally:
+                            if params is None:
+                                cursor.close()
+
+                    words = statement.keywords
+                    if words[0] in SESSION_STATE_OPERATIONS or words[:2] == ("CREATE", "TEMPORARY"):
+                        pool.invalidate(conn)
+                        use_cache = use_cache and words[0] == "USE"
+                    if words[0] == "USE":
+                        parts = statement.code.split(None, 1)
+                        if len(parts) > 1:
+                            current_schema = parts[1].strip().strip("`")
+                    if words[0] in DDL_KEYWORDS:
+                        get_metadata_cache().invalidate_statement(statement.code, current_schema)
+                        get_search_index().mark_stale(ddl_targets(statement.code, current_schema))
+                    if words[0] in WRITE_KEYWORDS:
+                        if transaction:
+                            pending_writes.append((statement.code, current_schema))
+                        else:
+                            result_cache.invalidate_statement(statement.code, current_schema)
+
+                    # 如果语句没有返回结果集 (INSERT, UPDATE, DELETE, etc.)，批量执行时只提交一次；
+                    # 事务模式下在全部语句执行完后统一提交
+                    if affected is not None:
+                        if not transaction:
+                            with tracing.span("commit"):
+                                conn.commit()  # 只有在非查询语句时才提交
+                        results.append(f"查询执行成功。影响行数: {affected}")
+
+                except Error as stmt_error:
+                    results.append(f"执行语句 '{statement.text}' 出错: {str(stmt_error)}")
+                    failures += 1
+                    if savepoint is not None:
+                        try:
+                            _execute_control(conn, f"ROLLBACK TO SAVEPOINT {savepoint}")
+                        except Error:
+                            # 死锁等错误会使服务器回滚整个事务，保存点随之失效
+                            aborted = index
+                            break
+                    elif conn is not None and not transaction:
+                        # 丢弃出错语句未提交的部分写入（如批量参数执行到一半），避免被后续语句一并提交
+                        try:
+                            conn.rollback()
+                        except Error:
+                            pool.invalidate(conn)
+                    if stop_on_error:
+                        aborted = index
+                        break
+
+            reason = skipped = None
+            if timed_out:
+                reason = "调用已取消" if deadline.cancelled else f"超过 {deadline.timeout:g} 秒未完成"
+                skipped = len(statements) - aborted
+            elif aborted is not None:
+                reason = f"第 {aborted + 1} 条语句出错"
+                skipped = len(statements) - aborted - 1
+            if transaction and reason is not None:
+                if conn is not None:
+                    conn.rollback()
+                pending_writes = []
+                results.append(f"事务已回滚: {reason}，其余 {skipped} 条语句未执行")
+            elif transaction and conn is not None:
+                try:
+                    with tracing.span("commit"):
+                        conn.commit()
+                except Error as e:
+                    conn.rollback()
+                    pending_writes = []
+                    results.append(f"执行查询时出错: 事务提交失败，已回滚: {str(e)}")
+                else:
+                    results.append(f"事务已提交，{failures} 条出错的语句未生效" if failures else "事务已提交")
+            elif reason is not None:
+                results.append(f"已停止执行: {reason}，其余 {skipped} 条语句未执行")
+
+        for code, schema in pending_writes:
+            result_cache.invalidate_statement(code, schema)
+        return "\n---\n".join(results)
+
+    def fetch_rows(self, query: str, params: Sequence[Any] = None,
+                   deadline: Optional[QueryDeadline] = None) -> Tuple[list, list]:
+        """同步执行单条内部只读查询，返回结构化结果而非文本
+
+        供其他工具在进程内对结果做拆分/加工，不做权限检查和结果集预算，
+        调用方需保证语句是只读的且结果集大小可控
+
+        参数:
+            query (str): 单条SQL语句，可使用 %s 占位符
+            params (list, 可选): 占位符对应的参数，指定时通过预处理语句执行
+            deadline (QueryDeadline, 可选): 执行期限，超时或调用被取消后语句被 KILL QUERY 终止
+
+        返回:
+            tuple[list, list]: (cursor.description, 全部行)
+        """
+        pool = get_pool()
+        tracing.note_statement(query)
+        with ExitStack() as stack:
+            with tracing.span("connect"):
+                conn = stack.enter_context(pool.connection())
+            if deadline is not None:
+                deadline.attach(conn)
+                stack.callback(deadline.detach)
+            if params is None:
+                with conn.cursor() as cursor:
+                    with tracing.span("execute"):
+                        cursor.execute(query)
+                    with tracing.span("fetch"):
+                        return cursor.description or [], cursor.fetchall() if cursor.description else []
+            cursor, operation = pool.prepared_cursor(conn, query)
+            with tracing.span("execute"):
+                cursor.execute(operation, tuple(params))
+            with tracing.span("fetch"):
+                return cursor.description or [], cursor.fetchall() if cursor.description else []
+
+    async def query(self, query: str, params: Sequence[Any] = None, timeout: float = 0) -> Tuple[list, list]:
+        """在线程池中执行 fetch_rows
+
+        超过 timeout 秒（0 表示不限制）或调用被取消（如 gather_probes 超时）时终止服务器上的查询，
+        不让线程池线程和连接一直等待服务器返回
+        """
+        deadline = QueryDeadline(get_pool(), timeout)
+        try:
+            return await run_blocking(self.fetch_rows, query, params, deadline)
+        except asyncio.CancelledError:
+            deadline.cancel()
+            raise
+        finally:
+            deadline.close()
 
     async def run_tool(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
        """执行SQL查询语句
 
+          数据库操作在独立的线程池中执行，不会阻塞事件循环，
+          并发度由 MYSQL_MAX_CONCURRENCY 控制
+
           参数:
               query (str): 要执行的SQL语句，支持多条语句以分号分隔
+              params (list, 可选): 占位符参数，一维数组执行一次，二维数组按每组参数各执行一次
+              transaction (bool, 可选): 全部语句在同一事务中执行并只提交一次
+              stop_on_error (bool, 可选): 遇到第一个出错的语句即停止，默认与 transaction 相同
+              timeout (float, 可选): 本次调用的最长执行时间（秒），不能超过角色的 MYSQL_QUERY_TIMEOUT
+              output_format (str, 可选): 结果集输出格式，csv(默认)、ndjson 或 columnar
 
           返回:
               list[TextContent]: 包含查询结果的TextContent列表
-              - 对于SELECT查询：返回CSV格式的结果，包含列名和数据
+              - 对于SELECT查询：按 output_format 返回结果，默认为包含列名和数据的CSV
               - 对于SHOW TABLES：返回数据库中的所有表名
               - 对于其他查询：返回执行状态和影响行数
               - 多条语句的结果以"---"分隔
 
-          异常:
-              Error: 当数据库连接或查询执行失败时抛出异常
+          参数不合法或数据库连接、查询执行失败时返回 "执行查询时出错: ..." 文本
           """
        try:
            if "query" not in arguments:
                raise ValueError("缺少查询语句")
 
-           query = arguments["query"]
-           
-           # 获取不指定数据库的连接配置和角色权限
-           connection_config, role = get_db_config_without_database()
-           allowed_operations = get_role_permissions(role)
-
-           with connect(**connection_config) as conn:
-               with conn.cursor() as cursor:
-                   statements = [stmt.strip() for stmt in query.split(';') if stmt.strip()]
-                   results = []
+           output_format = arguments.get("output_format") or "csv"
+           # 在进入线程池之前校验输出格式和参数
+           get_serializer(output_format)
+           params = arguments.get("params")
+           param_sets = normalize_params(params) if params is not None else None
+           transaction = arguments.get("transaction") or False
+           stop_on_error = arguments.get("stop_on_error")
+           if not isinstance(transaction, bool) or not isinstance(stop_on_error, (bool, type(None))):
+               raise ValueError("transaction 和 stop_on_error 必须是布尔值")
+           timeout = resolve_timeout(arguments.get("timeout"), get_settings().timeout["query_timeout"])
 
-                   for statement in statements:
-                       try:
-                           # 检查权限
-                           if not self.check_sql_permission(statement, allowed_operations):
-                               results.append(f"权限不足: 当前角色 '{role}' 无权执行该SQL操作")
-                               continue
+           # 超时或调用被取消（客户端断开、请求取消、gather_probes 超时）时终止服务器上的查询
+           deadline = QueryDeadline(get_pool(), timeout)
+           try:
+               text = await run_blocking(self.execute_query, arguments["query"], output_format, param_sets,
+                                         transaction, stop_on_error, deadline)
+           except asyncio.CancelledError:
+               deadline.cancel()
+               raise
+           finally:
+               deadline.close()
+           return [TextContent(type="text", text=text)]
 
-                           cursor.execute(statement)
-
-                           # 检查语句是否返回了结果集 (SELECT, SHOW, EXPLAIN, etc.)
-                           if cursor.description:
-                               columns = [desc[0] for desc in cursor.description]
-                               rows = cursor.fetchall()
-
-                               # 将每一行的数据转换为字符串，特殊处理None值
-                               formatted_rows = []
-                               for row in rows:
-                                   formatted_row = ["NULL" if value is None else str(value) for value in row]
-                                   formatted_rows.append(",".join(formatted_row))
-
-                               # 将列名和数据合并为CSV格式
-                               results.append("\n".join([",".join(columns)] + formatted_rows))
-
-                           # 如果语句没有返回结果集 (INSERT, UPDATE, DELETE, etc.)
-                           else:
-                               conn.commit()  # 只有在非查询语句时才提交
-                               results.append(f"查询执行成功。影响行数: {cursor.rowcount}")
+       except Error as e:
+           return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
+       except ValueError as e:
+           # 参数校验失败（params、transaction、timeout、output_format 等）
+           return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
 
-                       except Error as stmt_error:
-                           # 单条语句执行出错时，记录错误并继续执行
-                           results.append(f"执行语句 '{statement}' 出错: {str(stmt_error)}")
-                           # 可以在这里选择是否继续执行后续语句，目前是继续
+    async def run_metadata_query(self, cache_key: tuple, query: str,
+                                 params: Sequence[Any] = None) -> Sequence[TextContent]:
+        """执行 information_schema 等元数据查询，结果通过元数据缓存复用
 
-                   return [TextContent(type="text", text="\n---\n".join(results))]
+        参数:
+            cache_key (tuple): 由 MetadataCache.make_key 生成的缓存键
+            query (str): 要执行的元数据查询语句，可使用 %s 占位符
+            params (list, 可选): 占位符对应的参数
 
-       except Error as e:
-           return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
+        返回:
+            list[TextContent]: 与 run_tool 相同的查询结果，执行失败的结果不会被缓存
+        """
+        cache = get_metadata_cache()
+        text = cache.get(cache_key)
+        if text is not None:
+            return [TextContent(type="text", text=text)]
 
+        generation = cache.generation
+        arguments = {"query": query}
+        if params is not None:
+            arguments["params"] = list(params)
+        result = await self.run_tool(arguments)
+        text = result[0].text
+        if not self.is_error_result(text):
+            cache.put(cache_key, text, len(text.encode("utf-8")), generation)
+        return result
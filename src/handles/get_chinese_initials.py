@@ -1,69 +1,57 @@
+import json
 from typing import Dict, Any, Sequence
 
-from mcp import Tool
 from mcp.types import TextContent
-from pypinyin import pinyin, Style
+
+from utils import initials_list, initials_mapping
 from .base import BaseHandler
 
 
 class GetChineseInitials(BaseHandler):
     name = "get_chinese_initials"
-    description = (
-        "创建表结构时，将中文字段名转换为拼音首字母字段"
-    )
-
-    def get_tool_description(self) -> Tool:
-        return Tool(
-            name=self.name,
-            description=self.description,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "text": {
-                        "type": "string",
-                        "description": "要获取拼音首字母的汉字文本，以“,”分隔"
-                    }
-                },
-                "required": ["text"]
-            }
-        )
 
     async def run_tool(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
             """将中文文本转换为拼音首字母
 
             参数:
                 text (str): 要转换的中文文本，以中文逗号分隔
+                names (list[str], 可选): 批量转换的字段名，传入时忽略 text
+                dedupe (bool, 可选): 是否为重复的首字母追加序号后缀；text 模式下按位置去重，
+                    names 模式下相同的字段名共用一个结果
 
             返回:
                 list[TextContent]: 包含转换结果的TextContent列表
                 - 每个词的首字母会被转换为大写
-                - 多个词的结果以英文逗号连接
+                - text 模式下多个词的结果以英文逗号连接
+                - names 模式下为字段名到首字母的JSON对象
 
             示例:
                 get_chinese_initials("用户名，密码")
                 [TextContent(type="text", text="YHM,MM")]
+                get_chinese_initials(names=["用户名", "用户码"], dedupe=True)
+                [TextContent(type="text", text='{"用户名": "YHM", "用户码": "YHM_2"}')]
             """
             try:
-                if "text" not in arguments:
-                    raise ValueError("缺少查询语句")
+                dedupe = arguments.get("dedupe", False)
+                if not isinstance(dedupe, bool):
+                    raise ValueError("dedupe 必须是布尔值")
 
-                text = arguments["text"]
+                if arguments.get("names") is not None:
+                    names = arguments["names"]
+                    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+                        raise ValueError("names 必须是字符串数组")
+                    mapping = initials_mapping(names, dedupe)
+                    return [TextContent(type="text", text=json.dumps(mapping, ensure_ascii=False))]
 
-                # 将文本按逗号分割
-                words = text.split('，')
-
-                # 存储每个词的首字母
-                initials = []
+                if "text" not in arguments:
+                    raise ValueError("缺少查询语句")
 
-                for word in words:
-                    # 获取每个字的拼音首字母
-                    word_pinyin = pinyin(word, style=Style.FIRST_LETTER)
-                    # 将每个字的首字母连接起来
-                    word_initials = ''.join([p[0].upper() for p in word_pinyin])
-                    initials.append(word_initials)
+                # 将文本按逗号分割，每个词的首字母按词缓存，重复的词只转换一次；
+                # 去重按位置进行，相同的词也得到不同的结果
+                words = arguments["text"].split('，')
 
                 # 用逗号连接所有结果
-                return [TextContent(type="text", text=','.join(initials))]
+                return [TextContent(type="text", text=','.join(initials_list(words, dedupe)))]
 
             except Exception as e:
-                return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
\ No newline at end of file
+                return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
@@ -1,33 +1,15 @@
 from typing import Dict, Any, Sequence
 
-from mcp import Tool
 from mcp.types import TextContent
 
 from .base import BaseHandler
+from db import MetadataCache
 from handles import (
     ExecuteSQL
 )
 
 class GetDatabases(BaseHandler):
     name = "get_databases"
-    description = (
-        "获取MySQL服务器上所有可用的数据库列表（排除系统数据库）"
-    )
-
-    def get_tool_description(self) -> Tool:
-        return Tool(
-            name=self.name,
-            description=self.description,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "include_system": {
-                        "type": "boolean",
-                        "description": "是否包含系统数据库（information_schema, performance_schema, mysql, sys），默认为false"
-                    }
-                }
-            }
-        )
 
     async def run_tool(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
         """获取所有可用的数据库列表
@@ -51,7 +33,8 @@ class GetDatabases(BaseHandler):
             
             sql += " ORDER BY SCHEMA_NAME;"
 
-            return await execute_sql.run_tool({"query": sql})
+            cache_key = MetadataCache.make_key("databases", None, None, bool(include_system))
+            return await execute_sql.run_metadata_query(cache_key, sql)
 
         except Exception as e:
             return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")] 
\ No newline at end of file
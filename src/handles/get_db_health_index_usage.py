@@ -1,9 +1,9 @@
 from typing import Dict, Any, Sequence
 
-from mcp import Tool
 from mcp.types import TextContent
 
-from .base import BaseHandler
+from config import get_settings
+from .base import BaseHandler, gather_probes
 from handles import (
     ExecuteSQL
 )
@@ -12,41 +12,14 @@ execute_sql = ExecuteSQL()
 
 class GetDBHealthIndexUsage(BaseHandler):
     name = "get_db_health_index_usage"
-    description = (
-        "获取mysql库的索引使用情况,包含冗余索引情况、性能较差的索引情况、未使用索引且查询时间大于30秒top5情况"
-        + "(Get the index usage of mysql databases, including redundant index situations, "
-        +  "poorly performing index situations, and the top 5 unused index situations with query times greater than 30 seconds)"
-    )
-
-    def get_tool_description(self) -> Tool:
-        return Tool(
-            name=self.name,
-            description=self.description,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "database": {
-                        "type": "string",
-                        "description": "可选：指定要分析的数据库名称，如果不指定则分析所有数据库（排除系统数据库）"
-                    }
-                }
-            }
-        )
 
     async def run_tool(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
-        database = arguments.get("database")
-        
-        count_zero_result = await self.get_count_zero(arguments)
-        max_time_result = await self.get_max_timer(arguments)
-        not_used_index_result = await self.get_not_used_index(arguments)
-
-        # 合并结果
-        combined_result = []
-        combined_result.extend(count_zero_result)
-        combined_result.extend(max_time_result)
-        combined_result.extend(not_used_index_result)
-
-        return combined_result
+        # 三项统计相互独立，并发执行；单项超时不影响其他结果返回
+        return await gather_probes([
+            ("获取冗余索引情况", self.get_count_zero(arguments)),
+            ("获取性能较差的索引情况", self.get_max_timer(arguments)),
+            ("获取未使用索引查询时间大于30秒的top5情况", self.get_not_used_index(arguments)),
+        ], get_settings().health["probe_timeout"])
 
     """
         获取冗余索引情况
@@ -58,14 +31,16 @@ class GetDBHealthIndexUsage(BaseHandler):
             sql = "SELECT object_schema, object_name, index_name, count_star from PERFORMANCE_SCHEMA.table_io_waits_summary_by_index_usage "
             sql += "WHERE count_star = 0 AND sum_timer_wait = 0"
             
+            params = []
             if database:
-                sql += f" AND object_schema = '{database}'"
+                sql += " AND object_schema = %s"
+                params.append(database)
             else:
                 sql += " AND object_schema NOT IN ('information_schema', 'performance_schema', 'mysql', 'sys')"
             
             sql += ";"
 
-            return await execute_sql.run_tool({"query": sql})
+            return await execute_sql.run_tool({"query": sql, "params": params})
         except Exception as e:
             return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
 
@@ -79,14 +54,16 @@ class GetDBHealthIndexUsage(BaseHandler):
             sql = "SELECT object_schema,object_name,index_name,(max_timer_wait / 1000000000000) max_timer_wait "
             sql += "FROM PERFORMANCE_SCHEMA.table_io_waits_summary_by_index_usage WHERE index_name is not null"
             
+            params = []
             if database:
-                sql += f" AND object_schema = '{database}'"
+                sql += " AND object_schema = %s"
+                params.append(database)
             else:
                 sql += " AND object_schema NOT IN ('information_schema', 'performance_schema', 'mysql', 'sys')"
             
             sql += " ORDER BY max_timer_wait DESC;"
 
-            return await execute_sql.run_tool({"query": sql})
+            return await execute_sql.run_tool({"query": sql, "params": params})
         except Exception as e:
             return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
 
@@ -100,13 +77,15 @@ class GetDBHealthIndexUsage(BaseHandler):
             sql = "SELECT object_schema,object_name, (max_timer_wait / 1000000000000) max_timer_wait "
             sql += "FROM PERFORMANCE_SCHEMA.table_io_waits_summary_by_index_usage WHERE index_name IS null and max_timer_wait > 30000000000000"
             
+            params = []
             if database:
-                sql += f" AND object_schema = '{database}'"
+                sql += " AND object_schema = %s"
+                params.append(database)
             else:
                 sql += " AND object_schema NOT IN ('information_schema', 'performance_schema', 'mysql', 'sys')"
             
             sql += " ORDER BY max_timer_wait DESC limit 5;"
 
-            return await execute_sql.run_tool({"query": sql})
+            return await execute_sql.run_tool({"query": sql, "params": params})
         except Exception as e:
             return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
\ No newline at end of file
@@ -1,9 +1,15 @@
+import json
 from typing import Dict, Any, Sequence
 
-from mcp import Tool
 from mcp.types import TextContent
 
-from .base import BaseHandler
+from config import get_settings
+from db import get_health_sampler, parse_innodb_status, run_blocking
+from db.health_sampler import SUMMARY_COLUMNS
+from db.innodb_status import normalize_sections
+from db.serializers import to_text
+from db.serializers import CsvWriter
+from .base import BaseHandler, gather_probes
 
 from handles import (
     ExecuteSQL
@@ -11,39 +17,57 @@ from handles import (
 
 execute_sql = ExecuteSQL()
 
+# 速率与趋势的默认统计窗口（分钟）
+DEFAULT_MINUTES = 5
+
 class GetDBHealthRunning(BaseHandler):
     name = "get_db_health_running"
-    description = (
-        "获取当前mysql的健康状态(Analyze MySQL health status )"
-    )
-
-    def get_tool_description(self) -> Tool:
-        return Tool(
-            name=self.name,
-            description=self.description,
-            inputSchema={
-                "type": "object",
-                "properties": {
-
-                }
-            }
-        )
 
     async def run_tool(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
-        lock_result = await self.get_lock(arguments)
-        processlist_result = await self.get_processlist(arguments)
-        status_result = await self.get_status(arguments)
-        trx_result = await self.get_trx(arguments)
-
-
-        # 合并结果
-        combined_result = []
-        combined_result.extend(processlist_result)
-        combined_result.extend(lock_result)
-        combined_result.extend(trx_result)
-        combined_result.extend(status_result)
+        """获取当前mysql的健康状态
+
+        参数:
+            minutes (float, 可选): 速率与趋势的统计窗口（分钟），默认为5
+            snapshot (bool, 可选): 是否同时查询连接、锁、事务和 InnoDB 状态的当前快照；
+                默认在没有后台采样数据时查询
+            sections (list[str], 可选): 快照中返回的 SHOW ENGINE INNODB STATUS 段落，
+                默认为 SEMAPHORES、LATEST DETECTED DEADLOCK、TRANSACTIONS、BUFFER POOL AND MEMORY、ROW OPERATIONS、LOG
+
+        返回:
+            list[TextContent]: 开启 MYSQL_HEALTH_SAMPLE_INTERVAL 且已有采样时，第一项为各指标的每秒速率与趋势，
+            之后为各项快照查询的结果
+        """
+        try:
+            minutes = arguments.get("minutes") or DEFAULT_MINUTES
+            if isinstance(minutes, bool) or not isinstance(minutes, (int, float)) or minutes <= 0:
+                raise ValueError("minutes 必须是正数")
+            snapshot = arguments.get("snapshot")
+            if not isinstance(snapshot, (bool, type(None))):
+                raise ValueError("snapshot 必须是布尔值")
+            sections = normalize_sections(arguments.get("sections"))
+        except ValueError as e:
+            return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
 
-        return combined_result
+        results = []
+        sampler = get_health_sampler()
+        # 启动时未开启、之后通过重新加载配置开启的采样在这里启动
+        sampler.start()
+        summary = sampler.summarize(minutes) if sampler.enabled else None
+        if summary is not None:
+            header, rows = summary
+            writer = CsvWriter(SUMMARY_COLUMNS)
+            writer.write_rows(rows)
+            results.append(TextContent(type="text", text=f"{header}\n{writer.getvalue()}"))
+        if snapshot is False or (snapshot is None and summary is not None):
+            return results
+
+        # 各项检查相互独立，并发执行；单项超时不影响其他结果返回
+        return results + await gather_probes([
+            ("获取连接情况", self.get_processlist(arguments)),
+            ("获取锁情况", self.get_lock(arguments)),
+            ("获取事务情况", self.get_trx(arguments)),
+            ("获取运行情况(SHOW ENGINE INNODB STATUS)", self.get_status(sections)),
+        ], get_settings().health["probe_timeout"])
 
     """
         获取连接情况
@@ -59,11 +83,15 @@ class GetDBHealthRunning(BaseHandler):
     """
         获取运行情况
     """
-    async def get_status(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+    async def get_status(self, sections: Sequence[str]) -> Sequence[TextContent]:
+        # 输出通常有几十到几百KB，只返回解析后的指标、活动事务和死锁的结构化信息，不返回原文
         try:
-            sql = "SHOW ENGINE INNODB STATUS;"
-
-            return await execute_sql.run_tool({"query": sql})
+            _, rows = await execute_sql.query("SHOW ENGINE INNODB STATUS",
+                                              timeout=get_settings().timeout["query_timeout"])
+            # 结果只有一行，Status 列为第三列
+            text = to_text(rows[0][2]) if rows and rows[0][2] is not None else ""
+            status = await run_blocking(parse_innodb_status, text, sections)
+            return [TextContent(type="text", text=json.dumps(status, ensure_ascii=False))]
         except Exception as e:
             return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
 
@@ -1,9 +1,9 @@
 from typing import Dict, Any, Sequence
 
-from mcp import Tool
 from mcp.types import TextContent
 
-from .base import BaseHandler
+from config import get_settings
+from .base import BaseHandler, gather_probes
 
 from handles import (
     ExecuteSQL
@@ -13,32 +13,13 @@ execute_sql = ExecuteSQL()
 
 class GetTableLock(BaseHandler):
     name = "get_table_lock"
-    description = (
-        "获取当前mysql服务器行级锁、表级锁情况(Check if there are row-level locks or table-level locks in the current MySQL server  )"
-    )
-
-    def get_tool_description(self) -> Tool:
-        return Tool(
-            name=self.name,
-            description=self.description,
-            inputSchema={
-                "type": "object",
-                "properties": {
-
-                }
-            }
-        )
 
     async def run_tool(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
-        use_result = await self.get_table_use(arguments)
-        lock_result = await self.get_table_lock(arguments)
-        
-        # 合并两个结果
-        combined_result = []
-        combined_result.extend(use_result)
-        combined_result.extend(lock_result)
-        
-        return combined_result
+        # 表级锁与行级锁查询相互独立，并发执行；单项超时不影响另一项返回
+        return await gather_probes([
+            ("获取表级锁情况", self.get_table_use(arguments)),
+            ("获取行级锁情况", self.get_table_lock(arguments)),
+        ], get_settings().health["probe_timeout"])
 
     """
         获取表级锁情况
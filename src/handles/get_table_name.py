@@ -1,40 +1,21 @@
 from typing import Dict, Any, Sequence
 
-from mcp import Tool
 from mcp.types import TextContent
 
 from .base import BaseHandler
+from db import MetadataCache, get_search_index, run_blocking
+from db.serializers import CsvWriter
 from handles import (
     ExecuteSQL
 )
 
+# 默认最多返回的表数量
+DEFAULT_LIMIT = 50
+
 
 class GetTableName(BaseHandler):
 
     name = "get_table_name"
-    description = (
-        "根据表注释、表描述搜索所有数据库中对应的表名"
-    )
-
-    def get_tool_description(self) -> Tool:
-        return Tool(
-            name=self.name,
-            description=self.description,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "text": {
-                        "type": "string",
-                        "description": "要搜索的表中文注释关键词"
-                    },
-                    "database": {
-                        "type": "string",
-                        "description": "可选：指定要搜索的数据库名称，如果不指定则搜索所有数据库"
-                    }
-                },
-                "required": ["text"]
-            }
-        )
 
     async def run_tool(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
             """根据表的注释搜索数据库中的表名
@@ -42,11 +23,14 @@ class GetTableName(BaseHandler):
             参数:
                 text (str): 要搜索的表中文注释关键词
                 database (str, 可选): 指定要搜索的数据库名称
+                limit (int, 可选): 最多返回的表数量
 
             返回:
                 list[TextContent]: 包含查询结果的TextContent列表
                 - 返回匹配的表名、数据库名和表注释信息
                 - 结果以CSV格式返回，包含列名和数据
+                - 搜索索引可用时按相关度排序，并列出命中的列和得分；
+                  索引首次构建完成前退回到按表注释 LIKE 查询
             """
             try:
                 if "text" not in arguments:
@@ -54,21 +38,40 @@ class GetTableName(BaseHandler):
 
                 text = arguments["text"]
                 database = arguments.get("database")
+                limit = arguments.get("limit") or DEFAULT_LIMIT
+                if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+                    raise ValueError("limit 必须是正整数")
+
+                index = get_search_index()
+                if await run_blocking(index.ensure_fresh):
+                    matches = await run_blocking(index.search, text, database, limit)
+                    writer = CsvWriter(["TABLE_SCHEMA", "TABLE_NAME", "TABLE_COMMENT", "MATCHED_COLUMNS", "SCORE"])
+                    writer.write_rows([
+                        (match.schema, match.table, match.table_comment, "; ".join(match.columns), match.score)
+                        for match in matches
+                    ])
+                    return [TextContent(type="text", text=writer.getvalue())]
 
                 execute_sql = ExecuteSQL()
 
-                sql = "SELECT TABLE_SCHEMA, TABLE_NAME, TABLE_COMMENT "
-                sql += "FROM information_schema.TABLES WHERE TABLE_COMMENT LIKE '%{}%'".format(text)
-                
+                # 与索引结果的列保持一致，未按列匹配、不计算得分
+                sql = "SELECT TABLE_SCHEMA, TABLE_NAME, TABLE_COMMENT, '' AS MATCHED_COLUMNS, NULL AS SCORE "
+                sql += "FROM information_schema.TABLES WHERE TABLE_COMMENT LIKE %s"
+                params = [f"%{text}%"]
+
                 # 如果指定了数据库，则只搜索该数据库
                 if database:
-                    sql += f" AND TABLE_SCHEMA = '{database}'"
+                    sql += " AND TABLE_SCHEMA = %s"
+                    params.append(database)
                 
                 # 排除系统数据库
                 sql += " AND TABLE_SCHEMA NOT IN ('information_schema', 'performance_schema', 'mysql', 'sys')"
-                sql += ";"
+                sql += " ORDER BY TABLE_SCHEMA, TABLE_NAME LIMIT %s;"
+                params.append(limit)
                 
-                return await execute_sql.run_tool({"query": sql})
+                # 表注释随DDL变化，缓存条目依赖整个库（table 为 None）
+                cache_key = MetadataCache.make_key("table_name", database, None, text, limit)
+                return await execute_sql.run_metadata_query(cache_key, sql, params)
 
             except Exception as e:
                 return [TextContent(type="text", text=f"执行查询时出错: {str(e)}")]
\ No newline at end of file
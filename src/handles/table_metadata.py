@@ -0,0 +1,164 @@
+from typing import Dict, List, Sequence, Tuple
+
+from mcp.types import TextContent
+from mysql.connector import Error
+
+from .base import BaseHandler
+from db import MetadataCache, get_metadata_cache
+from db.serializers import CsvWriter
+from handles import (
+    ExecuteSQL
+)
+
+# 系统数据库，未指定数据库时不在其中搜索
+SYSTEM_SCHEMAS = ('information_schema', 'performance_schema', 'mysql', 'sys')
+
+# 单条查询中最多包含的表数量，超出后分批查询
+METADATA_BATCH_SIZE = 500
+
+
+class TableMetadataHandler(BaseHandler):
+    """按表名查询 information_schema 的工具基类
+
+    所有请求的表合并为一次分组查询（表很多时按 METADATA_BATCH_SIZE 分批），
+    再在进程内按 information_schema 返回的库名、表名拆分为各自的结果，每张表的结果单独缓存。
+    该类没有 name，不会被注册为工具。
+    """
+    # 元数据缓存中的类别
+    metadata_kind: str = ""
+    # information_schema 中的来源表
+    source_table: str = ""
+    # 每张表输出的列
+    select_columns: Tuple[str, ...] = ()
+    # 每张表内部的排序列
+    order_columns: Tuple[str, ...] = ()
+    # 单张表查询出错时的提示
+    error_message: str = "查询表 '{table}' 时出错"
+
+    async def describe_tables(self, table_names: str) -> Sequence[TextContent]:
+        """查询多张表的元数据
+
+        参数:
+            table_names (str): 逗号分隔的表名，可以使用 database.table_name 格式
+
+        返回:
+            list[TextContent]: 按请求顺序每张表一个CSV结果
+        """
+        tables = [name.strip() for name in table_names.split(',')]
+        cache = get_metadata_cache()
+        execute_sql = ExecuteSQL()
+
+        texts: Dict[str, str] = {}
+        # (库名, 表名) / 表名 -> 请求中的原始写法；区分大小写，lower_case_table_names=0 时 Foo 与 foo 是两张表。
+        # 缓存键中的库名/表名是小写的（用于按DDL失效），因此再附上原始写法
+        qualified: Dict[Tuple[str, str], List[str]] = {}
+        unqualified: Dict[str, List[str]] = {}
+
+        for table in tables:
+            if table in texts:
+                continue
+            if '.' in table:
+                database, table_name = table.split('.', 1)
+                text = cache.get(MetadataCache.make_key(self.metadata_kind, database, table_name, database, table_name))
+                if text is None:
+                    qualified.setdefault((database, table_name), []).append(table)
+            else:
+                text = cache.get(MetadataCache.make_key(self.metadata_kind, None, table, table))
+                if text is None:
+                    unqualified.setdefault(table, []).append(table)
+            if text is not None:
+                texts[table] = text
+
+        generation = cache.generation
+        keys = list(qualified)
+        for start in range(0, len(keys), METADATA_BATCH_SIZE):
+            chunk = keys[start:start + METADATA_BATCH_SIZE]
+            try:
+                description, rows = await execute_sql.query(*self._qualified_query(chunk))
+                # 结果集前两列为 TABLE_SCHEMA, TABLE_NAME，输出时去掉
+                grouped = self._group(rows, lambda row: (row[0], row[1]), lambda row: row[2:])
+                for key in chunk:
+                    text = self._format(description[2:], self._rows_for(grouped, key, qualified))
+                    database, table_name = key
+                    cache.put(MetadataCache.make_key(self.metadata_kind, database, table_name, database, table_name),
+                              text, len(text.encode("utf-8")), generation)
+                    for table in qualified[key]:
+                        texts[table] = text
+            except Error as e:
+                for key in chunk:
+                    for table in qualified[key]:
+                        texts[table] = f"{self.error_message.format(table=table)}: {str(e)}"
+
+        names = list(unqualified)
+        for start in range(0, len(names), METADATA_BATCH_SIZE):
+            chunk = names[start:start + METADATA_BATCH_SIZE]
+            try:
+                description, rows = await execute_sql.query(*self._unqualified_query(chunk))
+                # 保留 TABLE_SCHEMA 列，去掉用于分组的 TABLE_NAME 列
+                grouped = self._group(rows, lambda row: row[1], lambda row: (row[0],) + tuple(row[2:]))
+                for name in chunk:
+                    text = self._format([description[0]] + list(description[2:]),
+                                        self._rows_for(grouped, name, unqualified))
+                    cache.put(MetadataCache.make_key(self.metadata_kind, None, name, name),
+                              text, len(text.encode("utf-8")), generation)
+                    for table in unqualified[name]:
+                        texts[table] = text
+            except Error as e:
+                for name in chunk:
+                    for table in unqualified[name]:
+                        texts[table] = f"{self.error_message.format(table=table)}: {str(e)}"
+
+        return [TextContent(type="text", text=texts[table]) for table in tables]
+
+    def _qualified_query(self, keys: List[Tuple[str, str]]) -> Tuple[str, list]:
+        """指定了数据库的表：按 (TABLE_SCHEMA, TABLE_NAME) 元组批量查询"""
+        sql = f"SELECT TABLE_SCHEMA, TABLE_NAME, {', '.join(self.select_columns)} "
+        sql += f"FROM information_schema.{self.source_table} "
+        sql += f"WHERE (TABLE_SCHEMA, TABLE_NAME) IN ({', '.join(['(%s, %s)'] * len(keys))}) "
+        sql += f"ORDER BY TABLE_SCHEMA, TABLE_NAME, {', '.join(self.order_columns)};"
+        params = [value for key in keys for value in key]
+        return sql, params
+
+    def _unqualified_query(self, names: List[str]) -> Tuple[str, list]:
+        """没有指定数据库的表：在所有数据库（排除系统数据库）中按表名批量查询"""
+        sql = f"SELECT TABLE_SCHEMA, TABLE_NAME, {', '.join(self.select_columns)} "
+        sql += f"FROM information_schema.{self.source_table} "
+        sql += f"WHERE TABLE_NAME IN ({', '.join(['%s'] * len(names))}) "
+        sql += f"AND TABLE_SCHEMA NOT IN ({', '.join(['%s'] * len(SYSTEM_SCHEMAS))}) "
+        sql += f"ORDER BY TABLE_NAME, TABLE_SCHEMA, {', '.join(self.order_columns)};"
+        return sql, list(names) + list(SYSTEM_SCHEMAS)
+
+    @staticmethod
+    def _group(rows, key_func, value_func) -> Dict:
+        grouped: Dict = {}
+        for row in rows:
+            grouped.setdefault(key_func(row), []).append(value_func(row))
+        return grouped
+
+    @staticmethod
+    def _rows_for(grouped: Dict, key, requested: Dict) -> list:
+        """取出请求的表对应的行
+
+        优先按 information_schema 返回的原始名称精确匹配；不区分大小写的服务器
+        （lower_case_table_names=1/2）返回的名称可能与请求的写法大小写不同，此时使用只有大小写不同、
+        且本身没有被请求的名称的行
+        """
+        if key in grouped:
+            return grouped[key]
+
+        def fold(value):
+            return tuple(part.lower() for part in value) if isinstance(value, tuple) else value.lower()
+
+        folded = fold(key)
+        rows: list = []
+        for name, group in grouped.items():
+            if name not in requested and fold(name) == folded:
+                rows.extend(group)
+        return rows
+
+    @staticmethod
+    def _format(description, rows) -> str:
+        writer = CsvWriter(description)
+        if rows:
+            writer.write_rows(rows)
+        return writer.getvalue()
@@ -1,24 +1,13 @@
 from typing import Dict, Any
 
 from mcp import GetPromptResult
-from mcp.types import Prompt, TextContent, PromptMessage
+from mcp.types import TextContent, PromptMessage
 
 from prompts.BasePrompt import BasePrompt
 
 
 class AnalysisMySqlIssues(BasePrompt):
     name = "analyzing-mysql-prompt"
-    description = (
-        "这是分析mysql相关问题的提示词"
-    )
-
-    def get_prompt(self) -> Prompt:
-        return Prompt(
-            name= self.name,
-            description= self.description,
-            arguments=[
-            ],
-        )
 
     async def run_prompt(self, arguments: Dict[str, Any]) -> GetPromptResult:
 
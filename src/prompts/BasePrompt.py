@@ -1,11 +1,41 @@
-from typing import ClassVar, Dict, Type, Any
+import importlib
+from typing import ClassVar, Dict, List, NamedTuple, Sequence, Type, Any
 
 from mcp import GetPromptResult
-from mcp.types import Prompt
+from mcp.types import Prompt, PromptArgument
+
+
+class PromptDescriptor(NamedTuple):
+    """prompt的轻量描述，列出prompt时不导入实现模块"""
+    name: str
+    # 实现所在的模块与类名
+    module: str
+    class_name: str
+    description: str
+    arguments: Sequence[PromptArgument] = ()
+
+    def to_prompt(self) -> Prompt:
+        return Prompt(name=self.name, description=self.description, arguments=list(self.arguments))
+
 
 class PromptRegistry:
     """prompt注册表，用于管理所有prompt实例"""
     _prompts: ClassVar[Dict[str, 'BasePrompt']] = {}
+    _descriptors: ClassVar[Dict[str, PromptDescriptor]] = {}
+
+    @classmethod
+    def declare(cls, descriptor: PromptDescriptor) -> None:
+        """登记prompt描述，不导入实现模块
+
+        Args:
+            descriptor: prompt描述
+        """
+        cls._descriptors[descriptor.name] = descriptor
+
+    @classmethod
+    def descriptors(cls) -> List[PromptDescriptor]:
+        """获取所有已登记的prompt描述"""
+        return list(cls._descriptors.values())
 
     @classmethod
     def register(cls, prompt_class: Type['BasePrompt']) -> Type['BasePrompt']:
@@ -34,6 +64,9 @@ class PromptRegistry:
         Raises:
             ValueError: 当prompt不存在时抛出
         """
+        if name not in cls._prompts and name in cls._descriptors:
+            # 第一次使用时才导入实现模块，模块中的prompt类定义时会自动注册
+            importlib.import_module(cls._descriptors[name].module)
         if name not in cls._prompts:
             raise ValueError(f"未知的prompt: {name}")
         return cls._prompts[name]
@@ -43,9 +76,11 @@ class PromptRegistry:
         """获取所有prompt的描述
 
         Returns:
-            所有prompt的描述列表
+            所有prompt的描述列表，已登记描述的prompt不会因此导入实现模块
         """
-        return [prompt.get_prompt() for prompt in cls._prompts.values()]
+        prompts = [descriptor.to_prompt() for descriptor in cls._descriptors.values()]
+        prompts.extend(prompt.get_prompt() for name, prompt in cls._prompts.items() if name not in cls._descriptors)
+        return prompts
 
 
 class BasePrompt:
@@ -59,7 +94,11 @@ class BasePrompt:
             PromptRegistry.register(cls)
 
     def get_prompt(self) -> Prompt:
-        raise NotImplementedError()
+        """默认使用登记的prompt描述，没有登记描述的prompt需要重写该方法"""
+        descriptor = PromptRegistry._descriptors.get(self.name)
+        if descriptor is None:
+            raise NotImplementedError()
+        return descriptor.to_prompt()
 
     async def run_prompt(self, arguments: Dict[str, Any]) -> GetPromptResult:
         raise NotImplementedError()
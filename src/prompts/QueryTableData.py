@@ -1,27 +1,13 @@
 from typing import Dict, Any
 
 from mcp import GetPromptResult
-from mcp.types import Prompt, TextContent, PromptMessage, PromptArgument
+from mcp.types import TextContent, PromptMessage
 
 from prompts.BasePrompt import BasePrompt
 
 
 class QueryTableData(BasePrompt):
     name = "query-table-data-prompt"
-    description = (
-        "这是通过调用工具查询表数据的提示词"
-    )
-
-    def get_prompt(self) -> Prompt:
-        return Prompt(
-            name= self.name,
-            description= self.description,
-            arguments=[
-                PromptArgument(
-                    name="desc", description="请输入需要查询的内容,为空时大模型会初始化为数据库助手"
-                )
-            ],
-        )
 
     async def run_prompt(self, arguments: Dict[str, Any]) -> GetPromptResult:
 
@@ -1,7 +1,20 @@
-from .AnalysisMySqlIssues import AnalysisMySqlIssues
-from .QueryTableData import QueryTableData
+import importlib
+from typing import Any
+
+# 导入描述模块时登记全部prompt，实现模块在第一次使用时才导入
+from prompts.descriptors import PROMPT_DESCRIPTORS
 
 __all__ = [
     "AnalysisMySqlIssues",
     "QueryTableData",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    """按需导入prompt类，导入 prompts 时不加载各prompt的实现模块"""
+    for descriptor in PROMPT_DESCRIPTORS:
+        if descriptor.class_name == name:
+            value = getattr(importlib.import_module(descriptor.module), name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,27 @@
+"""各prompt的名称、说明与参数，列出prompt时只读取这里的描述，不导入实现模块"""
+from mcp.types import PromptArgument
+
+from prompts.BasePrompt import PromptDescriptor, PromptRegistry
+
+PROMPT_DESCRIPTORS = (
+    PromptDescriptor(
+        name="analyzing-mysql-prompt",
+        module="prompts.AnalysisMySqlIssues",
+        class_name="AnalysisMySqlIssues",
+        description="这是分析mysql相关问题的提示词",
+    ),
+    PromptDescriptor(
+        name="query-table-data-prompt",
+        module="prompts.QueryTableData",
+        class_name="QueryTableData",
+        description="这是通过调用工具查询表数据的提示词",
+        arguments=(
+            PromptArgument(
+                name="desc", description="请输入需要查询的内容,为空时大模型会初始化为数据库助手"
+            ),
+        ),
+    ),
+)
+
+for _descriptor in PROMPT_DESCRIPTORS:
+    PromptRegistry.declare(_descriptor)
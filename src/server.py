@@ -1,17 +1,17 @@
 import asyncio
-import uvicorn
+import contextlib
 
 from typing import Sequence, Dict, Any
-from mcp.server.sse import SseServerTransport
 
 from mcp.server import Server
 from mcp.types import Tool, TextContent, Prompt, GetPromptResult
 
-from starlette.applications import Starlette
-from starlette.routing import Route, Mount
-
+# 传输层（uvicorn、starlette、SSE）只在对应的启动模式中导入；工具和prompt的实现模块在第一次调用时才导入
+from config import get_server_config, get_settings, install_reload_triggers
 from handles.base import ToolRegistry
 from prompts.BasePrompt import PromptRegistry
+from utils import get_metrics, install_dump_signal
+from utils.metrics import CONTENT_TYPE
 
 # 初始化服务器
 app = Server("operateMysql")
@@ -67,9 +67,8 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[TextConten
     Raises:
         ValueError: 当指定了未知的工具名称时抛出异常
     """
-    tool = ToolRegistry.get_tool(name)
-
-    return await tool.run_tool(arguments)
+    # 记录调用次数、出错次数和耗时，通过 /metrics 或 SIGUSR1 查看
+    return await ToolRegistry.call_tool(name, arguments)
 
 
 async def run_stdio():
@@ -93,12 +92,49 @@ async def run_stdio():
             print(f"服务器错误: {str(e)}")
             raise
 
-def run_sse():
-    """运行SSE(Server-Sent Events)模式的服务器
-    
-    启动一个支持SSE的Web服务器，允许客户端通过HTTP长连接接收服务器推送的消息
-    服务器默认监听0.0.0.0:9000
+def start_health_sampler():
+    """开启 MYSQL_HEALTH_SAMPLE_INTERVAL 时启动后台健康状态采样
+
+    未开启时不导入数据库模块；之后通过重新加载配置开启的，在下一次调用健康检查工具时启动。
+    配置不合法时不启动，错误在调用工具时返回
+    """
+    try:
+        enabled = get_settings().health["sample_interval"] > 0
+    except Exception:
+        return
+    if enabled:
+        from db import get_health_sampler
+
+        get_health_sampler().start()
+
+
+@contextlib.asynccontextmanager
+async def _worker_lifespan(starlette_app):
+    """HTTP 模式下每个工作进程启动时安装配置重新加载和指标输出的触发方式，多个工作进程各自采样"""
+    install_reload_triggers()
+    install_dump_signal()
+    start_health_sampler()
+    yield
+
+
+async def handle_metrics(request):
+    """以 Prometheus 文本格式返回当前进程的指标"""
+    from starlette.responses import Response
+
+    return Response(get_metrics().render(), media_type=CONTENT_TYPE)
+
+
+def create_sse_app():
+    """创建SSE(Server-Sent Events)模式的应用
+
+    SSE 会话保存在当前进程的 SseServerTransport 中，后续的 /messages/ 请求必须回到同一进程，
+    因此只能以单个进程运行
     """
+    from mcp.server.sse import SseServerTransport
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Route, Mount
+
     sse = SseServerTransport("/messages/")
 
     async def handle_sse(request):
@@ -111,15 +147,81 @@ def run_sse():
                 request.scope, request.receive, request._send
         ) as streams:
             await app.run(streams[0], streams[1], app.create_initialization_options())
+        # 连接断开后返回空响应，Route 要求端点返回响应对象
+        return Response()
 
-    starlette_app = Starlette(
-        debug=True,
+    return Starlette(
+        debug=get_server_config()["debug"],
         routes=[
             Route("/sse", endpoint=handle_sse),
-            Mount("/messages/", app=sse.handle_post_message)
+            Mount("/messages/", app=sse.handle_post_message),
+            Route("/metrics", endpoint=handle_metrics),
         ],
+        lifespan=_worker_lifespan,
     )
-    uvicorn.run(starlette_app, host="0.0.0.0", port=9000)
+
+
+def create_http_app():
+    """创建无状态 streamable HTTP 模式的应用
+
+    每个请求独立处理，进程内不保存会话状态，请求可以由任意工作进程或任意实例处理，
+    因此可以启动多个工作进程，或在负载均衡后部署多个实例
+    """
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.routing import Mount, Route
+
+    # 工具调用不发送进度通知，直接返回JSON响应，不需要为每个请求保持SSE流
+    session_manager = StreamableHTTPSessionManager(app=app, event_store=None, json_response=True, stateless=True)
+
+    async def handle_streamable_http(scope, receive, send):
+        await session_manager.handle_request(scope, receive, send)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(starlette_app):
+        async with _worker_lifespan(starlette_app), session_manager.run():
+            yield
+
+    return Starlette(
+        debug=get_server_config()["debug"],
+        routes=[
+            Mount("/mcp", app=handle_streamable_http),
+            # 多个工作进程时，每次抓取由其中一个进程返回它自己的指标
+            Route("/metrics", endpoint=handle_metrics),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def run_sse():
+    """运行SSE(Server-Sent Events)模式的服务器
+    
+    启动一个支持SSE的Web服务器，允许客户端通过HTTP长连接接收服务器推送的消息
+    监听地址由 MYSQL_MCP_HOST、MYSQL_MCP_PORT 指定，默认为0.0.0.0:9000
+    """
+    import uvicorn
+
+    config = get_server_config()
+    if config["workers"] > 1:
+        print("SSE 模式的会话保存在单个进程中，忽略 MYSQL_MCP_WORKERS；需要多个工作进程时请使用 --http 模式")
+    uvicorn.run(create_sse_app(), host=config["host"], port=config["port"])
+
+
+def run_http():
+    """运行无状态 streamable HTTP 模式的服务器
+
+    MCP 端点为 /mcp/，按 MYSQL_MCP_WORKERS 启动多个工作进程。每个工作进程有各自的连接池和缓存，
+    数据库连接总数最多为 工作进程数 × MYSQL_POOL_MAX_SIZE
+    """
+    import uvicorn
+
+    config = get_server_config()
+    if config["workers"] > 1:
+        # 多进程时 uvicorn 在每个工作进程中按导入路径重新创建应用
+        uvicorn.run("server:create_http_app", factory=True,
+                    host=config["host"], port=config["port"], workers=config["workers"])
+    else:
+        uvicorn.run(create_http_app(), host=config["host"], port=config["port"])
 
 
 if __name__ == "__main__":
@@ -128,7 +230,15 @@ if __name__ == "__main__":
     # 根据命令行参数选择启动模式
     if len(sys.argv) > 1 and sys.argv[1] == "--stdio":
         # 标准输入输出模式
+        # 配置在启动时加载一次，之后通过 SIGHUP 或 .env 修改触发重新加载；HTTP 模式在各工作进程启动时安装
+        install_reload_triggers()
+        # 标准输出用于 MCP 协议，收到 SIGUSR1 时将指标写到标准错误
+        install_dump_signal()
+        start_health_sampler()
         asyncio.run(run_stdio())
+    elif len(sys.argv) > 1 and sys.argv[1] == "--http":
+        # 无状态 streamable HTTP 模式，支持多个工作进程
+        run_http()
     else:
         # 默认 SSE 模式
         run_sse()
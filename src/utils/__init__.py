@@ -0,0 +1,14 @@
+from .pinyin import initials, initials_list, initials_mapping, word_initials
+from .metrics import Metrics, get_metrics, install_dump_signal
+from . import tracing
+
+__all__ = [
+    "initials",
+    "initials_list",
+    "initials_mapping",
+    "word_initials",
+    "Metrics",
+    "get_metrics",
+    "install_dump_signal",
+    "tracing",
+]
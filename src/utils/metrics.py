@@ -0,0 +1,207 @@
+import signal
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Prometheus 文本格式的 Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 耗时直方图的桶上限（秒），覆盖从命中缓存的调用到慢查询
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+PREFIX = "mysql_mcp"
+
+Collector = Callable[[], Optional[Dict[str, Any]]]
+
+
+class Histogram:
+    """固定桶的耗时直方图，调用方负责加锁"""
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        # 最后一个元素为超过全部桶上限的次数
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class _ToolStats:
+    __slots__ = ("calls", "errors", "response_bytes", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.response_bytes = 0
+        self.latency = Histogram()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+
+class Metrics:
+    """进程内的调用指标
+
+    记录各工具的调用次数、出错次数、耗时分布和返回字节数，各输出格式序列化的行数与字节数，
+    以及语句在服务器上的执行耗时；连接池、缓存等模块通过 register_collector 注册各自的统计，
+    输出时才读取。多个工作进程时每个进程各自统计。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: Dict[str, _ToolStats] = {}
+        self._statements: Dict[str, Histogram] = {}
+        # 输出格式 -> [行数, 字节数]
+        self._serialized: Dict[str, List[int]] = {}
+        self._collectors: Dict[str, Tuple[Collector, FrozenSet[str]]] = {}
+        self.started_at = time.time()
+
+    def observe_call(self, tool: str, seconds: float, error: bool, response_bytes: int) -> None:
+        """记录一次工具调用
+
+        参数:
+            tool (str): 工具名称
+            seconds (float): 调用耗时（秒）
+            error (bool): 调用是否出错（抛出异常或返回错误信息）
+            response_bytes (int): 返回文本的字节数
+        """
+        with self._lock:
+            stats = self._tools.get(tool)
+            if stats is None:
+                stats = self._tools[tool] = _ToolStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.response_bytes += response_bytes
+            stats.latency.observe(seconds)
+
+    def observe_statement(self, operation: str, seconds: float) -> None:
+        """记录一条语句在服务器上的执行耗时（从发送语句到开始返回结果），按操作类型分组"""
+        with self._lock:
+            histogram = self._statements.get(operation)
+            if histogram is None:
+                histogram = self._statements[operation] = Histogram()
+            histogram.observe(seconds)
+
+    def record_serialized(self, output_format: str, rows: int, size: int) -> None:
+        """记录按某种输出格式序列化的行数与字节数"""
+        with self._lock:
+            totals = self._serialized.get(output_format)
+            if totals is None:
+                totals = self._serialized[output_format] = [0, 0]
+            totals[0] += rows
+            totals[1] += size
+
+    def register_collector(self, name: str, collect: Collector, counters: Iterable[str] = ()) -> None:
+        """注册输出时读取的统计
+
+        参数:
+            name (str): 指标名中的分组，如 "pool" 输出为 mysql_mcp_pool_<键>
+            collect (callable): 返回 {键: 数值} 的函数，返回None时不输出（如连接池尚未创建）
+            counters (Iterable[str]): 只增不减的键，输出为 counter 类型并加上 _total 后缀，其余为 gauge
+        """
+        with self._lock:
+            self._collectors[name] = (collect, frozenset(counters))
+
+    def render(self) -> str:
+        """按 Prometheus 文本格式输出全部指标"""
+        with self._lock:
+            tools = {name: (stats.calls, stats.errors, stats.response_bytes,
+                            list(stats.latency.counts), stats.latency.count, stats.latency.sum)
+                     for name, stats in sorted(self._tools.items())}
+            statements = {name: (list(h.counts), h.count, h.sum) for name, h in sorted(self._statements.items())}
+            serialized = {name: tuple(totals) for name, totals in sorted(self._serialized.items())}
+            collectors = list(self._collectors.items())
+
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: Iterable[Tuple[str, Dict[str, str], float]]):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{PREFIX}_{name}{suffix}{_labels(labels)} {_number(value)}")
+
+        def histogram(label: str, key: str, counts: List[int], count: int, total: float):
+            cumulative = 0
+            for bound, bucket in zip(LATENCY_BUCKETS, counts):
+                cumulative += bucket
+                yield "_bucket", {label: key, "le": repr(float(bound))}, cumulative
+            yield "_bucket", {label: key, "le": "+Inf"}, count
+            yield "_sum", {label: key}, total
+            yield "_count", {label: key}, count
+
+        family("uptime_seconds", "gauge", "Seconds since the metrics registry was created",
+               [("", {}, time.time() - self.started_at)])
+        family("tool_calls_total", "counter", "Tool calls",
+               [("", {"tool": name}, calls) for name, (calls, *_rest) in tools.items()])
+        family("tool_errors_total", "counter", "Tool calls that raised or returned an error message",
+               [("", {"tool": name}, values[1]) for name, values in tools.items()])
+        family("tool_response_bytes_total", "counter", "UTF-8 bytes of text returned by tools",
+               [("", {"tool": name}, values[2]) for name, values in tools.items()])
+        family("tool_duration_seconds", "histogram", "Tool call latency measured around run_tool",
+               [sample for name, values in tools.items() for sample in histogram("tool", name, *values[3:])])
+        family("statement_execute_seconds", "histogram",
+               "Time from sending a statement to the first result packet, by leading keyword",
+               [sample for name, values in statements.items() for sample in histogram("operation", name, *values)])
+        family("serialized_rows_total", "counter", "Result rows serialized, by output format",
+               [("", {"format": name}, rows) for name, (rows, _size) in serialized.items()])
+        family("serialized_bytes_total", "counter", "Result bytes serialized, by output format",
+               [("", {"format": name}, size) for name, (_rows, size) in serialized.items()])
+
+        for group, (collect, counters) in collectors:
+            try:
+                values = collect()
+            except Exception:
+                values = None
+            for key, value in (values or {}).items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if not isinstance(value, (int, float)):
+                    continue
+                if key in counters:
+                    family(f"{group}_{key}_total", "counter", f"{group} {key}", [("", {}, value)])
+                else:
+                    family(f"{group}_{key}", "gauge", f"{group} {key}", [("", {}, value)])
+        return "\n".join(lines) + "\n"
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """获取进程内的全局指标"""
+    return _metrics
+
+
+def _dump() -> None:
+    try:
+        sys.stderr.write(_metrics.render())
+        sys.stderr.flush()
+    except Exception:
+        pass
+
+
+def install_dump_signal() -> None:
+    """收到 SIGUSR1 时将全部指标以 Prometheus 文本格式写到标准错误
+
+    stdio 模式下标准输出用于 MCP 协议，不能输出指标；仅限支持该信号的平台，需在主线程调用
+    """
+    if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+        # 信号处理函数中只启动线程，避免在任意位置被打断的主线程里持锁
+        signal.signal(signal.SIGUSR1, lambda signum, frame: threading.Thread(target=_dump, daemon=True).start())
@@ -0,0 +1,92 @@
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional
+
+# 按词缓存转换结果的数量上限；字段名、表名和注释的重复率很高，命中后不再查拼音词典
+WORD_CACHE_SIZE = 65536
+
+_convert: Optional[Callable[[str], List[List[str]]]] = None
+_load_lock = threading.Lock()
+
+
+def _converter() -> Callable[[str], List[List[str]]]:
+    """首次使用时才导入 pypinyin，导入时会加载完整的拼音词典，耗时数百毫秒"""
+    global _convert
+    if _convert is None:
+        with _load_lock:
+            if _convert is None:
+                from pypinyin import pinyin, Style
+
+                _convert = lambda word: pinyin(word, style=Style.FIRST_LETTER)  # noqa: E731
+    return _convert
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def word_initials(word: str) -> str:
+    """获取单个词的拼音首字母，结果按词缓存
+
+    参数:
+        word (str): 要转换的词，如 "用户名"
+
+    返回:
+        str: 大写的拼音首字母，如 "YHM"；连续的非汉字字符原样保留并转为大写
+    """
+    return "".join(part[0].upper() for part in _converter()(word))
+
+
+def initials(text: str) -> str:
+    """获取文本的小写拼音首字母，汉字转换为首字母，字母数字原样保留（转为小写），其他字符丢弃
+
+    参数:
+        text (str): 要转换的文本，如 "用户表"
+
+    返回:
+        str: 拼音首字母，如 "yhb"
+    """
+    return "".join(ch for ch in word_initials(text).lower() if ch.isalnum())
+
+
+def _unique(value: str, used: set) -> str:
+    """与已使用的结果重复时追加 _2、_3 等后缀"""
+    base, suffix = value, 1
+    while value in used:
+        suffix += 1
+        value = f"{base}_{suffix}"
+    used.add(value)
+    return value
+
+
+def initials_mapping(words: Iterable[str], dedupe: bool = False) -> Dict[str, str]:
+    """批量获取多个词的拼音首字母
+
+    参数:
+        words (Iterable[str]): 要转换的词，重复的词只转换一次
+        dedupe (bool): 为 True 时，不同的词得到相同首字母的按出现顺序追加 _2、_3 等后缀，
+            保证结果互不相同，可直接用作字段名；相同的词共用一个结果
+
+    返回:
+        dict: 词到首字母的映射，按首次出现的顺序排列
+    """
+    mapping: Dict[str, str] = {}
+    used: set = set()
+    for word in words:
+        if word in mapping:
+            continue
+        value = word_initials(word)
+        mapping[word] = _unique(value, used) if dedupe else value
+    return mapping
+
+
+def initials_list(words: Iterable[str], dedupe: bool = False) -> List[str]:
+    """按位置获取多个词的拼音首字母
+
+    参数:
+        words (Iterable[str]): 要转换的词，重复的词只查一次缓存
+        dedupe (bool): 为 True 时，与前面的结果重复的（包括相同的词）依次追加 _2、_3 等后缀
+
+    返回:
+        list[str]: 与 words 一一对应的首字母
+    """
+    used: set = set()
+    values = [word_initials(word) for word in words]
+    return [_unique(value, used) for value in values] if dedupe else values
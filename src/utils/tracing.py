@@ -0,0 +1,371 @@
+import atexit
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+# 慢调用日志中最多记录的语句数，批量执行大量语句时只记录前面的部分
+MAX_STATEMENTS = 20
+# 语句指纹的最大长度，超出部分截断
+FINGERPRINT_MAX_LENGTH = 1000
+
+# 指纹中保留反引号标识符，字符串、数字和十六进制字面量替换为 ?，连续空白压缩为一个空格
+_FINGERPRINT_TOKEN = re.compile(
+    r"(`(?:[^`]|``)*`)"
+    r"|'(?:[^'\\]|\\[\s\S]|'')*'|\"(?:[^\"\\]|\\[\s\S]|\"\")*\""
+    r"|\b0x[0-9A-Fa-f]+\b|\b\d+(?:\.\d*)?(?:[eE][-+]?\d+)?\b"
+    r"|(\s+)"
+)
+# IN (?, ?, ?) 与多行 VALUES (?, ?), (?, ?) 不论个数得到相同的指纹
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUE_ROWS = re.compile(r"(\(\?\+?\))(?:\s*,\s*\(\?\+?\))+")
+
+_current: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("mysql_mcp_trace", default=None)
+
+_log_lock = threading.Lock()
+# 日志由后台线程写出，慢速磁盘或网络文件系统不会阻塞事件循环
+_pending: "queue.SimpleQueue" = queue.SimpleQueue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+# cProfile 在同一时刻只能有一个分析器处于开启状态，拿不到时该段不分析
+_cprofile_lock = threading.Lock()
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def fingerprint(code: str) -> str:
+    """计算语句指纹：去掉字面量后的语句文本，参数不同的同一语句得到相同的指纹
+
+    参数:
+        code (str): 去掉注释后的语句，见 Statement.code
+
+    返回:
+        str: 如 SELECT * FROM t WHERE id = ? AND name IN (?+)
+    """
+    def replace(match):
+        if match.group(1):
+            return match.group(1)
+        return " " if match.group(2) else "?"
+
+    text = _FINGERPRINT_TOKEN.sub(replace, code).strip()
+    text = _VALUE_ROWS.sub(r"\1, ...", _VALUE_LIST.sub("(?+)", text))
+    return text[:FINGERPRINT_MAX_LENGTH]
+
+
+class _CallProfiler:
+    """用 cProfile 分析调用期间在线程池中执行的数据库操作"""
+    mode = "cprofile"
+
+    def __init__(self):
+        # 分析器模块只在开启分析时导入，不增加启动耗时
+        import cProfile
+        self.profile = cProfile.Profile()
+
+    def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # 并发的子查询（如 gather_probes）与其他被分析的调用同时运行时，只分析先拿到锁的一段
+        if not _cprofile_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+        try:
+            self.profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.profile.disable()
+        finally:
+            _cprofile_lock.release()
+
+    def stop(self, top: int) -> Dict[str, Any]:
+        self.profile.create_stats()
+        entries = sorted(self.profile.stats.items(), key=lambda item: -item[1][3])[:top]
+        return {"top": [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "self_ms": round(inline * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for (filename, line, name), (_primitive, calls, inline, cumulative, _callers) in entries
+        ]}
+
+
+class _MemoryProfiler:
+    """用 tracemalloc 统计调用期间新增的内存分配
+
+    tracemalloc 对整个进程生效，并发的调用分配的内存也会计入
+    """
+    mode = "tracemalloc"
+
+    def __init__(self):
+        global _tracemalloc_users
+        import tracemalloc
+        self.tracemalloc = tracemalloc
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            _tracemalloc_users += 1
+        tracemalloc.reset_peak()
+        self.before = tracemalloc.take_snapshot()
+
+    def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return func(*args, **kwargs)
+
+    def stop(self, top: int) -> Dict[str, Any]:
+        global _tracemalloc_users
+        tracemalloc = self.tracemalloc
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        with _tracemalloc_lock:
+            _tracemalloc_users -= 1
+            if _tracemalloc_users == 0:
+                tracemalloc.stop()
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        stats = after.filter_traces(ignore).compare_to(self.before.filter_traces(ignore), "lineno")[:top]
+        return {
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "top": [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_diff": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats
+            ],
+        }
+
+
+PROFILERS = {profiler.mode: profiler for profiler in (_CallProfiler, _MemoryProfiler)}
+
+
+class Trace:
+    """一次工具调用的分阶段耗时
+
+    阶段耗时按名称累加：同一调用中多条语句的 execute、多个批次的 fetch 合计为一项；
+    并发执行的子查询各自计时，合计可能超过调用的总耗时
+    """
+    __slots__ = ("tool", "config", "profiler", "phases", "statements", "statement_count", "token", "_lock")
+
+    def __init__(self, tool: str, config: Dict[str, Any], profiler=None):
+        self.tool = tool
+        self.config = config
+        self.profiler = profiler
+        self.phases: Dict[str, float] = {}
+        self.statements: List[str] = []
+        self.statement_count = 0
+        self.token = None
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def note_statement(self, code: str) -> None:
+        with self._lock:
+            self.statement_count += 1
+            if len(self.statements) < MAX_STATEMENTS:
+                self.statements.append(code)
+
+
+class _Span:
+    __slots__ = ("trace", "phase", "started")
+
+    def __init__(self, trace: Trace, phase: str):
+        self.trace = trace
+        self.phase = phase
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.add(self.phase, time.perf_counter() - self.started)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(phase: str):
+    """记录一个阶段耗时的上下文管理器，当前调用未开启跟踪时不计时
+
+    参数:
+        phase (str): 阶段名称，如 connect、execute、fetch
+    """
+    trace = _current.get()
+    return _NO_SPAN if trace is None else _Span(trace, phase)
+
+
+def record(phase: str, seconds: float) -> None:
+    """将调用方已测量的耗时计入当前调用的阶段"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(phase, seconds)
+
+
+def note_statement(code: str) -> None:
+    """记录当前调用执行的语句，慢调用日志中输出其指纹"""
+    trace = _current.get()
+    if trace is not None:
+        trace.note_statement(code)
+
+
+def profiled(func: Callable[..., Any]) -> Callable[..., Any]:
+    """当前调用开启 cProfile 分析时，返回在分析器下执行 func 的函数，否则原样返回
+
+    由 run_blocking 在提交到线程池之前调用
+    """
+    trace = _current.get()
+    if trace is None or trace.profiler is None:
+        return func
+    return functools.partial(trace.profiler.run, func)
+
+
+def begin(tool: str) -> Optional[Trace]:
+    """开始跟踪一次工具调用
+
+    未设置慢调用阈值且该工具未开启分析时返回None，不产生额外开销；
+    配置在每次调用时读取，重新加载 .env 后对之后的调用生效。配置无效（如缺少数据库凭据）时
+    视为未开启跟踪，不需要数据库的工具仍可调用
+
+    参数:
+        tool (str): 工具名称
+
+    返回:
+        Trace: 当前调用的跟踪，需在调用结束后传给 end
+    """
+    # 在这里导入，列出工具时不加载配置模块
+    from config import get_settings
+
+    try:
+        config = get_settings().tracing
+    except ValueError:
+        return None
+    tools = config["profile_tools"]
+    profiler = None
+    if (tool in tools or "*" in tools) and random.random() < config["profile_sample_rate"]:
+        profiler = PROFILERS[config["profile_mode"]]()
+    if not config["slow_call_threshold"] and profiler is None:
+        return None
+    trace = Trace(tool, config, profiler)
+    trace.token = _current.set(trace)
+    return trace
+
+
+def end(trace: Trace, seconds: float, error: bool) -> None:
+    """结束跟踪，耗时达到阈值时输出慢调用日志，开启分析时输出分析结果
+
+    在事件循环中调用；计算语句指纹、汇总分析结果和写日志都交给后台线程
+
+    参数:
+        trace (Trace): begin 返回的跟踪
+        seconds (float): 调用的总耗时（秒）
+        error (bool): 调用是否出错
+    """
+    _current.reset(trace.token)
+    config = trace.config
+    threshold = config["slow_call_threshold"]
+    base = {
+        "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "pid": os.getpid(),
+        "tool": trace.tool,
+        "elapsed_ms": round(seconds * 1000, 3),
+        "error": error,
+    }
+    if threshold and seconds >= threshold:
+        _submit(functools.partial(_slow_call_record, trace, base, threshold), config["slow_call_log"])
+    if trace.profiler is not None:
+        _submit(functools.partial(_profile_record, trace, base), config["slow_call_log"])
+
+
+def _slow_call_record(trace: Trace, base: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+    with trace._lock:
+        phases = dict(trace.phases)
+        statements = list(trace.statements)
+        statement_count = trace.statement_count
+    record_line = dict(base, event="slow_call", threshold_ms=round(threshold * 1000, 3))
+    record_line["phases_ms"] = {phase: round(value * 1000, 3) for phase, value in phases.items()}
+    record_line["statements"] = []
+    for code in statements:
+        text = fingerprint(code)
+        record_line["statements"].append({
+            "fingerprint": text,
+            "digest": hashlib.sha1(text.encode("utf-8")).hexdigest()[:16],
+        })
+    record_line["statement_count"] = statement_count
+    return record_line
+
+
+def _profile_record(trace: Trace, base: Dict[str, Any]) -> Dict[str, Any]:
+    record_line = dict(base, event="profile", mode=trace.profiler.mode)
+    record_line.update(trace.profiler.stop(trace.config["profile_top"]))
+    return record_line
+
+
+def _submit(build: Callable[[], Dict[str, Any]], path: str) -> None:
+    """将一条日志交给后台线程生成并写出，首次调用时启动该线程"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_loop, name="trace-writer", daemon=True)
+                _writer.start()
+    _pending.put((build, path))
+
+
+def _write_loop() -> None:
+    while True:
+        _emit(*_pending.get())
+
+
+@atexit.register
+def _drain() -> None:
+    """进程退出前写出尚未写出的日志"""
+    while True:
+        try:
+            item = _pending.get_nowait()
+        except queue.Empty:
+            return
+        _emit(*item)
+
+
+def _emit(build: Callable[[], Dict[str, Any]], path: str) -> None:
+    try:
+        record_line = build()
+    except Exception as e:
+        print(f"生成慢调用日志失败: {str(e)}", file=sys.stderr)
+        return
+    _write(record_line, path)
+
+
+def _write(record_line: Dict[str, Any], path: str) -> None:
+    """输出一行JSON；stdio 模式下标准输出用于 MCP 协议，默认写到标准错误"""
+    line = json.dumps(record_line, ensure_ascii=False, default=str) + "\n"
+    try:
+        with _log_lock:
+            if path:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            else:
+                sys.stderr.write(line)
+                sys.stderr.flush()
+    except OSError as e:
+        print(f"写入慢调用日志失败: {str(e)}", file=sys.stderr)
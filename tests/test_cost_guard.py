@@ -0,0 +1,131 @@
+"""成本检查：EXPLAIN FORMAT=JSON 的行数与成本估算及 LIMIT 注入"""
+import json
+
+import pytest
+
+from db.cost_guard import PlanEstimate, describe, exceeds, has_effective_limit, inject_limit, parse_explain_json
+
+
+def table(name, rows, access_type="ALL", produced=None, **extra):
+    node = {"table_name": name, "access_type": access_type, "rows_examined_per_scan": rows}
+    if produced is not None:
+        node["rows_produced_per_join"] = produced
+    node.update(extra)
+    return {"table": node}
+
+
+def explain(query_block):
+    return json.dumps({"query_block": query_block})
+
+
+def plan(rows=0.0, cost=0.0, blocking=False):
+    return PlanEstimate(rows, cost, (), blocking)
+
+
+def test_single_table_scan():
+    estimate = parse_explain_json(explain({"cost_info": {"query_cost": "101.50"}, **table("t", 1000)}))
+    assert estimate.rows_examined == 1000
+    assert estimate.cost == 101.5
+    assert not estimate.blocking
+    assert estimate.worst_table.table == "t"
+
+
+def test_nested_loop_multiplies_by_driving_rows():
+    estimate = parse_explain_json(explain({
+        "cost_info": {"query_cost": "5000"},
+        "nested_loop": [
+            table("a", 100, produced=50),
+            table("b", 10, "ref", produced=500),
+            table("c", 2, "eq_ref"),
+        ],
+    }))
+    # rows_produced_per_join 是连接到该表为止的累计行数：b 被驱动 50 次，c 被驱动 500 次
+    assert [t.rows_examined for t in estimate.tables] == [100, 500, 1000]
+    assert estimate.rows_examined == 1600
+    assert estimate.worst_table.table == "c"
+
+
+def test_mariadb_rows_field_is_accepted():
+    estimate = parse_explain_json(explain({"table": {"table_name": "t", "access_type": "ALL", "rows": 42}}))
+    assert estimate.rows_examined == 42
+
+
+def test_filesort_and_temporary_table_are_blocking():
+    ordered = explain({"ordering_operation": {"using_filesort": True, **table("t", 10)}})
+    grouped = explain({"grouping_operation": {"using_temporary_table": True, **table("t", 10)}})
+    assert parse_explain_json(ordered).blocking
+    assert parse_explain_json(grouped).blocking
+    # 嵌套在排序节点内的表仍然计入
+    assert parse_explain_json(ordered).rows_examined == 10
+
+
+def test_union_costs_are_summed():
+    estimate = parse_explain_json(explain({"union_result": {"query_specifications": [
+        {"query_block": {"cost_info": {"query_cost": "10"}, **table("a", 5)}},
+        {"query_block": {"cost_info": {"query_cost": "20"}, **table("b", 7)}},
+    ]}}))
+    assert estimate.cost == 30
+    assert estimate.rows_examined == 12
+
+
+@pytest.mark.parametrize("text", ["not json", "[]", json.dumps({"plan": {}}), None])
+def test_unparseable_output_returns_none(text):
+    assert parse_explain_json(text) is None
+
+
+@pytest.mark.parametrize("rows, cost, max_rows, max_cost, expected", [
+    (1000, 10, 0, 0, False),
+    (1000, 10, 999, 0, True),
+    (1000, 10, 1000, 0, False),
+    (1000, 10, 0, 9.5, True),
+    (1000, 10, 2000, 20, False),
+])
+def test_exceeds_treats_zero_as_unlimited(rows, cost, max_rows, max_cost, expected):
+    assert exceeds(plan(rows, cost), max_rows, max_cost) is expected
+
+
+@pytest.mark.parametrize("code, blocking, expected", [
+    ("SELECT * FROM t LIMIT 10", False, True),
+    ("SELECT * FROM t ORDER BY a LIMIT 10", True, False),
+    ("SELECT COUNT(*) FROM t LIMIT 1", False, False),
+    ("SELECT a, COUNT(*) FROM t GROUP BY a LIMIT 1", False, True),
+    ("SELECT * FROM t WHERE id IN (SELECT id FROM u LIMIT 5)", False, False),
+    ("SELECT 'LIMIT 1' FROM t", False, False),
+])
+def test_has_effective_limit(code, blocking, expected):
+    assert has_effective_limit(code, plan(blocking=blocking)) is expected
+
+
+def test_inject_limit_appends_on_a_new_line():
+    text = "SELECT * FROM t -- tail"
+    assert inject_limit(text, "SELECT * FROM t", 100, plan()) == "SELECT * FROM t -- tail\nLIMIT 100"
+
+
+@pytest.mark.parametrize("code, blocking", [
+    ("SELECT * FROM t LIMIT 5", False),
+    ("SELECT * FROM t FOR UPDATE", False),
+    ("SELECT a INTO @x FROM t", False),
+    ("SELECT SUM(a) FROM t", False),
+    ("SELECT * FROM t ORDER BY a", True),
+])
+def test_inject_limit_skips_statements_limit_cannot_help(code, blocking):
+    assert inject_limit(code, code, 100, plan(blocking=blocking)) is None
+
+
+def test_inject_limit_ignores_limit_inside_subquery():
+    code = "SELECT * FROM t WHERE id IN (SELECT id FROM u LIMIT 5)"
+    assert inject_limit(code, code, 10, plan()).endswith("\nLIMIT 10")
+
+
+def test_describe_names_the_worst_table():
+    estimate = parse_explain_json(explain({"cost_info": {"query_cost": "12.5"}, "nested_loop": [
+        table("small", 10, "ALL", produced=10),
+        table("big", 300, "ALL"),
+    ]}))
+    reason = describe(estimate, 1000, 0)
+    assert "预计扫描 3010 行" in reason
+    assert "`big`" in reason and "访问方式 ALL" in reason
+
+
+def test_describe_without_tables():
+    assert "主要来自" not in describe(plan(5, 1), 1, 0)
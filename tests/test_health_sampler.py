@@ -0,0 +1,74 @@
+"""健康状态采样：计数器速率、重启检测与趋势"""
+import pytest
+
+from db.health_sampler import SUMMARY_COLUMNS, HealthSample, HealthSampler, _since_restart, _trend
+
+
+def sample(second, questions, uptime=None, running=1, **status):
+    status = dict(status, Questions=questions, Uptime=second if uptime is None else uptime, Threads_running=running)
+    return HealthSample(1700000000 + second, float(second), status, 10, running, 0, 0, 0, 0)
+
+
+def summarize(*samples):
+    sampler = HealthSampler(1, 10)
+    sampler._samples.extend(samples)
+    result = sampler.summarize(minutes=60)
+    if result is None:
+        return None
+    return {row[0]: dict(zip(SUMMARY_COLUMNS, row)) for row in result[1]}
+
+
+def test_rates_come_from_counter_deltas():
+    rows = summarize(sample(0, 0), sample(10, 100), sample(20, 400))
+    qps = rows["qps"]
+    assert qps["latest"] == 30
+    assert qps["avg"] == 20
+    assert (qps["min"], qps["max"]) == (10, 30)
+    assert qps["trend"] == "up +200%"
+
+
+def test_ratio_metrics():
+    rows = summarize(
+        sample(0, 0, Innodb_buffer_pool_reads=0, Innodb_buffer_pool_read_requests=0),
+        sample(10, 0, Innodb_buffer_pool_reads=5, Innodb_buffer_pool_read_requests=1000),
+    )
+    assert rows["buffer_pool_hit_pct"]["latest"] == 99.5
+
+
+def test_missing_counters_are_skipped():
+    rows = summarize(sample(0, 0), sample(10, 10))
+    assert "select_per_sec" not in rows
+    assert "threads_running" in rows
+
+
+def test_gauges_use_each_sample():
+    rows = summarize(sample(0, 0, running=2), sample(10, 0, running=4), sample(20, 0, running=6))
+    running = rows["threads_running"]
+    assert (running["latest"], running["avg"], running["min"], running["max"]) == (6, 4, 2, 6)
+
+
+def test_samples_before_a_restart_are_dropped():
+    samples = [
+        sample(0, 500, uptime=1000), sample(10, 600, uptime=1010), sample(20, 5, uptime=3), sample(30, 35, uptime=13),
+    ]
+    assert _since_restart(samples) == samples[2:]
+    # 重启前后的计数器差值为负，不能计入速率
+    assert summarize(*samples)["qps"]["min"] == 3
+
+
+def test_summary_needs_two_samples():
+    assert summarize() is None
+    assert summarize(sample(0, 0)) is None
+    assert summarize(sample(0, 100, uptime=50), sample(10, 5, uptime=2)) is None
+
+
+@pytest.mark.parametrize("before, after, expected", [
+    (100, 105, "flat"),
+    (100, 150, "up +50%"),
+    (100, 40, "down -60%"),
+    (0, 0, "flat"),
+    (0, 3, "up"),
+    (None, 3, ""),
+])
+def test_trend(before, after, expected):
+    assert _trend(before, after) == expected
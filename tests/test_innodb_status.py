@@ -0,0 +1,215 @@
+"""InnoDB 状态：SHOW ENGINE INNODB STATUS 的段落拆分与结构化解析"""
+import pytest
+
+from db.innodb_status import DEFAULT_SECTIONS, normalize_sections, parse_deadlock, parse_innodb_status, section_key
+
+STATUS = """\
+=====================================
+2024-05-01T10:00:00.123456+08:00 0x7f1 INNODB MONITOR OUTPUT
+=====================================
+Per second averages calculated from the last 17 seconds
+-----------------
+BACKGROUND THREAD
+-----------------
+srv_master_thread loops: 1 srv_active
+----------
+SEMAPHORES
+----------
+OS WAIT ARRAY INFO: reservation count 1234
+OS WAIT ARRAY INFO: signal count 1200
+--Thread 140 has waited at buf0buf.cc line 4501 for 241.00 seconds the semaphore:
+RW-shared spins 5, rounds 10, OS waits 3
+RW-excl spins 1, rounds 2, OS waits 1
+RW-sx spins 0, rounds 0, OS waits 0
+Spin rounds per wait: 2.00 RW-shared, 2.00 RW-excl, 0.00 RW-sx
+------------------------
+LATEST DETECTED DEADLOCK
+------------------------
+2024-05-01 09:59:00 0x7f2
+*** (1) TRANSACTION:
+TRANSACTION 12345, ACTIVE 5 sec starting index read
+mysql tables in use 1, locked 1
+LOCK WAIT 3 lock struct(s), heap size 1136, 2 row lock(s)
+MySQL thread id 10, OS thread handle 1234, query id 100 localhost root updating
+UPDATE t SET a=1
+ WHERE id=2
+*** (1) HOLDS THE LOCK(S):
+RECORD LOCKS space id 2 page no 4 n bits 72 index PRIMARY of table `test`.`t` trx id 12345 lock_mode X locks rec but not gap
+Record lock, heap no 3 PHYSICAL RECORD: n_fields 3; compact format; info bits 0
+ 0: len 4; hex 80000001; asc     ;;
+*** (1) WAITING FOR THIS LOCK TO BE GRANTED:
+RECORD LOCKS space id 2 page no 4 n bits 72 index PRIMARY of table `test`.`t` trx id 12345 lock_mode X locks rec but not gap waiting
+Record lock, heap no 2 PHYSICAL RECORD: n_fields 3; compact format; info bits 0
+*** (2) TRANSACTION:
+TRANSACTION 12346, ACTIVE 4 sec starting index read
+mysql tables in use 1, locked 1
+3 lock struct(s), heap size 1136, 2 row lock(s)
+MySQL thread id 11, OS thread handle 1235, query id 101 10.0.0.5 app updating
+UPDATE t SET a=2 WHERE id=1
+*** (2) HOLDS THE LOCK(S):
+RECORD LOCKS space id 2 page no 4 n bits 72 index PRIMARY of table `test`.`t` trx id 12346 lock_mode X locks rec but not gap
+*** (2) WAITING FOR THIS LOCK TO BE GRANTED:
+RECORD LOCKS space id 2 page no 4 n bits 72 index PRIMARY of table `test`.`t` trx id 12346 lock_mode X locks rec but not gap waiting
+*** WE ROLL BACK TRANSACTION (2)
+------------
+TRANSACTIONS
+------------
+Trx id counter 12350
+Purge done for trx's n:o < 12340 undo n:o < 0 state: running but idle
+History list length 42
+LIST OF TRANSACTIONS FOR EACH SESSION:
+---TRANSACTION 421000000000000, not started
+0 lock struct(s), heap size 1136, 0 row lock(s)
+---TRANSACTION 12349, ACTIVE 10 sec
+2 lock struct(s), heap size 1136, 1 row lock(s), undo log entries 1
+MySQL thread id 11, OS thread handle 123, query id 200 localhost root
+Trx read view will not see trx with id >= 12349, sees < 12349
+---TRANSACTION 12348, ACTIVE 30 sec fetching rows
+mysql tables in use 1, locked 1
+LOCK WAIT 2 lock struct(s), heap size 1136, 1 row lock(s)
+MySQL thread id 12, OS thread handle 124, query id 201 localhost root Sending data
+SELECT * FROM t FOR UPDATE
+------- TRX HAS BEEN WAITING 7 SEC FOR THIS LOCK TO BE GRANTED:
+RECORD LOCKS space id 2 page no 4 n bits 72 index PRIMARY of table `test`.`t` trx id 12348 lock_mode X waiting
+------------------
+--------
+FILE I/O
+--------
+I/O thread 0 state: waiting for i/o request (insert buffer thread)
+---
+LOG
+---
+Log sequence number          19656442
+Log buffer assigned up to    19656442
+Log flushed up to            19656000
+Pages flushed up to          19650000
+Last checkpoint at           19600000
+0 pending log flushes, 0 pending chkp writes
+18 log i/o's done, 0.50 log i/o's/second
+----------------------
+BUFFER POOL AND MEMORY
+----------------------
+Total large memory allocated 137363456
+Dictionary memory allocated 432000
+Buffer pool size   8192
+Free buffers       7000
+Database pages     1150
+Old database pages 404
+Modified db pages  10
+Pending reads      0
+Pending writes: LRU 0, flush list 0, single page 0
+Pages made young 5, not young 6
+0.00 youngs/s, 0.00 non-youngs/s
+Pages read 1000, created 150, written 200
+1.00 reads/s, 0.00 creates/s, 2.00 writes/s
+Buffer pool hit rate 995 / 1000, young-making rate 0 / 1000 not 0 / 1000
+Pages read ahead 0.00/s, evicted without access 0.00/s, Random read ahead 0.00/s
+LRU len: 1150, unzip_LRU len: 0
+----------------------
+INDIVIDUAL BUFFER POOL INFO
+----------------------
+---BUFFER POOL 0
+Buffer pool size   4096
+--------------
+ROW OPERATIONS
+--------------
+0 queries inside InnoDB, 0 queries in queue
+1 read views open inside InnoDB
+Process ID=1, Main thread ID=140, state: sleeping
+Number of rows inserted 100, updated 10, deleted 0, read 5000
+0.50 inserts/s, 0.00 updates/s, 0.00 deletes/s, 12.00 reads/s
+----------------------------
+END OF INNODB MONITOR OUTPUT
+============================
+"""
+
+
+@pytest.fixture(scope="module")
+def status():
+    # 标题与结果键混用，大小写不敏感
+    return parse_innodb_status(STATUS, [
+        "semaphores", "latest_detected_deadlock", "transactions", "log", "buffer pool and memory",
+        "row_operations", "FILE I/O", "INSERT BUFFER AND ADAPTIVE HASH INDEX",
+    ])
+
+
+def test_overview(status):
+    assert status["time"] == "2024-05-01T10:00:00.123456+08:00"
+    assert status["averages_seconds"] == 17
+
+
+def test_semaphores(status):
+    assert status["semaphores"]["reservation_count"] == 1234
+    assert status["semaphores"]["rw_shared_os_waits"] == 3
+    assert status["semaphores"]["long_waits"] == [{"location": "buf0buf.cc line 4501", "seconds": 241.0}]
+
+
+def test_deadlock_victim_and_holders(status):
+    deadlock = status["latest_detected_deadlock"]
+    assert deadlock["time"] == "2024-05-01 09:59:00"
+    assert deadlock["rolled_back"] == 2
+    assert deadlock["victim"]["id"] == 12346
+    assert deadlock["victim"]["query"] == "UPDATE t SET a=2 WHERE id=1"
+    holder, = deadlock["holders"]
+    assert holder["id"] == 12345
+    # 跨行的语句合并为一行
+    assert holder["query"] == "UPDATE t SET a=1 WHERE id=2"
+    assert holder["holds"][0]["table"] == "test.t"
+    assert holder["holds"][0]["mode"] == "lock_mode X locks rec but not gap"
+    assert holder["waiting_for"][0]["index"] == "PRIMARY"
+
+
+def test_deadlock_without_transactions_is_none():
+    assert parse_deadlock(["2024-05-01 09:59:00 0x7f2", ""]) is None
+
+
+def test_transactions_sorted_by_active_time(status):
+    transactions = status["transactions"]
+    assert transactions["history_list_length"] == 42
+    assert transactions["sessions"] == 3
+    assert transactions["active_transactions"] == 2
+    assert transactions["lock_wait_transactions"] == 1
+    assert [trx["id"] for trx in transactions["transactions"]] == [12348, 12349]
+    waiting = transactions["transactions"][0]
+    assert waiting["lock_wait"] and waiting["lock_wait_seconds"] == 7
+    assert waiting["query"] == "SELECT * FROM t FOR UPDATE"
+
+
+def test_log_and_buffer_pool_derived_metrics(status):
+    assert status["log"]["checkpoint_age"] == 56442
+    assert status["log"]["unflushed_log"] == 442
+    buffer_pool = status["buffer_pool_and_memory"]
+    assert buffer_pool["hit_rate_pct"] == 99.5
+    assert buffer_pool["free_pct"] == 85.45
+    assert buffer_pool["dirty_pct"] == 0.12
+
+
+def test_row_operations(status):
+    assert status["row_operations"]["rows_read"] == 5000
+    assert status["row_operations"]["reads_per_sec"] == 12.0
+
+
+def test_unparsed_sections_return_text(status):
+    assert status["file_i_o"] == {
+        "text": "I/O thread 0 state: waiting for i/o request (insert buffer thread)", "truncated": False,
+    }
+
+
+def test_missing_section_is_none(status):
+    assert status["insert_buffer_and_adaptive_hash_index"] is None
+
+
+def test_default_sections():
+    result = parse_innodb_status(STATUS)
+    assert set(result) == {"time", "averages_seconds"} | {section_key(title) for title in DEFAULT_SECTIONS}
+
+
+def test_normalize_sections_accepts_titles_and_keys():
+    assert normalize_sections(None) == DEFAULT_SECTIONS
+    assert normalize_sections("log") == ("LOG",)
+    assert normalize_sections(["Buffer Pool and Memory", "buffer_pool_and_memory"]) == ("BUFFER POOL AND MEMORY",)
+
+
+def test_unknown_section_is_rejected():
+    with pytest.raises(ValueError):
+        normalize_sections(["deadlocks"])
@@ -0,0 +1,81 @@
+"""角色权限：前导关键字的操作分类与各角色的允许/拒绝判定"""
+import pytest
+
+from config import RolePermissions, classify_operation
+from config.dbconfig import OPERATION_KEYWORD_DEPTH, ROLE_PERMISSIONS, get_role_classifier
+from db.sql_lexer import split_statements
+
+
+def keywords(sql):
+    return split_statements(sql)[0].keywords
+
+
+@pytest.mark.parametrize("sql, operation", [
+    ("SELECT * FROM t", "SELECT"),
+    ("CREATE TABLE t (id INT)", "CREATE"),
+    ("CREATE DATABASE d", "CREATE DATABASE"),
+    ("CREATE TEMPORARY TABLE t (id INT)", "CREATE TEMPORARY TABLES"),
+    ("CREATE INDEX i ON t (id)", "CREATE INDEX"),
+    ("DROP VIEW v", "DROP VIEW"),
+    ("LOAD DATA INFILE 'x' INTO TABLE t", "LOAD DATA"),
+])
+def test_classify_operation(sql, operation):
+    assert classify_operation(keywords(sql)) == operation
+
+
+@pytest.mark.parametrize("words, operation", [
+    (("SELECT", "INTO", "DUMPFILE"), "SELECT INTO OUTFILE"),
+    (("TABLE", "INTO", "OUTFILE"), "SELECT INTO OUTFILE"),
+])
+def test_file_export_rules(words, operation):
+    assert classify_operation(words) == operation
+
+
+def test_classify_empty_keywords():
+    assert classify_operation(()) == ""
+
+
+@pytest.mark.parametrize("sql, allowed", [
+    ("SELECT 1", True),
+    ("SHOW TABLES", True),
+    ("EXPLAIN SELECT 1", True),
+    ("INSERT INTO t VALUES (1)", False),
+    ("DELETE FROM t", False),
+    ("DROP TABLE t", False),
+    ("SELECT INTO DUMPFILE '/tmp/x'", False),
+    ("/*!40101 DROP TABLE t */", False),
+    ("/* SELECT */ DELETE FROM t", False),
+])
+def test_readonly_role(sql, allowed):
+    assert get_role_classifier("readonly").allows(keywords(sql)) is allowed
+
+
+@pytest.mark.parametrize("sql, allowed", [
+    ("INSERT INTO t VALUES (1)", True),
+    ("UPDATE t SET a = 1", True),
+    ("DELETE FROM t", True),
+    ("REPLACE INTO t VALUES (1)", False),
+    ("CREATE TABLE t (id INT)", False),
+    ("TRUNCATE TABLE t", False),
+])
+def test_writer_role(sql, allowed):
+    assert get_role_classifier("writer").allows(keywords(sql)) is allowed
+
+
+def test_unknown_role_falls_back_to_readonly():
+    classifier = get_role_classifier("no-such-role")
+    assert classifier.allows(keywords("SELECT 1"))
+    assert not classifier.allows(keywords("DELETE FROM t"))
+
+
+def test_empty_statement_is_denied():
+    assert not get_role_classifier("admin").allows(())
+
+
+def test_verdicts_match_uncached_classification():
+    classifier = RolePermissions("writer", ROLE_PERMISSIONS["writer"])
+    for sql in ("SELECT 1", "DROP TABLE t", "INSERT INTO t VALUES (1)"):
+        expected = classify_operation(keywords(sql)[:OPERATION_KEYWORD_DEPTH]) in ROLE_PERMISSIONS["writer"]
+        # 第二次判定命中缓存，结果必须一致
+        assert classifier.allows(keywords(sql)) is expected
+        assert classifier.allows(keywords(sql)) is expected
@@ -0,0 +1,68 @@
+"""表名搜索索引：增量刷新与按名称、注释和拼音首字母搜索"""
+import pytest
+
+from db.search_index import SearchIndex
+
+
+class FakeIndex(SearchIndex):
+    """用内存中的表和列代替 information_schema"""
+
+    def __init__(self, tables):
+        super().__init__(refresh_interval=300)
+        self.tables = tables
+
+    def _fetch(self, sql, params=None):
+        if "information_schema.TABLES" in sql:
+            return [(schema, table, comment, None, version)
+                    for (schema, table), (comment, version, _) in self.tables.items()]
+        wanted = set(zip(params[::2], params[1::2])) if params else None
+        return [(schema, table, column, comment)
+                for (schema, table), (_, _, columns) in self.tables.items()
+                if wanted is None or (schema, table) in wanted
+                for column, comment in columns]
+
+
+@pytest.fixture
+def index():
+    index = FakeIndex({
+        ("shop", "user"): ("用户表", 1, [("id", ""), ("mobile", "手机号")]),
+        ("shop", "orders"): ("订单表", 1, [("user_id", "用户ID")]),
+    })
+    index.refresh()
+    return index
+
+
+def names(matches):
+    return [(match.schema, match.table) for match in matches]
+
+
+def test_search_by_comment_and_initials(index):
+    assert names(index.search("用户"))[0] == ("shop", "user")
+    assert names(index.search("ddb")) == [("shop", "orders")]
+    assert index.search("手机")[0].columns == ("mobile(手机号)",)
+
+
+def test_incremental_refresh_replaces_changed_tables(index):
+    index.tables[("shop", "orders")] = ("历史订单", 2, [("user_id", "用户ID")])
+    del index.tables[("shop", "user")]
+    assert index.refresh() == 2
+    assert names(index.search("用户")) == [("shop", "orders")]
+    assert index.search("订单表") == []
+    assert names(index.search("历史")) == [("shop", "orders")]
+    assert index.stats()["tables"] == 1
+
+
+def test_unchanged_tables_are_not_reindexed(index):
+    assert index.refresh() == 0
+    index.mark_stale([("shop", "user")])
+    assert index.refresh() == 1
+    assert names(index.search("手机号")) == [("shop", "user")]
+
+
+def test_refresh_does_not_mutate_the_previous_index(index):
+    postings = index._postings
+    before = {gram: set(ids) for gram, ids in postings.items()}
+    del index.tables[("shop", "user")]
+    index.refresh()
+    # 查询可能还持有旧索引的倒排表，刷新只能替换而不能原地修改
+    assert postings == before
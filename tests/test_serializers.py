@@ -0,0 +1,71 @@
+"""结果序列化器：各输出格式的转义、NULL 与截断说明"""
+import datetime
+import json
+from decimal import Decimal
+
+import pytest
+
+from db.serializers import SERIALIZERS, CsvWriter, csv_field, get_serializer, to_text
+
+COLUMNS = ["id", "name", "created"]
+ROWS = [
+    (1, 'a,"b"', None),
+    (2, "x\ny", datetime.date(2024, 1, 2)),
+]
+
+
+def test_csv_quotes_fields_per_rfc4180():
+    writer = CsvWriter(COLUMNS)
+    writer.write_rows(ROWS)
+    assert writer.getvalue() == 'id,name,created\n1,"a,""b""",NULL\n2,"x\ny",2024-01-02'
+
+
+def test_csv_field_only_quotes_when_needed():
+    assert csv_field("plain") == "plain"
+    assert csv_field("a,b") == '"a,b"'
+    assert csv_field('say "hi"') == '"say ""hi"""'
+
+
+def test_csv_appends_truncation_trailer():
+    writer = CsvWriter(["n"])
+    writer.write_rows([(1,)])
+    assert writer.getvalue("(已截断)").splitlines()[-1] == "(已截断)"
+
+
+def test_ndjson_writes_one_object_per_row():
+    writer = get_serializer("ndjson")(COLUMNS)
+    writer.write_rows(ROWS)
+    lines = [json.loads(line) for line in writer.getvalue().splitlines()]
+    assert lines == [
+        {"id": 1, "name": 'a,"b"', "created": None},
+        {"id": 2, "name": "x\ny", "created": "2024-01-02"},
+    ]
+
+
+def test_columnar_lists_columns_once():
+    writer = get_serializer("columnar")(COLUMNS)
+    writer.write_rows(ROWS)
+    document = json.loads(writer.getvalue("truncated"))
+    assert document["columns"] == COLUMNS
+    assert document["data"] == [[1, 2], ['a,"b"', "x\ny"], [None, "2024-01-02"]]
+    assert document["row_count"] == 2
+    assert document["truncated"] == "truncated"
+
+
+@pytest.mark.parametrize("name", list(SERIALIZERS))
+def test_write_rows_reports_chunk_size(name):
+    writer = get_serializer(name)(COLUMNS)
+    size = writer.write_rows(ROWS)
+    # 返回值用于字节预算，包含该批之后的分隔符
+    assert 0 < size <= len(writer.getvalue().encode("utf-8")) + 1
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        get_serializer("xml")
+
+
+def test_to_text_handles_bytes_sets_and_decimals():
+    assert to_text(b"abc") == "abc"
+    assert to_text({"b", "a"}) == "a,b"
+    assert to_text(Decimal("1.50")) == "1.50"
@@ -0,0 +1,60 @@
+"""SQL 拆分：分隔符只在字符串、标识符和注释之外生效"""
+import pytest
+
+from db.sql_lexer import CACHE_MAX_QUERY_LENGTH, split_statements
+
+
+def texts(query):
+    return [statement.text for statement in split_statements(query)]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("SELECT 'a;b'; SELECT 2", ["SELECT 'a;b'", "SELECT 2"]),
+    ('SELECT "a\\";b"; SELECT 4', ['SELECT "a\\";b"', "SELECT 4"]),
+    ("SELECT 'it''s;'", ["SELECT 'it''s;'"]),
+    ("SELECT `a;b` FROM t", ["SELECT `a;b` FROM t"]),
+    ("SELECT 1 -- c;\n; SELECT 2", ["SELECT 1 -- c;", "SELECT 2"]),
+    ("SELECT 1 # c;\n; SELECT 2", ["SELECT 1 # c;", "SELECT 2"]),
+    ("/* x; */ SELECT 1;", ["/* x; */ SELECT 1"]),
+    ("SELECT 1;;  ;SELECT 2;", ["SELECT 1", "SELECT 2"]),
+])
+def test_semicolons_inside_literals_and_comments_do_not_split(query, expected):
+    assert texts(query) == expected
+
+
+def test_comment_only_input_has_no_statements():
+    assert split_statements("-- nothing here\n/* or here */") == ()
+
+
+def test_code_strips_comments_and_keywords_are_uppercased():
+    statement, = split_statements("/* hint */ select id from t -- tail")
+    assert statement.code == "select id from t"
+    assert statement.keywords[0] == "SELECT"
+
+
+def test_executable_comment_counts_as_sql():
+    # /*!...*/ 会被服务器执行，权限判断必须能看到其中的语句
+    statement, = split_statements("/*!40101 DROP TABLE t */")
+    assert statement.keywords[:2] == ("DROP", "TABLE")
+
+
+def test_comment_cannot_hide_leading_keyword():
+    statement, = split_statements("/* SELECT */ DELETE FROM t")
+    assert statement.keywords[0] == "DELETE"
+
+
+def test_delimiter_command_allows_procedure_bodies():
+    query = "DELIMITER //\nCREATE PROCEDURE p() BEGIN SELECT 1; END//\nDELIMITER ;\nSELECT 3"
+    assert texts(query) == ["CREATE PROCEDURE p() BEGIN SELECT 1; END", "SELECT 3"]
+
+
+def test_keywords_are_limited_to_leading_words():
+    statement, = split_statements("CREATE TEMPORARY TABLE t (id INT)")
+    assert statement.keywords[:3] == ("CREATE", "TEMPORARY", "TABLE")
+
+
+def test_long_queries_bypass_the_cache_but_split_the_same():
+    values = ", ".join(["('x;y')"] * (CACHE_MAX_QUERY_LENGTH // 7 + 1))
+    query = f"INSERT INTO t VALUES {values}; SELECT 1"
+    assert len(query) > CACHE_MAX_QUERY_LENGTH
+    assert [statement.keywords[0] for statement in split_statements(query)] == ["INSERT", "SELECT"]
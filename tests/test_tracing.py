@@ -0,0 +1,44 @@
+"""慢调用日志：语句指纹去掉字面量并合并值列表，配置无效时不跟踪"""
+import pytest
+
+import config
+from utils.tracing import FINGERPRINT_MAX_LENGTH, begin, fingerprint
+
+
+@pytest.mark.parametrize("code, expected", [
+    ("SELECT * FROM t WHERE id = 42 AND name = 'bob'", "SELECT * FROM t WHERE id = ? AND name = ?"),
+    ('SELECT "it\\"s", 1.5e3, 0x1F', "SELECT ?, ?, ?"),
+    ("SELECT  *\n  FROM t\tWHERE a = 1", "SELECT * FROM t WHERE a = ?"),
+    ("SELECT `a1` FROM `t2` WHERE x = 'y'", "SELECT `a1` FROM `t2` WHERE x = ?"),
+    ("SELECT * FROM t WHERE a = %s", "SELECT * FROM t WHERE a = %s"),
+])
+def test_literals_are_replaced(code, expected):
+    assert fingerprint(code) == expected
+
+
+def test_in_lists_of_any_length_share_a_fingerprint():
+    assert fingerprint("SELECT a FROM t WHERE id IN (1, 2, 3)") == "SELECT a FROM t WHERE id IN (?+)"
+    assert fingerprint("SELECT a FROM t WHERE id IN (7,8)") == fingerprint("SELECT a FROM t WHERE id IN (1, 2, 3)")
+
+
+def test_multi_row_values_collapse():
+    one = fingerprint("INSERT INTO t (a, b) VALUES (1, 'x'), (2, 'y')")
+    many = fingerprint("INSERT INTO t (a, b) VALUES (1, 'x'), (2, 'y'), (3, 'z')")
+    assert one == many == "INSERT INTO t (a, b) VALUES (?+), ..."
+
+
+def test_single_value_row_is_kept():
+    assert fingerprint("INSERT INTO t (a) VALUES (1)") == "INSERT INTO t (a) VALUES (?)"
+
+
+def test_fingerprint_is_truncated():
+    code = "SELECT " + ", ".join(f"c{i}" for i in range(FINGERPRINT_MAX_LENGTH)) + " FROM t"
+    assert len(fingerprint(code)) == FINGERPRINT_MAX_LENGTH
+
+
+def test_invalid_settings_disable_tracing(monkeypatch):
+    def missing_credentials():
+        raise ValueError("缺少必需的数据库配置：用户名和密码")
+
+    monkeypatch.setattr(config, "get_settings", missing_credentials)
+    assert begin("get_chinese_initials") is None